@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -41,9 +42,23 @@ else:
 
 # Application definition
 
+# Codificar las respuestas JSON con orjson si está instalado (extra "rapido").
+# La salida es idéntica a la de JSONRenderer; con False se puede pedir igual
+# enviando "Accept: application/json; codificador=rapido".
+API_JSON_RAPIDO = os.getenv("API_JSON_RAPIDO", "True").lower() == "true"
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # Roles en los claims del token: no consulta al usuario ni sus grupos
+        "litethinking.presentation.api.auth.autenticacion.JWTRolesAuthentication",
+    ),
+    "DEFAULT_RENDERER_CLASSES": (
+        # Primero: solo coincide cuando el Accept trae codificador=rapido
+        "litethinking.presentation.api.renderers.JSONRapidoSolicitadoRenderer",
+        "litethinking.presentation.api.renderers.JSONRapidoRenderer"
+        if API_JSON_RAPIDO
+        else "rest_framework.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
     ),
 }
 
@@ -101,6 +116,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    # Lecturas en réplica / escrituras en primaria (sin efecto si no hay réplica)
+    "litethinking.infrastructure.persistence.replicas.ReplicaMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -136,9 +153,11 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+DB_ENGINE = os.getenv("DB_ENGINE", "django.db.backends.postgresql")
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": DB_ENGINE,
         "NAME": os.getenv("DB_NAME"),
         "USER": os.getenv("DB_USER"),
         "PASSWORD": os.getenv("DB_PASSWORD"),
@@ -147,6 +166,28 @@ DATABASES = {
     }
 }
 
+# Réplica de solo lectura opcional: se activa al definir DB_REPLICA_HOST o DB_REPLICA_NAME.
+# Los valores no indicados se toman de la base de datos principal.
+if os.getenv("DB_REPLICA_HOST") or os.getenv("DB_REPLICA_NAME"):
+    DATABASES["replica"] = {
+        "ENGINE": DB_ENGINE,
+        "NAME": os.getenv("DB_REPLICA_NAME", DATABASES["default"]["NAME"]),
+        "USER": os.getenv("DB_REPLICA_USER", DATABASES["default"]["USER"]),
+        "PASSWORD": os.getenv("DB_REPLICA_PASSWORD", DATABASES["default"]["PASSWORD"]),
+        "HOST": os.getenv("DB_REPLICA_HOST", DATABASES["default"]["HOST"]),
+        "PORT": os.getenv("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        # En las pruebas la réplica apunta a la misma base de datos de test
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["litethinking.infrastructure.persistence.replicas.ReplicaRouter"]
+
+# Segundos que un cliente lee de la primaria después de escribir (para ver sus propios cambios)
+REPLICA_FIJAR_SEGUNDOS = int(os.getenv("DB_REPLICA_FIJAR_SEGUNDOS", "5"))
+# Alias de CACHES donde se marca, por usuario del token, que acaba de escribir.
+# Con varios procesos debe ser uno compartido para que la marca llegue a todos.
+REPLICA_FIJAR_CACHE_BACKEND = os.getenv("DB_REPLICA_FIJAR_CACHE_BACKEND", "default")
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -189,6 +230,87 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = []  # No necesario si solo usamos STATIC_ROOT
 STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
 
+# Caché de lectura de repositorios (buscar_por_nit / buscar_por_codigo / existe)
+# BACKEND es un alias de CACHES para compartir la caché entre procesos; vacío = solo memoria del proceso
+REPOSITORIO_CACHE = {
+    "ACTIVA": os.getenv("REPOSITORIO_CACHE_ACTIVA", "True").lower() == "true",
+    "TTL": int(os.getenv("REPOSITORIO_CACHE_TTL", "30")),
+    "MAX_ENTRADAS": int(os.getenv("REPOSITORIO_CACHE_MAX_ENTRADAS", "2048")),
+    "BACKEND": os.getenv("REPOSITORIO_CACHE_BACKEND", ""),
+}
+
+# Caché del cuerpo codificado de listados y detalles (productos por empresa,
+# listado de empresas y detalle de producto). BACKEND es un alias de CACHES.
+# La clave incluye la versión de los datos (la del ETag), así que con la
+# memoria de cada proceso tampoco se entregan datos de antes de una escritura;
+# uno compartido (Redis, Memcached) solo evita reconstruir en cada proceso.
+RESPUESTAS_CACHE = {
+    "ACTIVA": os.getenv("RESPUESTAS_CACHE_ACTIVA", "True").lower() == "true",
+    "BACKEND": os.getenv("RESPUESTAS_CACHE_BACKEND", "default"),
+    "TTL": int(os.getenv("RESPUESTAS_CACHE_TTL", "60")),
+    "GRACIA": int(os.getenv("RESPUESTAS_CACHE_GRACIA", "30")),
+    "ESPERA": int(os.getenv("RESPUESTAS_CACHE_ESPERA", "5")),
+}
+
+# Versión de roles de los usuarios contra la que se validan los access tokens.
+# BACKEND es un alias de CACHES: con uno compartido un cambio de grupos invalida
+# los tokens en la siguiente petición; con la memoria de cada proceso, en TTL segundos.
+ROLES_JWT = {
+    "BACKEND": os.getenv("ROLES_JWT_CACHE_BACKEND", "default"),
+    "TTL": int(os.getenv("ROLES_JWT_CACHE_TTL", "30")),
+}
+
+# Leer los precios desde la copia denormalizada producto.precios_compactos (sin la
+# consulta extra a producto_precio). La copia se mantiene siempre, esté activo o no.
+PRODUCTO_PRECIOS_DENORMALIZADOS = os.getenv("PRODUCTO_PRECIOS_DENORMALIZADOS", "False").lower() == "true"
+
+# Archivos generados (PDF de los trabajos en segundo plano). Se descargan a
+# través de la API, no se publican con MEDIA_URL.
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", str(BASE_DIR / "media"))
+
+# Trabajos de PDF de inventario que procesa `manage.py procesar_trabajos_pdf`.
+# VENCIMIENTO: segundos tras los que un trabajo en proceso se da por abandonado
+# y otro trabajador lo retoma (hasta MAX_INTENTOS veces). RETENCION_HORAS: cuánto
+# se guardan los trabajos terminados y sus archivos.
+TRABAJOS_PDF = {
+    "VENCIMIENTO": int(os.getenv("TRABAJOS_PDF_VENCIMIENTO", "600")),
+    "MAX_INTENTOS": int(os.getenv("TRABAJOS_PDF_MAX_INTENTOS", "3")),
+    "RETENCION_HORAS": int(os.getenv("TRABAJOS_PDF_RETENCION_HORAS", "24")),
+}
+
+# PDF de inventario: desde UMBRAL_GRANDE productos (0 = nunca) se leen por lotes
+# y se dibujan en tablas de FILAS_POR_TABLA filas sobre un archivo temporal, con
+# memoria acotada y tiempo casi lineal en la cantidad de productos.
+# ESTILOS_PRECALCULADOS crea los estilos una vez por proceso (ver benchmark_pdf_inventario).
+PDF_INVENTARIO = {
+    "UMBRAL_GRANDE": int(os.getenv("PDF_INVENTARIO_UMBRAL_GRANDE", "2000")),
+    "FILAS_POR_TABLA": int(os.getenv("PDF_INVENTARIO_FILAS_POR_TABLA", "500")),
+    "ESTILOS_PRECALCULADOS": os.getenv("PDF_INVENTARIO_ESTILOS_PRECALCULADOS", "False").lower() == "true",
+}
+
+# PDF de inventario de varias empresas (generar_inventarios_pdf y POST /api/inventario/lote/pdf/).
+# PROCESOS: procesos que dibujan los PDF en paralelo (0 = uno por núcleo disponible).
+# EMPRESAS_POR_CONSULTA: empresas cuyos productos se leen juntos en una consulta.
+LOTE_PDF = {
+    "PROCESOS": int(os.getenv("LOTE_PDF_PROCESOS", "0")),
+    "EMPRESAS_POR_CONSULTA": int(os.getenv("LOTE_PDF_EMPRESAS_POR_CONSULTA", "50")),
+}
+
+# Caché de los PDF de inventario generados, por versión de los datos de la empresa.
+# TIPO "archivos": DIRECTORIO local limitado a MAX_MB (se borran los menos usados).
+# Por defecto en el directorio temporal del sistema, que se puede escribir aunque
+# el resto del sistema de archivos sea de solo lectura (p. ej. en Vercel).
+# TIPO "django": el alias BACKEND de CACHES (acotado por el propio backend); con
+# varios servidores conviene este, o un DIRECTORIO compartido.
+PDF_CACHE = {
+    "ACTIVA": os.getenv("PDF_CACHE_ACTIVA", "True").lower() == "true",
+    "TIPO": os.getenv("PDF_CACHE_TIPO", "archivos"),
+    "DIRECTORIO": os.getenv("PDF_CACHE_DIRECTORIO", os.path.join(tempfile.gettempdir(), "litethinking_cache_pdf")),
+    "MAX_MB": int(os.getenv("PDF_CACHE_MAX_MB", "200")),
+    "BACKEND": os.getenv("PDF_CACHE_BACKEND", "default"),
+    "TTL": int(os.getenv("PDF_CACHE_TTL", "86400")),
+}
+
 # Email configuration
 EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = os.getenv('EMAIL_HOST', 'smtp.gmail.com')
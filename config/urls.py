@@ -14,11 +14,20 @@ from litethinking.presentation.api.empresa.views import (
     empresa_detail,
     empresas_list_create,
 )
-from litethinking.presentation.api.inventario.views import generar_inventario_pdf
+from litethinking.presentation.api.inventario.views import (
+    generar_inventario_pdf,
+    generar_inventarios_pdf_lote,
+    resumen_inventario,
+    trabajo_pdf_descarga,
+    trabajo_pdf_estado,
+)
+from litethinking.presentation.api.metricas.views import metricas_cache
 from litethinking.presentation.api.producto.views import (
     producto_agregar_precio,
     producto_detail,
     producto_generar_descripcion,
+    productos_buscar,
+    productos_importar,
     productos_list_create,
     productos_por_empresa,
 )
@@ -39,12 +48,20 @@ urlpatterns = [
     path("api/empresas/<str:nit>", empresa_detail, name="empresa_detail_no_slash"),
     path("api/empresas/<str:nit>/productos/", productos_por_empresa, name="productos_por_empresa"),
     path("api/empresas/<str:nit>/productos", productos_por_empresa, name="productos_por_empresa_no_slash"),
+    path("api/empresas/<str:nit>/resumen/", resumen_inventario, name="resumen_inventario"),
+    path("api/empresas/<str:nit>/resumen", resumen_inventario, name="resumen_inventario_no_slash"),
     # Productos
     path("api/productos/", productos_list_create, name="productos_list_create"),
     path("api/productos", productos_list_create, name="productos_list_create_no_slash"),
     # Generar descripción con IA (debe ir ANTES de las URLs con parámetros dinámicos)
     path("api/productos/generar-descripcion/", producto_generar_descripcion, name="producto_generar_descripcion"),
     path("api/productos/generar-descripcion", producto_generar_descripcion, name="producto_generar_descripcion_no_slash"),
+    # Búsqueda de texto completo
+    path("api/productos/buscar/", productos_buscar, name="productos_buscar"),
+    path("api/productos/buscar", productos_buscar, name="productos_buscar_no_slash"),
+    # Importación masiva (CSV o NDJSON)
+    path("api/productos/importar/", productos_importar, name="productos_importar"),
+    path("api/productos/importar", productos_importar, name="productos_importar_no_slash"),
     path("api/productos/<str:codigo>/", producto_detail, name="producto_detail"),
     path("api/productos/<str:codigo>", producto_detail, name="producto_detail_no_slash"),
     path("api/productos/<str:codigo>/precios/", producto_agregar_precio, name="producto_agregar_precio"),
@@ -52,6 +69,16 @@ urlpatterns = [
     # Inventario PDF
     path("api/inventario/empresa/<str:empresa_nit>/pdf/", generar_inventario_pdf, name="generar_inventario_pdf"),
     path("api/inventario/empresa/<str:empresa_nit>/pdf", generar_inventario_pdf, name="generar_inventario_pdf_no_slash"),
+    path("api/inventario/lote/pdf/", generar_inventarios_pdf_lote, name="generar_inventarios_pdf_lote"),
+    path("api/inventario/lote/pdf", generar_inventarios_pdf_lote, name="generar_inventarios_pdf_lote_no_slash"),
+    # Trabajos de PDF en segundo plano (POST a las rutas anteriores los crea)
+    path("api/inventario/trabajos/<str:trabajo_id>/", trabajo_pdf_estado, name="trabajo_pdf_estado"),
+    path("api/inventario/trabajos/<str:trabajo_id>", trabajo_pdf_estado, name="trabajo_pdf_estado_no_slash"),
+    path("api/inventario/trabajos/<str:trabajo_id>/pdf/", trabajo_pdf_descarga, name="trabajo_pdf_descarga"),
+    path("api/inventario/trabajos/<str:trabajo_id>/pdf", trabajo_pdf_descarga, name="trabajo_pdf_descarga_no_slash"),
+    # Métricas
+    path("api/metricas/cache/", metricas_cache, name="metricas_cache"),
+    path("api/metricas/cache", metricas_cache, name="metricas_cache_no_slash"),
 ]
 
 from django.contrib.staticfiles.urls import staticfiles_urlpatterns
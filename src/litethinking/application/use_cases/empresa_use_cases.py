@@ -1,22 +1,26 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 from ...domain.entities.empresa import Empresa
+from ...domain.ports.cache_respuestas import CacheRespuestas
 from ...domain.ports.empresa_repository import EmpresaRepository
+from ...domain.ports.paginacion import Pagina
 
 
 class CrearEmpresaUseCase:
     
-    def __init__(self, empresa_repository: EmpresaRepository):
+    def __init__(self, empresa_repository: EmpresaRepository, cache_respuestas: Optional[CacheRespuestas] = None):
         self._empresa_repository = empresa_repository
+        self._cache_respuestas = cache_respuestas
     
     def ejecutar(self, nit: str, nombre: str, direccion: str, telefono: str) -> Empresa:
 
-        if self._empresa_repository.existe(nit):
-            raise ValueError(f"Ya existe una empresa con el NIT: {nit}")
-        
         empresa = Empresa(nit=nit, nombre=nombre, direccion=direccion, telefono=telefono)
 
-        return self._empresa_repository.guardar(empresa)
+        # El repositorio rechaza el NIT duplicado con el mismo ValueError
+        creada = self._empresa_repository.crear(empresa)
+        if self._cache_respuestas:
+            self._cache_respuestas.invalidar_empresas()
+        return creada
 
 
 class ObtenerEmpresaUseCase:
@@ -37,10 +41,33 @@ class ListarEmpresasUseCase:
         return self._empresa_repository.listar_todas()
 
 
+class IterarEmpresasUseCase:
+    
+    def __init__(self, empresa_repository: EmpresaRepository):
+        self._empresa_repository = empresa_repository
+    
+    def ejecutar(self) -> Iterator[Empresa]:
+        return self._empresa_repository.iterar_todas()
+
+
+class ListarEmpresasPaginadoUseCase:
+    
+    def __init__(self, empresa_repository: EmpresaRepository):
+        self._empresa_repository = empresa_repository
+    
+    def ejecutar(self, limite: int, despues_de: Optional[str] = None) -> Pagina[Empresa]:
+        
+        if limite < 1:
+            raise ValueError("El límite debe ser mayor que cero")
+        
+        return self._empresa_repository.listar_pagina(limite, despues_de=despues_de)
+
+
 class ActualizarEmpresaUseCase:
   
-    def __init__(self, empresa_repository: EmpresaRepository):
+    def __init__(self, empresa_repository: EmpresaRepository, cache_respuestas: Optional[CacheRespuestas] = None):
         self._empresa_repository = empresa_repository
+        self._cache_respuestas = cache_respuestas
     
     def ejecutar(
         self,
@@ -61,14 +88,22 @@ class ActualizarEmpresaUseCase:
         if telefono is not None:
             empresa.actualizar_telefono(telefono)
         
-        return self._empresa_repository.guardar(empresa)
+        guardada = self._empresa_repository.guardar(empresa)
+        if self._cache_respuestas:
+            self._cache_respuestas.invalidar_empresas()
+        return guardada
 
 
 class EliminarEmpresaUseCase:
    
-    def __init__(self, empresa_repository: EmpresaRepository):
+    def __init__(self, empresa_repository: EmpresaRepository, cache_respuestas: Optional[CacheRespuestas] = None):
         self._empresa_repository = empresa_repository
+        self._cache_respuestas = cache_respuestas
     
     def ejecutar(self, nit: str) -> bool:
-        return self._empresa_repository.eliminar(nit)
+        
+        eliminada = self._empresa_repository.eliminar(nit)
+        if eliminada and self._cache_respuestas:
+            self._cache_respuestas.invalidar_empresas()
+        return eliminada
 
@@ -0,0 +1,190 @@
+import hashlib
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from ...domain.entities.empresa import Empresa
+from ...domain.entities.lote_pdf import ResultadoPdfEmpresa, ResumenLotePdf
+from ...domain.entities.pdf_inventario import PdfInventario
+from ...domain.entities.producto import Producto
+from ...domain.entities.resumen_inventario import ResumenInventario
+from ...domain.ports.cache_pdf import CachePdfInventario
+from ...domain.ports.empresa_repository import EmpresaRepository
+from ...domain.ports.generador_pdf import GeneradorPdfInventario
+from ...domain.ports.lote_pdf import DestinoLotePdf, RenderizadorLotePdf
+from ...domain.ports.producto_repository import ProductoRepository
+from ...domain.ports.resumen_inventario_repository import ResumenInventarioRepository
+from ...domain.ports.version_repository import AmbitoVersion, VersionRepository
+
+# (empresas procesadas, total de empresas, resultado de la última)
+ProgresoLote = Callable[[int, int, ResultadoPdfEmpresa], None]
+
+
+class ObtenerResumenInventarioUseCase:
+    
+    def __init__(self, resumen_repository: ResumenInventarioRepository, empresa_repository: EmpresaRepository):
+        self._resumen_repository = resumen_repository
+        self._empresa_repository = empresa_repository
+    
+    def ejecutar(self, empresa_nit: str) -> Optional[ResumenInventario]:
+        
+        if not self._empresa_repository.existe(empresa_nit):
+            return None
+        
+        return self._resumen_repository.obtener(empresa_nit)
+
+
+class ReconstruirResumenInventarioUseCase:
+    
+    def __init__(self, resumen_repository: ResumenInventarioRepository):
+        self._resumen_repository = resumen_repository
+    
+    def ejecutar(self, empresa_nit: Optional[str] = None) -> int:
+        return self._resumen_repository.reconstruir(empresa_nit)
+
+
+class GenerarPdfInventarioUseCase:
+    """
+    Genera el PDF de inventario de una empresa o lo toma de la caché. La clave
+    se arma con las versiones de la empresa y de sus productos (ver
+    VersionRepository) y con la plantilla del generador, que cambia cuando
+    cambia el diseño del PDF: un acierto no consulta los productos ni vuelve
+    a dibujar el PDF.
+    Desde `umbral_grande` productos (según el resumen de inventario) los
+    productos se recorren por lotes y el PDF se escribe a un archivo
+    temporal; con 0 siempre se generan en memoria.
+    Lo que se guarda en la caché debe leerse después de las versiones de la
+    clave: `empresa_repository` no debe tener caché de lectura propia.
+    """
+    
+    def __init__(
+        self,
+        empresa_repository: EmpresaRepository,
+        producto_repository: ProductoRepository,
+        version_repository: VersionRepository,
+        resumen_repository: ResumenInventarioRepository,
+        generador: GeneradorPdfInventario,
+        cache_pdf: Optional[CachePdfInventario] = None,
+        umbral_grande: int = 0
+    ):
+        self._empresa_repository = empresa_repository
+        self._producto_repository = producto_repository
+        self._version_repository = version_repository
+        self._resumen_repository = resumen_repository
+        self._generador = generador
+        self._cache_pdf = cache_pdf
+        self._umbral_grande = umbral_grande
+    
+    def ejecutar(self, empresa_nit: str) -> Optional[PdfInventario]:
+        # Las versiones se leen antes que los datos: si una escritura llega en
+        # medio, el PDF guardado con la versión anterior ya la incluye y la
+        # siguiente petición, con la versión nueva, lo vuelve a generar
+        versiones = [
+            self._version_repository.obtener(ambito, empresa_nit)
+            for ambito in (AmbitoVersion.EMPRESAS, AmbitoVersion.PRODUCTOS)
+        ]
+        modificados = [version.modificado for version in versiones if version]
+        datos_al = max(modificados) if modificados else None
+        
+        clave = None
+        if self._cache_pdf:
+            # Sin fila aún no hubo escrituras registradas: la versión es 0
+            # La fecha distingue una BD recreada o vaciada, donde los números vuelven a empezar en 1
+            numeros = ':'.join(
+                f"{version.numero}@{version.modificado.isoformat()}" if version else "0" for version in versiones
+            )
+            clave = hashlib.sha256(f"{empresa_nit}|{numeros}|{self._generador.plantilla}".encode('utf-8')).hexdigest()
+            pdf = self._cache_pdf.obtener(clave)
+            if pdf is not None:
+                return pdf
+        
+        empresa = self._empresa_repository.buscar_por_nit(empresa_nit)
+        if not empresa:
+            return None
+        
+        generado = datetime.now(timezone.utc)
+        if self._es_grande(empresa_nit):
+            productos = self._producto_repository.iterar_por_empresa(empresa_nit)
+            archivo, total_productos = self._generador.generar_grande(empresa, productos, generado, datos_al)
+        else:
+            productos = self._producto_repository.listar_por_empresa(empresa_nit)
+            archivo = self._generador.generar(empresa, productos, generado, datos_al)
+            total_productos = len(productos)
+        
+        pdf = PdfInventario(
+            archivo=archivo,
+            empresa_nit=empresa.nit,
+            empresa_nombre=empresa.nombre,
+            total_productos=total_productos,
+            generado=generado,
+            datos_al=datos_al,
+        )
+        if clave:
+            self._cache_pdf.guardar(clave, pdf)
+        return pdf
+    
+    def _es_grande(self, empresa_nit: str) -> bool:
+        
+        if not self._umbral_grande:
+            return False
+        return self._resumen_repository.obtener(empresa_nit).total_productos >= self._umbral_grande
+
+
+class GenerarLotePdfInventarioUseCase:
+    """
+    PDF de inventario de varias empresas, o de todas, en `destino`. Los
+    productos se leen con una consulta por cada `empresas_por_consulta`
+    empresas y el renderizador dibuja los PDF de un grupo mientras se lee el
+    siguiente. Una empresa que falla no detiene el lote: queda en los errores
+    del resumen.
+    """
+    
+    def __init__(
+        self,
+        empresa_repository: EmpresaRepository,
+        producto_repository: ProductoRepository,
+        renderizador: RenderizadorLotePdf,
+        empresas_por_consulta: int = 50
+    ):
+        self._empresa_repository = empresa_repository
+        self._producto_repository = producto_repository
+        self._renderizador = renderizador
+        self._empresas_por_consulta = empresas_por_consulta
+    
+    def ejecutar(
+        self,
+        destino: DestinoLotePdf,
+        empresa_nits: Optional[Iterable[str]] = None,
+        progreso: Optional[ProgresoLote] = None
+    ) -> ResumenLotePdf:
+        empresas = self._empresa_repository.listar_todas()
+        faltantes = []
+        if empresa_nits is not None:
+            pedidas = list(dict.fromkeys(empresa_nits))
+            por_nit = {empresa.nit: empresa for empresa in empresas}
+            empresas = [por_nit[nit] for nit in pedidas if nit in por_nit]
+            faltantes = [nit for nit in pedidas if nit not in por_nit]
+        
+        resumen = ResumenLotePdf(len(empresas) + len(faltantes))
+        resultados = [
+            ResultadoPdfEmpresa(nit, error=f"No existe una empresa con el NIT: {nit}")
+            for nit in faltantes
+        ]
+        
+        generado = datetime.now(timezone.utc)
+        fecha = generado.strftime('%Y%m%d_%H%M%S')
+        for resultado in chain(resultados, self._renderizador.renderizar(self._inventarios(empresas), generado)):
+            if resultado.contenido is not None:
+                destino.agregar(f"inventario_{resultado.empresa_nit}_{fecha}.pdf", resultado.contenido)
+            resumen.registrar(resultado)
+            if progreso:
+                progreso(resumen.procesadas, resumen.total_empresas, resultado)
+        return resumen
+    
+    def _inventarios(self, empresas: List[Empresa]) -> Iterator[Tuple[Empresa, List[Producto]]]:
+        
+        for inicio in range(0, len(empresas), self._empresas_por_consulta):
+            grupo = empresas[inicio:inicio + self._empresas_por_consulta]
+            productos = self._producto_repository.listar_por_empresas([empresa.nit for empresa in grupo])
+            for empresa in grupo:
+                yield empresa, productos.pop(empresa.nit, [])
@@ -1,20 +1,19 @@
-from decimal import Decimal
-from typing import List, Optional
+from decimal import Decimal, InvalidOperation
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 from ...domain.entities.producto import Moneda, Producto, ProductoPrecio
+from ...domain.ports.cache_respuestas import CacheRespuestas
 from ...domain.ports.empresa_repository import EmpresaRepository
+from ...domain.ports.consultas import FiltroProductos, ProyeccionProductos
+from ...domain.ports.paginacion import Clave, Pagina
 from ...domain.ports.producto_repository import ProductoRepository
 
 
 class CrearProductoUseCase:
     
-    def __init__(
-        self,
-        producto_repository: ProductoRepository,
-        empresa_repository: EmpresaRepository
-    ):
+    def __init__(self, producto_repository: ProductoRepository, cache_respuestas: Optional[CacheRespuestas] = None):
         self._producto_repository = producto_repository
-        self._empresa_repository = empresa_repository
+        self._cache_respuestas = cache_respuestas
     
     def ejecutar(
         self,
@@ -25,12 +24,6 @@ class CrearProductoUseCase:
         descripcion: Optional[str] = None
     ) -> Producto:
        
-        if self._producto_repository.existe(codigo):
-            raise ValueError(f"Ya existe un producto con el código: {codigo}")
-        
-        if not self._empresa_repository.existe(empresa_nit):
-            raise ValueError(f"No existe una empresa con el NIT: {empresa_nit}")
-        
         producto = Producto(
             codigo=codigo,
             nombre=nombre,
@@ -39,7 +32,12 @@ class CrearProductoUseCase:
             descripcion=descripcion
         )
         
-        return self._producto_repository.guardar(producto)
+        # El repositorio rechaza el código duplicado o la empresa inexistente
+        # con los mismos ValueError, sin consultas previas
+        creado = self._producto_repository.crear(producto)
+        if self._cache_respuestas:
+            self._cache_respuestas.invalidar_productos([empresa_nit], [codigo])
+        return creado
 
 
 class ObtenerProductoUseCase:
@@ -47,8 +45,8 @@ class ObtenerProductoUseCase:
     def __init__(self, producto_repository: ProductoRepository):
         self._producto_repository = producto_repository
     
-    def ejecutar(self, codigo: str) -> Optional[Producto]:
-        return self._producto_repository.buscar_por_codigo(codigo)
+    def ejecutar(self, codigo: str, proyeccion: Optional[ProyeccionProductos] = None) -> Optional[Producto]:
+        return self._producto_repository.buscar_por_codigo(codigo, proyeccion)
 
 
 class ListarProductosUseCase:
@@ -56,18 +54,73 @@ class ListarProductosUseCase:
     def __init__(self, producto_repository: ProductoRepository):
         self._producto_repository = producto_repository
     
-    def ejecutar(self, empresa_nit: Optional[str] = None) -> List[Producto]:
+    def ejecutar(self, empresa_nit: Optional[str] = None, proyeccion: Optional[ProyeccionProductos] = None) -> List[Producto]:
 
         if empresa_nit:
-            return self._producto_repository.listar_por_empresa(empresa_nit)
-        return self._producto_repository.listar_todos()
+            return self._producto_repository.listar_por_empresa(empresa_nit, proyeccion)
+        return self._producto_repository.listar_todos(proyeccion)
 
 
-class AgregarPrecioProductoUseCase:
+class BuscarProductosUseCase:
+    
+    def __init__(self, producto_repository: ProductoRepository):
+        self._producto_repository = producto_repository
+    
+    def ejecutar(
+        self,
+        filtro: FiltroProductos,
+        limite: int,
+        despues_de: Optional[Clave] = None,
+        proyeccion: Optional[ProyeccionProductos] = None
+    ) -> Pagina[Producto]:
+        
+        if limite < 1:
+            raise ValueError("El límite debe ser mayor que cero")
+        
+        return self._producto_repository.buscar(filtro, limite, despues_de=despues_de, proyeccion=proyeccion)
+
+
+class BuscarProductosTextoUseCase:
+    
+    def __init__(self, producto_repository: ProductoRepository):
+        self._producto_repository = producto_repository
+    
+    def ejecutar(
+        self,
+        consulta: str,
+        limite: int,
+        desplazamiento: int = 0,
+        proyeccion: Optional[ProyeccionProductos] = None
+    ) -> Pagina[Producto]:
+        
+        if not consulta or not any(c.isalnum() for c in consulta):
+            raise ValueError("La búsqueda debe incluir al menos una palabra")
+        if limite < 1:
+            raise ValueError("El límite debe ser mayor que cero")
+        if desplazamiento < 0:
+            raise ValueError("El cursor no es válido")
+        
+        return self._producto_repository.buscar_texto(consulta.strip(), limite, desplazamiento, proyeccion)
+
+
+class IterarProductosUseCase:
     
     def __init__(self, producto_repository: ProductoRepository):
         self._producto_repository = producto_repository
     
+    def ejecutar(self, empresa_nit: Optional[str] = None, proyeccion: Optional[ProyeccionProductos] = None) -> Iterator[Producto]:
+
+        if empresa_nit:
+            return self._producto_repository.iterar_por_empresa(empresa_nit, proyeccion=proyeccion)
+        return self._producto_repository.iterar_todos(proyeccion=proyeccion)
+
+
+class AgregarPrecioProductoUseCase:
+    
+    def __init__(self, producto_repository: ProductoRepository, cache_respuestas: Optional[CacheRespuestas] = None):
+        self._producto_repository = producto_repository
+        self._cache_respuestas = cache_respuestas
+    
     def ejecutar(
         self,
         codigo_producto: str,
@@ -75,21 +128,170 @@ class AgregarPrecioProductoUseCase:
         valor: Decimal
     ) -> Producto:
 
-        producto = self._producto_repository.buscar_por_codigo(codigo_producto)
-        if not producto:
-            raise ValueError(f"No existe un producto con el código: {codigo_producto}")
-        
         precio = ProductoPrecio(moneda=moneda, valor=valor)
-        producto.agregar_precio(precio)
+        # Solo se escribe esa moneda: leer el producto y guardarlo completo podría
+        # borrar precios agregados entretanto por otra petición
+        guardado = self._producto_repository.agregar_precio(codigo_producto, precio)
+        if not guardado:
+            raise ValueError(f"No existe un producto con el código: {codigo_producto}")
         
-        return self._producto_repository.guardar(producto)
+        if self._cache_respuestas:
+            self._cache_respuestas.invalidar_productos([guardado.empresa_nit], [codigo_producto])
+        return guardado
 
 
 class EliminarProductoUseCase:
     
-    def __init__(self, producto_repository: ProductoRepository):
+    def __init__(self, producto_repository: ProductoRepository, cache_respuestas: Optional[CacheRespuestas] = None):
         self._producto_repository = producto_repository
+        self._cache_respuestas = cache_respuestas
     
     def ejecutar(self, codigo: str) -> bool:
-        return self._producto_repository.eliminar(codigo)
+        
+        eliminado = self._producto_repository.eliminar(codigo)
+        # Sin consultar antes no se conoce la empresa: se descartan todas las respuestas de productos
+        if eliminado and self._cache_respuestas:
+            self._cache_respuestas.invalidar_productos()
+        return eliminado
+
+
+class FilaImportacion:
+    """Registro leído del archivo de importación, o el error que impidió leerlo."""
 
+    def __init__(self, numero: int, datos: Optional[dict] = None, error: Optional[str] = None):
+        self.numero = numero
+        self.datos = datos
+        self.error = error
+
+
+class ResultadoImportacion:
+
+    # Para no devolver respuestas gigantes solo se detallan los primeros errores
+    MAX_ERRORES_DETALLADOS = 1000
+    
+    def __init__(self):
+        self.procesados = 0
+        self.guardados = 0
+        self.total_errores = 0
+        self.errores: List[dict] = []
+    
+    def registrar_error(self, fila: int, codigo: Optional[str], mensaje: str) -> None:
+        
+        self.total_errores += 1
+        if len(self.errores) < self.MAX_ERRORES_DETALLADOS:
+            self.errores.append({'fila': fila, 'codigo': codigo, 'error': mensaje})
+
+
+class ImportarProductosUseCase:
+    """
+    Crea o actualiza productos (con sus precios) a partir de un flujo de filas.
+    Cada fila se valida con las reglas del dominio y las válidas se escriben
+    en lotes, cada uno dentro de su propia transacción.
+    """
+
+    def __init__(
+        self,
+        producto_repository: ProductoRepository,
+        empresa_repository: EmpresaRepository,
+        tamano_lote: int = 1000,
+        cache_respuestas: Optional[CacheRespuestas] = None
+    ):
+        self._producto_repository = producto_repository
+        self._empresa_repository = empresa_repository
+        self._tamano_lote = tamano_lote
+        self._cache_respuestas = cache_respuestas
+    
+    def ejecutar(self, filas: Iterable[FilaImportacion]) -> ResultadoImportacion:
+        
+        resultado = ResultadoImportacion()
+        lote: List[Tuple[int, Producto]] = []
+        
+        for fila in filas:
+            resultado.procesados += 1
+            datos = fila.datos or {}
+            if fila.error:
+                resultado.registrar_error(fila.numero, None, fila.error)
+                continue
+            
+            try:
+                producto = self._construir_producto(datos)
+            except ValueError as e:
+                resultado.registrar_error(fila.numero, datos.get('codigo'), str(e))
+                continue
+            
+            lote.append((fila.numero, producto))
+            if len(lote) >= self._tamano_lote:
+                self._guardar_lote(lote, resultado)
+                lote = []
+        
+        if lote:
+            self._guardar_lote(lote, resultado)
+        
+        # Un producto existente pudo cambiar de empresa: se descartan todas las respuestas de productos
+        if resultado.guardados and self._cache_respuestas:
+            self._cache_respuestas.invalidar_productos()
+        
+        return resultado
+    
+    def _construir_producto(self, datos: dict) -> Producto:
+        
+        producto = Producto(
+            codigo=self._texto(datos, 'codigo'),
+            nombre=self._texto(datos, 'nombre'),
+            empresa_nit=self._texto(datos, 'empresa_nit'),
+            caracteristicas=self._texto(datos, 'caracteristicas'),
+            descripcion=self._texto(datos, 'descripcion')
+        )
+        
+        precios = datos.get('precios') or []
+        if not isinstance(precios, list):
+            raise ValueError("'precios' debe ser una lista")
+        for precio in precios:
+            if not isinstance(precio, dict):
+                raise ValueError("Cada precio debe indicar 'moneda' y 'valor'")
+            try:
+                moneda = Moneda(precio.get('moneda'))
+            except ValueError:
+                raise ValueError(f"Moneda no válida: {precio.get('moneda')}")
+            try:
+                valor = Decimal(str(precio.get('valor')).strip())
+            except InvalidOperation:
+                raise ValueError(f"Valor de precio no válido: {precio.get('valor')}")
+            if not valor.is_finite():
+                raise ValueError(f"Valor de precio no válido: {precio.get('valor')}")
+            producto.agregar_precio(ProductoPrecio(moneda=moneda, valor=valor))
+        
+        return producto
+    
+    def _texto(self, datos: dict, campo: str) -> Optional[str]:
+        
+        valor = datos.get(campo)
+        return None if valor is None else str(valor)
+    
+    def _guardar_lote(self, lote: List[Tuple[int, Producto]], resultado: ResultadoImportacion) -> None:
+        
+        # Una sola consulta por lote para validar las empresas referenciadas
+        empresas = self._empresa_repository.nits_existentes({p.empresa_nit for _, p in lote})
+        
+        validos = []
+        for numero, producto in lote:
+            if producto.empresa_nit not in empresas:
+                resultado.registrar_error(
+                    numero,
+                    producto.codigo,
+                    f"No existe una empresa con el NIT: {producto.empresa_nit}"
+                )
+            else:
+                validos.append((numero, producto))
+        
+        if not validos:
+            return
+        try:
+            self._producto_repository.guardar_muchos([producto for _, producto in validos])
+        except ValueError as e:
+            # Una empresa borrada después de la validación: el lote completo se descarta
+            for numero, producto in validos:
+                resultado.registrar_error(numero, producto.codigo, str(e))
+            return
+        # guardar_muchos escribe una sola vez cada código repetido en el lote
+        resultado.guardados += len({producto.codigo for _, producto in validos})
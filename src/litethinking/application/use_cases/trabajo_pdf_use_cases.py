@@ -0,0 +1,155 @@
+from datetime import datetime, timedelta
+from typing import BinaryIO, Callable, List, Optional
+
+from ...domain.entities.lote_pdf import ResultadoPdfEmpresa
+from ...domain.entities.pdf_inventario import PdfInventario
+from ...domain.entities.trabajo_pdf import TrabajoPdf
+from ...domain.ports.empresa_repository import EmpresaRepository
+from ...domain.ports.lote_pdf import DestinoLotePdf
+from ...domain.ports.trabajo_pdf_repository import TrabajoPdfRepository
+from .inventario_use_cases import GenerarLotePdfInventarioUseCase, GenerarPdfInventarioUseCase
+
+# (pdf, email destino)
+EnviadorCorreo = Callable[[PdfInventario, str], None]
+
+# Destino nuevo para el ZIP de un lote; cerrar() debe devolver el archivo
+CreadorDestinoLote = Callable[[], DestinoLotePdf]
+
+
+class SolicitarPdfInventarioUseCase:
+    
+    def __init__(self, trabajo_repository: TrabajoPdfRepository, empresa_repository: EmpresaRepository):
+        self._trabajo_repository = trabajo_repository
+        self._empresa_repository = empresa_repository
+    
+    def ejecutar(
+        self,
+        empresa_nit: str,
+        email_destino: Optional[str] = None,
+        solicitado_por: Optional[int] = None
+    ) -> Optional[TrabajoPdf]:
+        
+        if not self._empresa_repository.existe(empresa_nit):
+            return None
+        
+        return self._trabajo_repository.crear(empresa_nit, email_destino, solicitado_por)
+
+
+class SolicitarLotePdfUseCase:
+    
+    def __init__(self, trabajo_repository: TrabajoPdfRepository, empresa_repository: EmpresaRepository):
+        self._trabajo_repository = trabajo_repository
+        self._empresa_repository = empresa_repository
+    
+    def ejecutar(self, empresa_nits: Optional[List[str]] = None, solicitado_por: Optional[int] = None) -> TrabajoPdf:
+        """Encola el lote de las empresas indicadas o, sin `empresa_nits`, de todas las que haya al procesarlo."""
+        if empresa_nits is not None:
+            empresa_nits = list(dict.fromkeys(empresa_nits))
+            if not empresa_nits:
+                raise ValueError("Indique al menos una empresa u omita 'empresas' para incluirlas todas")
+            faltantes = set(empresa_nits) - self._empresa_repository.nits_existentes(empresa_nits)
+            if faltantes:
+                raise ValueError(f"No existen empresas con los NIT: {', '.join(sorted(faltantes))}")
+        
+        return self._trabajo_repository.crear_lote(empresa_nits, solicitado_por)
+
+
+class ObtenerTrabajoPdfUseCase:
+    
+    def __init__(self, trabajo_repository: TrabajoPdfRepository):
+        self._trabajo_repository = trabajo_repository
+    
+    def ejecutar(self, trabajo_id: str) -> Optional[TrabajoPdf]:
+        return self._trabajo_repository.obtener(trabajo_id)
+
+
+class AbrirPdfTrabajoUseCase:
+    
+    def __init__(self, trabajo_repository: TrabajoPdfRepository):
+        self._trabajo_repository = trabajo_repository
+    
+    def ejecutar(self, trabajo_id: str) -> Optional[BinaryIO]:
+        return self._trabajo_repository.abrir_pdf(trabajo_id)
+
+
+class ProcesarTrabajoPdfUseCase:
+    
+    def __init__(
+        self,
+        trabajo_repository: TrabajoPdfRepository,
+        generar_pdf: GenerarPdfInventarioUseCase,
+        enviar_correo: Optional[EnviadorCorreo] = None,
+        generar_lote: Optional[GenerarLotePdfInventarioUseCase] = None,
+        crear_destino_lote: Optional[CreadorDestinoLote] = None
+    ):
+        self._trabajo_repository = trabajo_repository
+        self._generar_pdf = generar_pdf
+        self._enviar_correo = enviar_correo
+        self._generar_lote = generar_lote
+        self._crear_destino_lote = crear_destino_lote
+    
+    def ejecutar(self, trabajador: str) -> Optional[TrabajoPdf]:
+        """Procesa el siguiente trabajo de la cola; None si no hay ninguno."""
+        trabajo = self._trabajo_repository.reclamar_siguiente(trabajador)
+        if trabajo is None:
+            return None
+        if trabajo.es_lote:
+            return self._procesar_lote(trabajo, trabajador)
+        
+        try:
+            pdf = self._generar_pdf.ejecutar(trabajo.empresa_nit)
+            if pdf is None:
+                raise ValueError(f"No existe una empresa con el NIT: {trabajo.empresa_nit}")
+        except Exception as e:
+            self._trabajo_repository.fallar(trabajo, trabajador, str(e))
+            return self._trabajo_repository.obtener(trabajo.id)
+        
+        # Si el correo falla el PDF igual queda disponible para descargar
+        error_correo = ""
+        if trabajo.email_destino and self._enviar_correo:
+            try:
+                self._enviar_correo(pdf, trabajo.email_destino)
+            except Exception as e:
+                error_correo = f"No se pudo enviar el correo: {e}"
+        
+        try:
+            self._trabajo_repository.completar(trabajo, trabajador, pdf.archivo, pdf.total_productos, error_correo)
+        finally:
+            pdf.archivo.close()
+        return self._trabajo_repository.obtener(trabajo.id)
+    
+    def _procesar_lote(self, trabajo: TrabajoPdf, trabajador: str) -> TrabajoPdf:
+        
+        if not self._generar_lote or not self._crear_destino_lote:
+            self._trabajo_repository.fallar(trabajo, trabajador, "Este trabajador no procesa lotes")
+            return self._trabajo_repository.obtener(trabajo.id)
+        
+        def progreso(procesadas: int, total: int, resultado: ResultadoPdfEmpresa) -> None:
+            if not self._trabajo_repository.avanzar(trabajo, trabajador, procesadas, total):
+                raise RuntimeError("Otro trabajador tomó el lote")
+        
+        destino = self._crear_destino_lote()
+        try:
+            resumen = self._generar_lote.ejecutar(destino, trabajo.empresas or None, progreso)
+        except Exception as e:
+            destino.cerrar().close()
+            self._trabajo_repository.fallar(trabajo, trabajador, str(e))
+            return self._trabajo_repository.obtener(trabajo.id)
+        
+        # Las empresas sin PDF no hacen fallar el lote: quedan como aviso
+        avisos = "; ".join(f"{nit}: {error}" for nit, error in resumen.errores.items())
+        archivo = destino.cerrar()
+        try:
+            self._trabajo_repository.completar(trabajo, trabajador, archivo, resumen.total_productos, avisos)
+        finally:
+            archivo.close()
+        return self._trabajo_repository.obtener(trabajo.id)
+
+
+class PurgarTrabajosPdfUseCase:
+    
+    def __init__(self, trabajo_repository: TrabajoPdfRepository):
+        self._trabajo_repository = trabajo_repository
+    
+    def ejecutar(self, retencion: timedelta, ahora: datetime) -> int:
+        return self._trabajo_repository.purgar(ahora - retencion)
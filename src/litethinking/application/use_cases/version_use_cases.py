@@ -0,0 +1,12 @@
+from typing import Optional
+
+from ...domain.ports.version_repository import AmbitoVersion, VersionRecurso, VersionRepository
+
+
+class ObtenerVersionUseCase:
+    
+    def __init__(self, version_repository: VersionRepository):
+        self._version_repository = version_repository
+    
+    def ejecutar(self, ambito: AmbitoVersion, empresa_nit: Optional[str] = None) -> Optional[VersionRecurso]:
+        return self._version_repository.obtener(ambito, empresa_nit)
@@ -1,4 +1,6 @@
 class Empresa:
+
+    __slots__ = ('nit', 'nombre', 'direccion', 'telefono')
    
     def __init__(self, nit: str, nombre: str, direccion: str, telefono: str):
         
@@ -12,6 +14,16 @@ class Empresa:
         self.direccion = direccion
         self.telefono = telefono
     
+    @classmethod
+    def from_persistence(cls, nit: str, nombre: str, direccion: str, telefono: str) -> 'Empresa':
+        """Construye sin validar: solo para filas leídas de la persistencia, que ya son válidas."""
+        empresa = cls.__new__(cls)
+        empresa.nit = nit
+        empresa.nombre = nombre
+        empresa.direccion = direccion
+        empresa.telefono = telefono
+        return empresa
+    
     def _validar_nit(self, nit: str) -> None:
 
         if not nit or not nit.strip():
@@ -0,0 +1,55 @@
+from typing import Dict, Optional
+
+
+class ResultadoPdfEmpresa:
+    """PDF de inventario de una empresa dentro de un lote, o el error que impidió generarlo."""
+
+    __slots__ = ('empresa_nit', 'empresa_nombre', 'total_productos', 'contenido', 'error')
+
+    def __init__(
+        self,
+        empresa_nit: str,
+        empresa_nombre: str = "",
+        total_productos: int = 0,
+        contenido: Optional[bytes] = None,
+        error: str = ""
+    ):
+
+        self.empresa_nit = empresa_nit
+        self.empresa_nombre = empresa_nombre
+        self.total_productos = total_productos
+        self.contenido = contenido
+        self.error = error
+    
+    def __repr__(self) -> str:
+
+        detalle = f"error='{self.error}'" if self.error else f"total_productos={self.total_productos}"
+        return f"ResultadoPdfEmpresa(empresa_nit='{self.empresa_nit}', {detalle})"
+
+
+class ResumenLotePdf:
+
+    def __init__(self, total_empresas: int):
+
+        self.total_empresas = total_empresas
+        self.generados = 0
+        self.total_productos = 0
+        # NIT -> error de las empresas sin PDF
+        self.errores: Dict[str, str] = {}
+    
+    @property
+    def procesadas(self) -> int:
+
+        return self.generados + len(self.errores)
+    
+    def registrar(self, resultado: ResultadoPdfEmpresa) -> None:
+
+        if resultado.error:
+            self.errores[resultado.empresa_nit] = resultado.error
+            return
+        self.generados += 1
+        self.total_productos += resultado.total_productos
+    
+    def __repr__(self) -> str:
+
+        return f"ResumenLotePdf(generados={self.generados}/{self.total_empresas}, errores={len(self.errores)})"
@@ -0,0 +1,51 @@
+import os
+from datetime import datetime
+from typing import BinaryIO, Optional
+
+
+class PdfInventario:
+    """
+    PDF de inventario ya generado. `datos_al` es la fecha de la última
+    escritura que afectó a la empresa o a sus productos: el contenido no
+    cambia mientras no haya otra, aunque el PDF se entregue desde la caché.
+    `archivo` se lee desde el inicio y puede ser un archivo temporal en disco:
+    el PDF de un inventario grande no se carga completo en memoria.
+    """
+
+    __slots__ = ('archivo', 'empresa_nit', 'empresa_nombre', 'total_productos', 'generado', 'datos_al')
+
+    def __init__(
+        self,
+        archivo: BinaryIO,
+        empresa_nit: str,
+        empresa_nombre: str,
+        total_productos: int,
+        generado: datetime,
+        datos_al: Optional[datetime] = None
+    ):
+
+        self.archivo = archivo
+        self.empresa_nit = empresa_nit
+        self.empresa_nombre = empresa_nombre
+        self.total_productos = total_productos
+        self.generado = generado
+        self.datos_al = datos_al
+    
+    @property
+    def tamano(self) -> int:
+
+        posicion = self.archivo.tell()
+        tamano = self.archivo.seek(0, os.SEEK_END)
+        self.archivo.seek(posicion)
+        return tamano
+    
+    def leer(self) -> bytes:
+
+        self.archivo.seek(0)
+        contenido = self.archivo.read()
+        self.archivo.seek(0)
+        return contenido
+    
+    def __repr__(self) -> str:
+
+        return f"PdfInventario(empresa_nit='{self.empresa_nit}', bytes={self.tamano}, generado={self.generado!r})"
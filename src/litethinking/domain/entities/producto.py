@@ -1,7 +1,9 @@
 import re
 from decimal import Decimal
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
+
+CODIGO_PATRON = re.compile(r'^[A-Za-z]+-\d+$')
 
 
 class Moneda(str, Enum):
@@ -23,12 +25,22 @@ class Moneda(str, Enum):
 
 class ProductoPrecio:
 
+    __slots__ = ('moneda', 'valor')
+
     def __init__(self, moneda: Moneda, valor: Decimal):
 
         self._validar_valor(valor)
         self.moneda = moneda
         self.valor = valor
     
+    @classmethod
+    def from_persistence(cls, moneda: Moneda, valor: Decimal) -> 'ProductoPrecio':
+        """Construye sin validar: solo para datos leídos de la persistencia."""
+        precio = cls.__new__(cls)
+        precio.moneda = moneda
+        precio.valor = valor
+        return precio
+    
     def _validar_valor(self, valor: Decimal) -> None:
 
         if valor < 0:
@@ -53,6 +65,8 @@ class ProductoPrecio:
 
 
 class Producto:
+
+    __slots__ = ('codigo', 'nombre', 'empresa_nit', 'caracteristicas', 'descripcion', '_precios')
      
     def __init__(
         self,
@@ -75,6 +89,46 @@ class Producto:
         self.descripcion = descripcion or ""
         self.precios = precios or []
     
+    @classmethod
+    def from_persistence(
+        cls,
+        codigo: str,
+        nombre: str,
+        empresa_nit: str,
+        caracteristicas: Optional[str],
+        descripcion: Optional[str],
+        valores: Optional[Dict[Moneda, Decimal]] = None
+    ) -> 'Producto':
+        """
+        Construye sin validar: solo para filas leídas de la persistencia, que
+        ya son válidas. `valores` (moneda -> valor) pasa a ser del producto.
+        """
+        producto = cls.__new__(cls)
+        producto.codigo = codigo
+        producto.nombre = nombre
+        producto.empresa_nit = empresa_nit
+        producto.caracteristicas = caracteristicas or ""
+        producto.descripcion = descripcion or ""
+        producto._precios = valores if valores is not None else {}
+        return producto
+    
+    @property
+    def precios(self) -> List[ProductoPrecio]:
+
+        # Se guardan solo los valores por moneda; los ProductoPrecio se crean al leerlos
+        return [ProductoPrecio.from_persistence(moneda, valor) for moneda, valor in self._precios.items()]
+    
+    @precios.setter
+    def precios(self, precios: Iterable[ProductoPrecio]) -> None:
+
+        # Un precio por moneda; si una moneda se repite prevalece el último
+        self._precios = {precio.moneda: precio.valor for precio in precios}
+    
+    @property
+    def valores(self) -> Dict[Moneda, Decimal]:
+
+        return dict(self._precios)
+    
     def _validar_codigo(self, codigo: str) -> None:
        
         if not codigo or not codigo.strip():
@@ -82,8 +136,7 @@ class Producto:
         if len(codigo) > 50:
             raise ValueError("El código no puede exceder 50 caracteres")
         
-        codigo_pattern = re.compile(r'^[A-Za-z]+-\d+$')
-        if not codigo_pattern.match(codigo.strip()):
+        if not CODIGO_PATRON.match(codigo.strip()):
             raise ValueError(
                 "El código debe seguir el formato 'nombre-numero' (ej: PROD-001, LAPTOP-123). "
                 "Solo se permiten letras, un guion y números."
@@ -103,19 +156,18 @@ class Producto:
     
     def agregar_precio(self, precio: ProductoPrecio) -> None:
         
-        self.precios = [p for p in self.precios if p.moneda != precio.moneda]
-        self.precios.append(precio)
+        # Reemplaza el de la misma moneda y lo deja al final, como antes
+        self._precios.pop(precio.moneda, None)
+        self._precios[precio.moneda] = precio.valor
     
     def obtener_precio(self, moneda: Moneda) -> Optional[ProductoPrecio]:
       
-        for precio in self.precios:
-            if precio.moneda == moneda:
-                return precio
-        return None
+        valor = self._precios.get(moneda)
+        return None if valor is None else ProductoPrecio.from_persistence(moneda, valor)
     
     def remover_precio(self, moneda: Moneda) -> None:
        
-        self.precios = [p for p in self.precios if p.moneda != moneda]
+        self._precios.pop(moneda, None)
     
     def actualizar_nombre(self, nuevo_nombre: str) -> None:
         
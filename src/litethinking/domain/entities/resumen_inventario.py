@@ -0,0 +1,49 @@
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Optional
+
+from .producto import Moneda
+
+
+class EstadisticaPrecios:
+    """Value Object: estadísticas de los precios de una moneda"""
+
+    def __init__(self, cantidad: int, suma: Decimal, minimo: Optional[Decimal], maximo: Optional[Decimal]):
+
+        self.cantidad = cantidad
+        self.suma = suma
+        self.minimo = minimo
+        self.maximo = maximo
+    
+    @property
+    def promedio(self) -> Decimal:
+
+        return (self.suma / self.cantidad).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    
+    def __repr__(self) -> str:
+
+        return f"EstadisticaPrecios(cantidad={self.cantidad}, minimo={self.minimo}, maximo={self.maximo})"
+
+
+class ResumenInventario:
+
+    def __init__(
+        self,
+        empresa_nit: str,
+        total_productos: int = 0,
+        con_precio: int = 0,
+        estadisticas: Optional[Dict[Moneda, EstadisticaPrecios]] = None
+    ):
+
+        self.empresa_nit = empresa_nit
+        self.total_productos = total_productos
+        self.con_precio = con_precio
+        self.estadisticas = estadisticas or {}
+    
+    @property
+    def sin_precio(self) -> int:
+
+        return self.total_productos - self.con_precio
+    
+    def __repr__(self) -> str:
+
+        return f"ResumenInventario(empresa_nit='{self.empresa_nit}', total_productos={self.total_productos})"
@@ -0,0 +1,74 @@
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+
+class EstadoTrabajo(str, Enum):
+    PENDIENTE = "pendiente"
+    EN_PROCESO = "en_proceso"
+    COMPLETADO = "completado"
+    FALLIDO = "fallido"
+
+
+class TrabajoPdf:
+    """
+    Generación en segundo plano del PDF de inventario de una empresa o, si
+    tiene `empresas`, de un ZIP con los de varias (lista vacía: todas).
+    """
+
+    def __init__(
+        self,
+        id: str,
+        empresa_nit: str,
+        estado: EstadoTrabajo,
+        creado: datetime,
+        email_destino: Optional[str] = None,
+        solicitado_por: Optional[int] = None,
+        iniciado: Optional[datetime] = None,
+        terminado: Optional[datetime] = None,
+        intentos: int = 0,
+        total_productos: Optional[int] = None,
+        error: str = "",
+        empresas: Optional[List[str]] = None,
+        procesados: Optional[int] = None,
+        total_empresas: Optional[int] = None
+    ):
+
+        self.id = id
+        self.empresa_nit = empresa_nit
+        self.estado = estado
+        self.creado = creado
+        self.email_destino = email_destino
+        self.solicitado_por = solicitado_por
+        self.iniciado = iniciado
+        self.terminado = terminado
+        self.intentos = intentos
+        self.total_productos = total_productos
+        self.error = error
+        self.empresas = empresas
+        self.procesados = procesados
+        self.total_empresas = total_empresas
+    
+    @property
+    def es_lote(self) -> bool:
+
+        return self.empresas is not None
+    
+    @property
+    def nombre_archivo(self) -> str:
+
+        fecha = (self.terminado or self.creado).strftime('%Y%m%d_%H%M%S')
+        if self.es_lote:
+            return f'inventarios_{fecha}.zip'
+        return f'inventario_{self.empresa_nit}_{fecha}.pdf'
+    
+    @property
+    def tipo_contenido(self) -> str:
+
+        return 'application/zip' if self.es_lote else 'application/pdf'
+    
+    def __repr__(self) -> str:
+
+        if self.es_lote:
+            return f"TrabajoPdf(id='{self.id}', empresas={len(self.empresas) or 'todas'}, estado={self.estado.value})"
+        return f"TrabajoPdf(id='{self.id}', empresa_nit='{self.empresa_nit}', estado={self.estado.value})"
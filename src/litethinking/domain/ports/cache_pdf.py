@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from ..entities.pdf_inventario import PdfInventario
+
+
+class CachePdfInventario(ABC):
+    """
+    PDF de inventario ya generados, por clave de contenido: la clave cambia
+    con cualquier escritura que afecte a la empresa o a sus productos, así
+    que una entrada nunca queda desactualizada, solo deja de pedirse.
+    """
+    
+    @abstractmethod
+    def obtener(self, clave: str) -> Optional[PdfInventario]:
+        pass
+    
+    @abstractmethod
+    def guardar(self, clave: str, pdf: PdfInventario) -> None:
+        pass
+    
+    @abstractmethod
+    def estadisticas(self) -> dict:
+        pass
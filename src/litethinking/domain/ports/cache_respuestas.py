@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, Optional
+
+
+class CacheRespuestas(ABC):
+    """
+    Caché de las respuestas ya codificadas de la API. Los casos de uso de
+    escritura la invalidan después de guardar.
+    """
+    
+    @abstractmethod
+    def invalidar_empresas(self) -> None:
+        """Descarta los listados de empresas."""
+        pass
+    
+    @abstractmethod
+    def invalidar_productos(self, empresas: Optional[Iterable[str]] = None, codigos: Iterable[str] = ()) -> None:
+        """
+        Descarta los listados de productos de `empresas` y los detalles de
+        `codigos`. Sin `empresas` descarta todas las respuestas de productos.
+        """
+        pass
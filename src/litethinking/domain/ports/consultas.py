@@ -0,0 +1,89 @@
+from decimal import Decimal
+from enum import Enum
+from typing import Iterable, Optional
+
+from ..entities.producto import Moneda
+
+
+class OrdenProductos(str, Enum):
+    CODIGO = "codigo"
+    NOMBRE = "nombre"
+    NOMBRE_DESC = "-nombre"
+    PRECIO = "precio"
+    PRECIO_DESC = "-precio"
+    
+    @property
+    def usa_precio(self) -> bool:
+        
+        return self in (OrdenProductos.PRECIO, OrdenProductos.PRECIO_DESC)
+
+
+class FiltroProductos:
+    """
+    Criterios de búsqueda de productos que el repositorio debe resolver en
+    la base de datos. Los filtros y el orden por precio aplican sobre el
+    precio en `moneda`, por lo que solo devuelven productos con precio en ella.
+    """
+
+    def __init__(
+        self,
+        empresa_nit: Optional[str] = None,
+        moneda: Optional[Moneda] = None,
+        valor_min: Optional[Decimal] = None,
+        valor_max: Optional[Decimal] = None,
+        nombre_prefijo: Optional[str] = None,
+        orden: OrdenProductos = OrdenProductos.CODIGO
+    ):
+        
+        usa_precio = valor_min is not None or valor_max is not None or orden.usa_precio
+        if usa_precio and moneda is None:
+            raise ValueError("Para filtrar u ordenar por precio se debe indicar la moneda")
+        if valor_min is not None and valor_max is not None and valor_min > valor_max:
+            raise ValueError("El precio mínimo no puede ser mayor que el precio máximo")
+        
+        self.empresa_nit = empresa_nit or None
+        self.moneda = moneda
+        self.valor_min = valor_min
+        self.valor_max = valor_max
+        self.nombre_prefijo = nombre_prefijo or None
+        self.orden = orden
+    
+    def __repr__(self) -> str:
+        
+        return (
+            f"FiltroProductos(empresa_nit={self.empresa_nit!r}, moneda={self.moneda}, "
+            f"valor_min={self.valor_min}, valor_max={self.valor_max}, "
+            f"nombre_prefijo={self.nombre_prefijo!r}, orden={self.orden.value})"
+        )
+
+
+class ProyeccionProductos:
+    """
+    Campos de producto que necesita quien consulta. El repositorio solo lee
+    esas columnas y omite los precios si no se piden; en las entidades
+    devueltas los demás atributos quedan en None y sin precios.
+    El código siempre se incluye porque identifica al producto.
+    """
+
+    CAMPOS = ('codigo', 'nombre', 'empresa_nit', 'caracteristicas', 'descripcion')
+
+    def __init__(self, campos: Optional[Iterable[str]] = None, incluir_precios: bool = True):
+        
+        campos = self.CAMPOS if campos is None else set(campos)
+        invalidos = sorted(set(campos) - set(self.CAMPOS))
+        if invalidos:
+            raise ValueError(
+                f"Campos no válidos: {', '.join(invalidos)}. Opciones: {', '.join(self.CAMPOS)}"
+            )
+        
+        self.campos = tuple(campo for campo in self.CAMPOS if campo == 'codigo' or campo in campos)
+        self.incluir_precios = incluir_precios
+    
+    @property
+    def completa(self) -> bool:
+        
+        return self.incluir_precios and len(self.campos) == len(self.CAMPOS)
+    
+    def __repr__(self) -> str:
+        
+        return f"ProyeccionProductos(campos={self.campos}, incluir_precios={self.incluir_precios})"
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Set
 
 from ..entities.empresa import Empresa
+from .paginacion import Pagina
 
 
 class EmpresaRepository(ABC):
@@ -10,6 +11,11 @@ class EmpresaRepository(ABC):
     def guardar(self, empresa: Empresa) -> Empresa:
         pass
     
+    @abstractmethod
+    def crear(self, empresa: Empresa) -> Empresa:
+        """Inserta una empresa nueva; lanza ValueError si el NIT ya existe."""
+        pass
+    
     @abstractmethod
     def buscar_por_nit(self, nit: str) -> Optional[Empresa]:
         pass
@@ -18,6 +24,14 @@ class EmpresaRepository(ABC):
     def listar_todas(self) -> List[Empresa]:
         pass
     
+    @abstractmethod
+    def iterar_todas(self, tamano_lote: int = 1000) -> Iterator[Empresa]:
+        pass
+    
+    @abstractmethod
+    def listar_pagina(self, limite: int, despues_de: Optional[str] = None) -> Pagina[Empresa]:
+        pass
+    
     @abstractmethod
     def eliminar(self, nit: str) -> bool:
         pass
@@ -25,4 +39,7 @@ class EmpresaRepository(ABC):
     @abstractmethod
     def existe(self, nit: str) -> bool:
         pass
-
+    
+    @abstractmethod
+    def nits_existentes(self, nits: Iterable[str]) -> Set[str]:
+        pass
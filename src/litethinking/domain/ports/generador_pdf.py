@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from ..entities.empresa import Empresa
+from ..entities.producto import Producto
+
+
+class GeneradorPdfInventario(ABC):
+    
+    @property
+    @abstractmethod
+    def plantilla(self) -> str:
+        """Identifica el diseño del PDF: forma parte de la clave de la caché."""
+        pass
+    
+    @abstractmethod
+    def generar(
+        self,
+        empresa: Empresa,
+        productos: List[Producto],
+        generado: datetime,
+        datos_al: Optional[datetime] = None
+    ) -> BinaryIO:
+        """PDF de un inventario que ya está en memoria, posicionado al inicio."""
+        pass
+    
+    @abstractmethod
+    def generar_grande(
+        self,
+        empresa: Empresa,
+        productos: Iterator[Producto],
+        generado: datetime,
+        datos_al: Optional[datetime] = None
+    ) -> Tuple[BinaryIO, int]:
+        """
+        PDF de un inventario que se recorre una sola vez, sin reunir los
+        productos ni el PDF en memoria. Devuelve el archivo, posicionado al
+        inicio, y la cantidad de productos incluidos.
+        """
+        pass
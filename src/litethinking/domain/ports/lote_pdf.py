@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+
+from ..entities.empresa import Empresa
+from ..entities.lote_pdf import ResultadoPdfEmpresa
+from ..entities.producto import Producto
+
+
+class RenderizadorLotePdf(ABC):
+    
+    @abstractmethod
+    def renderizar(
+        self,
+        inventarios: Iterable[Tuple[Empresa, List[Producto]]],
+        generado: datetime
+    ) -> Iterator[ResultadoPdfEmpresa]:
+        """
+        Dibuja el PDF de cada inventario, posiblemente varios a la vez. Los
+        resultados llegan en el orden en que terminan; `inventarios` se
+        consume a medida que hay capacidad, así que puede leerse por partes.
+        """
+        pass
+
+
+class DestinoLotePdf(ABC):
+    """Dónde quedan los PDF de un lote: un ZIP, un directorio, etc."""
+    
+    @abstractmethod
+    def agregar(self, nombre_archivo: str, contenido: bytes) -> None:
+        pass
+    
+    def cerrar(self) -> Optional[BinaryIO]:
+        """Termina el lote; devuelve el archivo resultante, posicionado al inicio, si el destino produce uno."""
+        return None
@@ -0,0 +1,23 @@
+from typing import Generic, List, Optional, TypeVar, Union
+
+T = TypeVar('T')
+
+# Clave de paginación: la clave primaria o, si se ordena por otro campo,
+# la lista [valor del campo, clave primaria]
+Clave = Union[str, List[str]]
+
+
+class Pagina(Generic[T]):
+    """
+    Resultado de una consulta paginada por clave (keyset).
+    `siguiente` es la clave del último elemento devuelto cuando quedan más
+    elementos, o None si esta es la última página.
+    """
+
+    def __init__(self, items: List[T], siguiente: Optional[Clave] = None):
+        self.items = items
+        self.siguiente = siguiente
+    
+    def __repr__(self) -> str:
+        
+        return f"Pagina(items={len(self.items)}, siguiente={self.siguiente!r})"
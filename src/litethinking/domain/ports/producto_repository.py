@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 
-from ..entities.producto import Producto
+from ..entities.producto import Producto, ProductoPrecio
+from .consultas import FiltroProductos, ProyeccionProductos
+from .paginacion import Clave, Pagina
 
 
 class ProductoRepository(ABC):
@@ -11,15 +13,90 @@ class ProductoRepository(ABC):
         pass
     
     @abstractmethod
-    def buscar_por_codigo(self, codigo: str) -> Optional[Producto]:
+    def crear(self, producto: Producto) -> Producto:
+        """
+        Inserta un producto nuevo; lanza ValueError si el código ya existe
+        o si la empresa no existe.
+        """
         pass
     
     @abstractmethod
-    def listar_todos(self) -> List[Producto]:
+    def guardar_muchos(self, productos: List[Producto]) -> List[Producto]:
+        """
+        Crea o actualiza todos los productos en una transacción; lanza
+        ValueError, sin guardar ninguno, si alguna empresa no existe.
+        """
         pass
     
     @abstractmethod
-    def listar_por_empresa(self, empresa_nit: str) -> List[Producto]:
+    def buscar_por_codigo(self, codigo: str, proyeccion: Optional[ProyeccionProductos] = None) -> Optional[Producto]:
+        """Las lecturas con `proyeccion` solo cargan los campos indicados en ella."""
+        pass
+    
+    @abstractmethod
+    def listar_todos(self, proyeccion: Optional[ProyeccionProductos] = None) -> List[Producto]:
+        pass
+    
+    @abstractmethod
+    def listar_por_empresa(self, empresa_nit: str, proyeccion: Optional[ProyeccionProductos] = None) -> List[Producto]:
+        pass
+    
+    @abstractmethod
+    def listar_por_empresas(
+        self,
+        empresa_nits: Iterable[str],
+        proyeccion: Optional[ProyeccionProductos] = None
+    ) -> Dict[str, List[Producto]]:
+        """Productos de varias empresas en una sola lectura, por NIT; las empresas sin productos no aparecen."""
+        pass
+    
+    @abstractmethod
+    def iterar_todos(
+        self,
+        tamano_lote: int = 1000,
+        proyeccion: Optional[ProyeccionProductos] = None
+    ) -> Iterator[Producto]:
+        pass
+    
+    @abstractmethod
+    def iterar_por_empresa(
+        self,
+        empresa_nit: str,
+        tamano_lote: int = 1000,
+        proyeccion: Optional[ProyeccionProductos] = None
+    ) -> Iterator[Producto]:
+        pass
+    
+    @abstractmethod
+    def buscar(
+        self,
+        filtro: FiltroProductos,
+        limite: int,
+        despues_de: Optional[Clave] = None,
+        proyeccion: Optional[ProyeccionProductos] = None
+    ) -> Pagina[Producto]:
+        pass
+    
+    @abstractmethod
+    def buscar_texto(
+        self,
+        consulta: str,
+        limite: int,
+        desplazamiento: int = 0,
+        proyeccion: Optional[ProyeccionProductos] = None
+    ) -> Pagina[Producto]:
+        """
+        Búsqueda de texto completo ordenada por relevancia. Como la relevancia
+        no sirve de clave, `siguiente` es el desplazamiento de la página siguiente.
+        """
+        pass
+    
+    @abstractmethod
+    def agregar_precio(self, codigo: str, precio: ProductoPrecio) -> Optional[Producto]:
+        """
+        Agrega o reemplaza solo el precio de esa moneda, sin reescribir el resto
+        del producto. Devuelve el producto guardado, o None si no existe.
+        """
         pass
     
     @abstractmethod
@@ -29,4 +106,3 @@ class ProductoRepository(ABC):
     @abstractmethod
     def existe(self, codigo: str) -> bool:
         pass
-
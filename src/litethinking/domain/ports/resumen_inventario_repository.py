@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from ..entities.resumen_inventario import ResumenInventario
+
+
+class ResumenInventarioRepository(ABC):
+    
+    @abstractmethod
+    def obtener(self, empresa_nit: str) -> ResumenInventario:
+        """Resumen de la empresa; en ceros si aún no tiene productos."""
+        pass
+    
+    @abstractmethod
+    def reconstruir(self, empresa_nit: Optional[str] = None) -> int:
+        """Recalcula los resúmenes desde los productos; devuelve cuántos quedaron guardados."""
+        pass
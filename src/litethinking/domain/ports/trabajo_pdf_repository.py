@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import BinaryIO, List, Optional
+
+from ..entities.trabajo_pdf import TrabajoPdf
+
+
+class TrabajoPdfRepository(ABC):
+    
+    @abstractmethod
+    def crear(self, empresa_nit: str, email_destino: Optional[str] = None, solicitado_por: Optional[int] = None) -> TrabajoPdf:
+        """Encola un trabajo pendiente."""
+        pass
+    
+    @abstractmethod
+    def crear_lote(self, empresa_nits: Optional[List[str]] = None, solicitado_por: Optional[int] = None) -> TrabajoPdf:
+        """Encola un lote con los PDF de las empresas indicadas o, sin `empresa_nits`, de todas."""
+        pass
+    
+    @abstractmethod
+    def obtener(self, trabajo_id: str) -> Optional[TrabajoPdf]:
+        pass
+    
+    @abstractmethod
+    def reclamar_siguiente(self, trabajador: str) -> Optional[TrabajoPdf]:
+        """
+        Toma el trabajo pendiente más antiguo (o uno en proceso cuyo trabajador
+        dejó de responder) y lo marca en proceso para `trabajador`. Dos
+        trabajadores nunca reciben el mismo trabajo. None si no hay ninguno.
+        """
+        pass
+    
+    @abstractmethod
+    def avanzar(self, trabajo: TrabajoPdf, trabajador: str, procesados: int, total_empresas: int) -> bool:
+        """
+        Registra el avance de un lote; mientras avance no se da por abandonado.
+        False si otro trabajador lo reclamó entretanto.
+        """
+        pass
+    
+    @abstractmethod
+    def completar(self, trabajo: TrabajoPdf, trabajador: str, archivo: BinaryIO, total_productos: int, error: str = "") -> bool:
+        """
+        Guarda el PDF (o el ZIP de un lote) y marca el trabajo completado
+        (`error` registra un aviso, p. ej. un correo que no salió o empresas
+        de un lote sin PDF). False si otro trabajador lo reclamó entretanto.
+        """
+        pass
+    
+    @abstractmethod
+    def fallar(self, trabajo: TrabajoPdf, trabajador: str, error: str) -> bool:
+        pass
+    
+    @abstractmethod
+    def abrir_pdf(self, trabajo_id: str) -> Optional[BinaryIO]:
+        """Archivo del PDF (o ZIP) de un trabajo completado, o None si no lo hay."""
+        pass
+    
+    @abstractmethod
+    def purgar(self, terminados_antes_de: datetime) -> int:
+        """Elimina los trabajos terminados antes de la fecha y sus archivos; devuelve cuántos."""
+        pass
@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+
+class AmbitoVersion(str, Enum):
+    EMPRESAS = "empresas"
+    PRODUCTOS = "productos"
+
+
+class VersionRecurso:
+    """
+    Versión de un recurso de la API: crece con cada escritura que lo afecta.
+    `modificado` es la fecha de la última de esas escrituras.
+    """
+    
+    def __init__(self, numero: int, modificado: datetime):
+        self.numero = numero
+        self.modificado = modificado
+    
+    def __repr__(self) -> str:
+        
+        return f"VersionRecurso(numero={self.numero}, modificado={self.modificado!r})"
+
+
+class VersionRepository(ABC):
+    
+    @abstractmethod
+    def obtener(self, ambito: AmbitoVersion, empresa_nit: Optional[str] = None) -> Optional[VersionRecurso]:
+        """
+        Versión de los datos de `ambito` de una empresa o, sin `empresa_nit`,
+        de los de todas las empresas. None si aún no hay escrituras registradas.
+        """
+        pass
@@ -0,0 +1,7 @@
+"""
+Caché de lectura para los repositorios del dominio
+"""
+from .empresa_repository import CacheEmpresaRepository
+from .producto_repository import CacheProductoRepository
+
+__all__ = ['CacheEmpresaRepository', 'CacheProductoRepository']
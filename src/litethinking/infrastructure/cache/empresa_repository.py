@@ -0,0 +1,64 @@
+from typing import Iterable, Iterator, List, Optional, Set
+
+from ...domain.entities.empresa import Empresa
+from ...domain.ports.empresa_repository import EmpresaRepository
+from ...domain.ports.paginacion import Pagina
+from ...domain.ports.version_repository import AmbitoVersion, VersionRepository
+from .lectura import CacheLectura
+
+
+class CacheEmpresaRepository(EmpresaRepository):
+    """
+    Decora otro EmpresaRepository con caché de lectura por NIT. Las entradas
+    se validan con la versión de la empresa (la misma de su ETag).
+    """
+
+    def __init__(self, repositorio: EmpresaRepository, cache: CacheLectura, version_repository: VersionRepository):
+        self._repositorio = repositorio
+        self._cache = cache
+        self._version_repository = version_repository
+    
+    def guardar(self, empresa: Empresa) -> Empresa:
+        guardada = self._repositorio.guardar(empresa)
+        self._cache.invalidar([empresa.nit])
+        return guardada
+    
+    def crear(self, empresa: Empresa) -> Empresa:
+        return self._repositorio.crear(empresa)
+    
+    def buscar_por_nit(self, nit: str) -> Optional[Empresa]:
+        version = self._version_repository.obtener(AmbitoVersion.EMPRESAS, nit)
+        return self._cache.obtener(
+            nit,
+            lambda: self._repositorio.buscar_por_nit(nit),
+            version.numero if version else 0,
+        )
+    
+    def listar_todas(self) -> List[Empresa]:
+        return self._repositorio.listar_todas()
+    
+    def iterar_todas(self, tamano_lote: int = 1000) -> Iterator[Empresa]:
+        return self._repositorio.iterar_todas(tamano_lote)
+    
+    def listar_pagina(self, limite: int, despues_de: Optional[str] = None) -> Pagina[Empresa]:
+        return self._repositorio.listar_pagina(limite, despues_de=despues_de)
+    
+    def eliminar(self, nit: str) -> bool:
+        eliminada = self._repositorio.eliminar(nit)
+        self._cache.invalidar([nit])
+        return eliminada
+    
+    def existe(self, nit: str) -> bool:
+        if self._cache.contiene(nit):
+            return True
+        return self._repositorio.existe(nit)
+    
+    def nits_existentes(self, nits: Iterable[str]) -> Set[str]:
+        return self._repositorio.nits_existentes(nits)
+    
+    def invalidar_cache(self, nits: Iterable[str]) -> None:
+        """Descarta las entradas de `nits` (escrituras que no pasan por este repositorio, como el admin)."""
+        self._cache.invalidar(nits)
+    
+    def estadisticas(self) -> dict:
+        return self._cache.estadisticas()
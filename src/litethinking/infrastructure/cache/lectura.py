@@ -0,0 +1,123 @@
+import copy
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import quote
+
+from django.core.cache import caches
+
+from .lru import AUSENTE, CacheLRU
+
+_lectura_directa: ContextVar[bool] = ContextVar('lectura_directa', default=False)
+
+
+@contextmanager
+def lectura_directa():
+    """
+    Dentro del bloque las lecturas van a la BD sin consultar la caché. Para
+    lo que se va a guardar en otra caché compartida y de mayor duración
+    (ver presentation.api.cache_respuestas).
+    """
+    token = _lectura_directa.set(True)
+    try:
+        yield
+    finally:
+        _lectura_directa.reset(token)
+
+
+class CacheLectura:
+    """
+    Caché de lectura de dos niveles: una LRU con TTL local al proceso y,
+    opcionalmente, un backend de caché de Django compartido entre procesos.
+
+    Solo se guardan entidades encontradas (nunca None) y siempre se entregan
+    copias, porque los casos de uso modifican las entidades antes de guardarlas.
+
+    Cada entrada lleva la `version` de los datos con la que se cargó (leída
+    de la BD antes de cargarlos): solo es un acierto si coincide con la
+    vigente, así una escritura de otro proceso la deja fuera de inmediato y
+    una entrada nunca tiene datos más viejos que su versión. Invalidar borra
+    la clave de ambos niveles.
+    """
+
+    def __init__(
+        self,
+        prefijo: str,
+        max_entradas: int = 1024,
+        ttl: float = 30.0,
+        backend: Optional[str] = None
+    ):
+        self._prefijo = prefijo
+        self._ttl = ttl
+        self._local = CacheLRU(max_entradas=max_entradas, ttl=ttl)
+        self._backend = backend
+        self._lock = threading.Lock()
+        self.aciertos_locales = 0
+        self.aciertos_compartidos = 0
+        self.fallos = 0
+    
+    def obtener(self, clave: str, cargar: Callable[[], Any], version: Any = None) -> Any:
+        
+        if _lectura_directa.get():
+            return self._cargar(clave, cargar, version)
+        
+        entrada = self._local.obtener(clave)
+        if entrada is not AUSENTE and entrada[0] == version:
+            self._contar('aciertos_locales')
+            return copy.deepcopy(entrada[1])
+        
+        if self._backend:
+            entrada = caches[self._backend].get(self._clave_compartida(clave), AUSENTE)
+            if entrada is not AUSENTE and entrada[0] == version:
+                self._contar('aciertos_compartidos')
+                self._local.guardar(clave, entrada)
+                return copy.deepcopy(entrada[1])
+        
+        return self._cargar(clave, cargar, version)
+    
+    def _cargar(self, clave: str, cargar: Callable[[], Any], version: Any) -> Any:
+        
+        self._contar('fallos')
+        valor = cargar()
+        if valor is not None:
+            self._guardar(clave, version, valor)
+        return valor
+    
+    def contiene(self, clave: str) -> bool:
+        
+        return self._local.obtener(clave) is not AUSENTE
+    
+    def invalidar(self, claves: Iterable[str]) -> None:
+        
+        claves = list(claves)
+        for clave in claves:
+            self._local.invalidar(clave)
+        if self._backend and claves:
+            caches[self._backend].delete_many([self._clave_compartida(clave) for clave in claves])
+    
+    def estadisticas(self) -> dict:
+        
+        return {
+            'aciertos_locales': self.aciertos_locales,
+            'aciertos_compartidos': self.aciertos_compartidos,
+            'fallos': self.fallos,
+            'entradas_locales': len(self._local),
+        }
+    
+    def _guardar(self, clave: str, version: Any, valor: Any) -> None:
+        
+        entrada = (version, copy.deepcopy(valor))
+        self._local.guardar(clave, entrada)
+        if self._backend:
+            caches[self._backend].set(self._clave_compartida(clave), entrada, timeout=self._ttl)
+    
+    def _clave_compartida(self, clave: str) -> str:
+        
+        # quote evita espacios y caracteres de control, no admitidos por memcached
+        return f"litethinking:{self._prefijo}:{quote(clave, safe='')}"
+    
+    def _contar(self, contador: str) -> None:
+        
+        with self._lock:
+            setattr(self, contador, getattr(self, contador) + 1)
@@ -0,0 +1,57 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+# Marca para distinguir "no está en caché" de un valor None guardado
+AUSENTE = object()
+
+
+class CacheLRU:
+    """
+    Caché en memoria del proceso, limitada en cantidad de entradas (se
+    descartan las menos usadas) y con vencimiento por tiempo (TTL, segundos).
+    """
+
+    def __init__(self, max_entradas: int = 1024, ttl: float = 30.0):
+        self._max_entradas = max_entradas
+        self._ttl = ttl
+        self._datos: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def obtener(self, clave: Hashable) -> Any:
+        
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                return AUSENTE
+            
+            vence, valor = entrada
+            if vence < time.monotonic():
+                del self._datos[clave]
+                return AUSENTE
+            
+            self._datos.move_to_end(clave)
+            return valor
+    
+    def guardar(self, clave: Hashable, valor: Any) -> None:
+        
+        with self._lock:
+            self._datos[clave] = (time.monotonic() + self._ttl, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self._max_entradas:
+                self._datos.popitem(last=False)
+    
+    def invalidar(self, clave: Hashable) -> None:
+        
+        with self._lock:
+            self._datos.pop(clave, None)
+    
+    def limpiar(self) -> None:
+        
+        with self._lock:
+            self._datos.clear()
+    
+    def __len__(self) -> int:
+        
+        return len(self._datos)
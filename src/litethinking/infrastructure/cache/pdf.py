@@ -0,0 +1,204 @@
+"""
+Caché de PDF de inventario ya generados.
+
+Las claves se derivan de las versiones de los datos de la empresa (ver
+GenerarPdfInventarioUseCase), así que nunca hay que invalidar: una entrada
+de una versión anterior simplemente deja de pedirse y la desaloja el límite
+de tamaño.
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from django.core.cache import caches
+
+from ...domain.entities.pdf_inventario import PdfInventario
+from ...domain.ports.cache_pdf import CachePdfInventario
+
+_PREFIJO = "litethinking:pdf"
+
+
+def _metadatos(pdf: PdfInventario) -> dict:
+    return {
+        'empresa_nit': pdf.empresa_nit,
+        'empresa_nombre': pdf.empresa_nombre,
+        'total_productos': pdf.total_productos,
+        'generado': pdf.generado.isoformat(),
+        'datos_al': pdf.datos_al.isoformat() if pdf.datos_al else None,
+    }
+
+
+def _desde_metadatos(archivo: BinaryIO, metadatos: dict) -> PdfInventario:
+    return PdfInventario(
+        archivo=archivo,
+        empresa_nit=metadatos['empresa_nit'],
+        empresa_nombre=metadatos['empresa_nombre'],
+        total_productos=metadatos['total_productos'],
+        generado=datetime.fromisoformat(metadatos['generado']),
+        datos_al=datetime.fromisoformat(metadatos['datos_al']) if metadatos['datos_al'] else None,
+    )
+
+
+class _Contadores:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.guardados = 0
+        self.desalojados = 0
+        # Escrituras que fallaron (p. ej. un sistema de archivos de solo lectura)
+        self.errores = 0
+    
+    def _contar(self, contador: str, cantidad: int = 1) -> None:
+        
+        with self._lock:
+            setattr(self, contador, getattr(self, contador) + cantidad)
+    
+    def estadisticas(self) -> dict:
+        
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'guardados': self.guardados,
+            'desalojados': self.desalojados,
+            'errores': self.errores,
+        }
+
+
+class ArchivosCachePdf(_Contadores, CachePdfInventario):
+    """
+    Un archivo .pdf y uno .json de metadatos por entrada en `directorio`.
+    Cuando el total supera `max_bytes` se borran las entradas usadas hace
+    más tiempo (cada acierto actualiza la fecha de modificación).
+    Los PDF se copian y se entregan como archivos abiertos, sin leerlos
+    completos en memoria. Si el directorio no se puede escribir la entrada
+    simplemente no se guarda: el PDF ya generado se entrega igual.
+    Con `ambito` (p. ej. la base de datos) las entradas van en un
+    subdirectorio propio, para que varias instalaciones compartan `directorio`.
+    """
+
+    def __init__(self, directorio: str, max_bytes: int, ambito: str = ""):
+        super().__init__()
+        self._directorio = Path(directorio) / ambito if ambito else Path(directorio)
+        self._max_bytes = max_bytes
+    
+    def obtener(self, clave: str) -> Optional[PdfInventario]:
+        ruta_pdf, ruta_metadatos = self._rutas(clave)
+        try:
+            metadatos = json.loads(ruta_metadatos.read_text(encoding='utf-8'))
+            os.utime(ruta_pdf)
+            # Abierto, el archivo se sigue leyendo aunque otro proceso lo desaloje
+            archivo = open(ruta_pdf, 'rb')
+        except (OSError, ValueError):
+            # No está, o la desalojó otro proceso entre las dos lecturas
+            self._contar('fallos')
+            return None
+        
+        self._contar('aciertos')
+        return _desde_metadatos(archivo, metadatos)
+    
+    def guardar(self, clave: str, pdf: PdfInventario) -> None:
+        if pdf.tamano > self._max_bytes:
+            return
+        
+        ruta_pdf, ruta_metadatos = self._rutas(clave)
+        try:
+            self._directorio.mkdir(parents=True, exist_ok=True)
+            # Los metadatos primero: una entrada sin .pdf se lee como ausente
+            self._escribir(ruta_metadatos, BytesIO(json.dumps(_metadatos(pdf)).encode('utf-8')))
+            self._escribir(ruta_pdf, pdf.archivo)
+        except OSError:
+            pdf.archivo.seek(0)
+            self._contar('errores')
+            return
+        self._contar('guardados')
+        self._recortar()
+    
+    def _rutas(self, clave: str):
+        
+        return self._directorio / f"{clave}.pdf", self._directorio / f"{clave}.json"
+    
+    def _escribir(self, ruta: Path, origen: BinaryIO) -> None:
+        
+        # Archivo temporal en el mismo directorio y reemplazo atómico: quien lee
+        # nunca ve un PDF a medio escribir
+        descriptor, temporal = tempfile.mkstemp(dir=self._directorio, suffix='.tmp')
+        try:
+            origen.seek(0)
+            with os.fdopen(descriptor, 'wb') as archivo:
+                shutil.copyfileobj(origen, archivo)
+            origen.seek(0)
+            os.replace(temporal, ruta)
+        except BaseException:
+            try:
+                os.unlink(temporal)
+            except OSError:
+                pass
+            raise
+    
+    def _recortar(self) -> None:
+        
+        entradas = []
+        for ruta in self._directorio.glob('*.pdf'):
+            try:
+                estado = ruta.stat()
+            except OSError:
+                continue
+            entradas.append((estado.st_mtime, estado.st_size, ruta))
+        
+        total = sum(tamano for _, tamano, _ in entradas)
+        for _, tamano, ruta in sorted(entradas):
+            if total <= self._max_bytes:
+                break
+            for eliminar in (ruta, ruta.with_suffix('.json')):
+                try:
+                    eliminar.unlink()
+                except FileNotFoundError:
+                    pass
+            total -= tamano
+            self._contar('desalojados')
+
+
+class DjangoCachePdf(_Contadores, CachePdfInventario):
+    """
+    Entradas en un backend del framework de caché de Django. El límite de
+    tamaño es el del backend (MAX_ENTRIES, maxmemory de Redis, etc.); los PDF
+    de más de `max_bytes_entrada` no se guardan.
+    """
+
+    def __init__(
+        self,
+        backend: str = "default",
+        ttl: Optional[float] = None,
+        max_bytes_entrada: int = 0,
+        ambito: str = ""
+    ):
+        super().__init__()
+        self._backend = backend
+        self._ttl = ttl
+        self._max_bytes_entrada = max_bytes_entrada
+        self._prefijo = f"{_PREFIJO}:{ambito}" if ambito else _PREFIJO
+    
+    def obtener(self, clave: str) -> Optional[PdfInventario]:
+        entrada = caches[self._backend].get(f"{self._prefijo}:{clave}")
+        if entrada is None:
+            self._contar('fallos')
+            return None
+        
+        self._contar('aciertos')
+        contenido, metadatos = entrada
+        return _desde_metadatos(BytesIO(contenido), metadatos)
+    
+    def guardar(self, clave: str, pdf: PdfInventario) -> None:
+        if self._max_bytes_entrada and pdf.tamano > self._max_bytes_entrada:
+            return
+        
+        caches[self._backend].set(f"{self._prefijo}:{clave}", (pdf.leer(), _metadatos(pdf)), timeout=self._ttl)
+        self._contar('guardados')
@@ -0,0 +1,114 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from ...domain.entities.producto import Producto, ProductoPrecio
+from ...domain.ports.consultas import FiltroProductos, ProyeccionProductos
+from ...domain.ports.paginacion import Clave, Pagina
+from ...domain.ports.producto_repository import ProductoRepository
+from ...domain.ports.version_repository import AmbitoVersion, VersionRepository
+from .lectura import CacheLectura
+
+
+class CacheProductoRepository(ProductoRepository):
+    """
+    Decora otro ProductoRepository con caché de lectura por código. Antes de
+    cargar no se sabe la empresa del producto, así que las entradas se
+    validan con la versión de todos los productos (la misma del ETag del
+    detalle de producto).
+    """
+
+    def __init__(self, repositorio: ProductoRepository, cache: CacheLectura, version_repository: VersionRepository):
+        self._repositorio = repositorio
+        self._cache = cache
+        self._version_repository = version_repository
+    
+    def guardar(self, producto: Producto) -> Producto:
+        guardado = self._repositorio.guardar(producto)
+        self._cache.invalidar([producto.codigo])
+        return guardado
+    
+    def crear(self, producto: Producto) -> Producto:
+        return self._repositorio.crear(producto)
+    
+    def guardar_muchos(self, productos: List[Producto]) -> List[Producto]:
+        guardados = self._repositorio.guardar_muchos(productos)
+        self._cache.invalidar({producto.codigo for producto in productos})
+        return guardados
+    
+    def buscar_por_codigo(self, codigo: str, proyeccion: Optional[ProyeccionProductos] = None) -> Optional[Producto]:
+        # En caché solo se guardan entidades completas
+        if proyeccion is not None and not proyeccion.completa:
+            return self._repositorio.buscar_por_codigo(codigo, proyeccion)
+        version = self._version_repository.obtener(AmbitoVersion.PRODUCTOS)
+        return self._cache.obtener(
+            codigo,
+            lambda: self._repositorio.buscar_por_codigo(codigo),
+            version.numero if version else 0,
+        )
+    
+    def listar_todos(self, proyeccion: Optional[ProyeccionProductos] = None) -> List[Producto]:
+        return self._repositorio.listar_todos(proyeccion)
+    
+    def listar_por_empresa(self, empresa_nit: str, proyeccion: Optional[ProyeccionProductos] = None) -> List[Producto]:
+        return self._repositorio.listar_por_empresa(empresa_nit, proyeccion)
+    
+    def listar_por_empresas(
+        self,
+        empresa_nits: Iterable[str],
+        proyeccion: Optional[ProyeccionProductos] = None
+    ) -> Dict[str, List[Producto]]:
+        return self._repositorio.listar_por_empresas(empresa_nits, proyeccion)
+    
+    def iterar_todos(
+        self,
+        tamano_lote: int = 1000,
+        proyeccion: Optional[ProyeccionProductos] = None
+    ) -> Iterator[Producto]:
+        return self._repositorio.iterar_todos(tamano_lote, proyeccion)
+    
+    def iterar_por_empresa(
+        self,
+        empresa_nit: str,
+        tamano_lote: int = 1000,
+        proyeccion: Optional[ProyeccionProductos] = None
+    ) -> Iterator[Producto]:
+        return self._repositorio.iterar_por_empresa(empresa_nit, tamano_lote, proyeccion)
+    
+    def buscar(
+        self,
+        filtro: FiltroProductos,
+        limite: int,
+        despues_de: Optional[Clave] = None,
+        proyeccion: Optional[ProyeccionProductos] = None
+    ) -> Pagina[Producto]:
+        return self._repositorio.buscar(filtro, limite, despues_de=despues_de, proyeccion=proyeccion)
+    
+    def buscar_texto(
+        self,
+        consulta: str,
+        limite: int,
+        desplazamiento: int = 0,
+        proyeccion: Optional[ProyeccionProductos] = None
+    ) -> Pagina[Producto]:
+        return self._repositorio.buscar_texto(consulta, limite, desplazamiento, proyeccion)
+    
+    def agregar_precio(self, codigo: str, precio: ProductoPrecio) -> Optional[Producto]:
+        guardado = self._repositorio.agregar_precio(codigo, precio)
+        self._cache.invalidar([codigo])
+        return guardado
+    
+    def eliminar(self, codigo: str) -> bool:
+        eliminado = self._repositorio.eliminar(codigo)
+        self._cache.invalidar([codigo])
+        return eliminado
+    
+    def existe(self, codigo: str) -> bool:
+        if self._cache.contiene(codigo):
+            return True
+        return self._repositorio.existe(codigo)
+    
+    def invalidar_cache(self, codigos: Iterable[str]) -> None:
+        """Descarta las entradas de `codigos` (escrituras que no pasan por este repositorio, como el admin)."""
+        self._cache.invalidar(codigos)
+    
+    def estadisticas(self) -> dict:
+        return self._cache.estadisticas()
@@ -0,0 +1,166 @@
+"""
+Caché de respuestas codificadas sobre el framework de caché de Django.
+
+Cada entrada depende de una o más generaciones (contadores guardados en la
+misma caché) que forman parte de su clave: invalidar es incrementar la
+generación, y las entradas anteriores dejan de encontrarse hasta que el
+backend las descarta. Cuando una generación se pierde (por desalojo) se
+recrea con un valor nuevo, nunca con uno ya usado.
+
+Contra la estampida: una entrada vencida se sigue entregando durante un
+periodo de gracia mientras un solo proceso la reconstruye, y cuando no hay
+entrada los demás esperan a que el que tiene el candado la guarde.
+"""
+import hashlib
+import threading
+import time
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from django.core.cache import caches
+
+from ...domain.ports.cache_respuestas import CacheRespuestas
+
+_PREFIJO = "litethinking:respuestas"
+
+# Generación de todas las respuestas de productos
+GENERACION_PRODUCTOS = "productos"
+GENERACION_EMPRESAS = "empresas"
+
+# Estado con el que se resolvió cada petición (también va en la cabecera X-Cache)
+ACIERTO = "HIT"
+OBSOLETA = "STALE"
+FALLO = "MISS"
+
+# (content_type, cuerpo)
+Respuesta = Tuple[str, bytes]
+
+
+def generaciones_productos_empresa(empresa_nit: str) -> List[str]:
+    return [GENERACION_PRODUCTOS, f"productos:{empresa_nit}"]
+
+
+def generaciones_producto(codigo: str) -> List[str]:
+    return [GENERACION_PRODUCTOS, f"producto:{codigo}"]
+
+
+class DjangoCacheRespuestas(CacheRespuestas):
+
+    def __init__(self, backend: str = "default", ttl: float = 60.0, gracia: float = 30.0, espera: float = 5.0):
+        self._backend = backend
+        self._ttl = ttl
+        # Segundos que una entrada vencida se sigue entregando mientras se reconstruye
+        self._gracia = gracia
+        # Máximo que se espera a otro proceso que reconstruye la misma entrada
+        self._espera = espera
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.obsoletas = 0
+        self.fallos = 0
+        self.esperas = 0
+        self.reconstrucciones = 0
+    
+    def obtener(self, clave: str, generaciones: List[str], construir: Callable[[], Optional[Respuesta]]) -> Tuple[Optional[Respuesta], str]:
+        """
+        Devuelve la respuesta guardada para `clave` o la construye y la guarda.
+        `construir` devuelve None si la respuesta no debe guardarse (errores).
+        """
+        cache = caches[self._backend]
+        clave = self._clave_entrada(clave, generaciones)
+        candado = f"{clave}:candado"
+        
+        entrada = cache.get(clave)
+        if entrada is not None:
+            vence, respuesta = entrada
+            if vence > time.time():
+                self._contar('aciertos')
+                return respuesta, ACIERTO
+            # Vencida: solo quien obtiene el candado la reconstruye, los demás entregan la anterior
+            if not cache.add(candado, 1, timeout=self._espera):
+                self._contar('obsoletas')
+                return respuesta, OBSOLETA
+            return self._reconstruir(cache, clave, candado, construir), FALLO
+        
+        if cache.add(candado, 1, timeout=self._espera):
+            return self._reconstruir(cache, clave, candado, construir), FALLO
+        
+        limite = time.monotonic() + self._espera
+        while time.monotonic() < limite:
+            time.sleep(0.05)
+            entrada = cache.get(clave)
+            if entrada is not None:
+                self._contar('esperas')
+                return entrada[1], ACIERTO
+        
+        # Quien tenía el candado no terminó a tiempo: se construye sin guardar
+        self._contar('fallos')
+        return construir(), FALLO
+    
+    def invalidar_empresas(self) -> None:
+        self._incrementar([GENERACION_EMPRESAS])
+    
+    def invalidar_productos(self, empresas: Optional[Iterable[str]] = None, codigos: Iterable[str] = ()) -> None:
+        if empresas is None:
+            self._incrementar([GENERACION_PRODUCTOS])
+            return
+        generaciones = [f"productos:{nit}" for nit in set(empresas)]
+        generaciones.extend(f"producto:{codigo}" for codigo in set(codigos))
+        self._incrementar(generaciones)
+    
+    def estadisticas(self) -> dict:
+        
+        return {
+            'aciertos': self.aciertos,
+            'obsoletas': self.obsoletas,
+            'esperas': self.esperas,
+            'fallos': self.fallos,
+            'reconstrucciones': self.reconstrucciones,
+        }
+    
+    def _reconstruir(self, cache, clave: str, candado: str, construir: Callable[[], Optional[Respuesta]]) -> Optional[Respuesta]:
+        
+        self._contar('fallos')
+        try:
+            respuesta = construir()
+            if respuesta is not None:
+                self._contar('reconstrucciones')
+                cache.set(clave, (time.time() + self._ttl, respuesta), timeout=self._ttl + self._gracia)
+            return respuesta
+        finally:
+            cache.delete(candado)
+    
+    def _clave_entrada(self, clave: str, generaciones: List[str]) -> str:
+        
+        # Una sola ida al backend para todas las generaciones de la entrada
+        cache = caches[self._backend]
+        claves = [self._clave_generacion(generacion) for generacion in generaciones]
+        valores = cache.get_many(claves)
+        for clave_generacion in claves:
+            if clave_generacion not in valores:
+                cache.add(clave_generacion, time.time_ns(), timeout=None)
+                valores[clave_generacion] = cache.get(clave_generacion)
+        
+        version = ".".join(str(valores[clave_generacion]) for clave_generacion in claves)
+        # El hash evita espacios y caracteres de control, no admitidos por memcached
+        resumen = hashlib.sha1(f"{clave}|{version}".encode('utf-8')).hexdigest()
+        return f"{_PREFIJO}:{resumen}"
+    
+    def _incrementar(self, generaciones: Iterable[str]) -> None:
+        
+        cache = caches[self._backend]
+        for generacion in generaciones:
+            clave_generacion = self._clave_generacion(generacion)
+            try:
+                cache.incr(clave_generacion)
+            except ValueError:
+                # No existía: cualquier valor nuevo deja fuera las entradas anteriores
+                cache.set(clave_generacion, time.time_ns(), timeout=None)
+    
+    def _clave_generacion(self, generacion: str) -> str:
+        
+        digest = hashlib.sha1(generacion.encode('utf-8')).hexdigest()
+        return f"{_PREFIJO}:gen:{digest}"
+    
+    def _contar(self, contador: str) -> None:
+        
+        with self._lock:
+            setattr(self, contador, getattr(self, contador) + 1)
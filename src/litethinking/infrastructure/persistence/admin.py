@@ -1,7 +1,80 @@
 from django.contrib import admin
 
+from ...domain.ports.version_repository import AmbitoVersion
+from ..cache.empresa_repository import CacheEmpresaRepository
+from ..cache.producto_repository import CacheProductoRepository
+from ..repositorios import obtener_cache_respuestas, obtener_empresa_repository, obtener_producto_repository
+
 from .empresa.model import EmpresaModel
+from .inventario.model import InventarioResumenModel
+from .inventario.repository_impl import DjangoResumenInventarioRepository
+from .producto import precios_compactos
 from .producto.model import ProductoModel, ProductoPrecioModel
+from .versiones import registro as versiones
+
+
+def _invalidar_caches_repositorios(empresas=(), productos=()):
+    # Caché de lectura de los repositorios que usan las vistas (ver repositorios.py)
+    empresa_repository = obtener_empresa_repository()
+    if empresas and isinstance(empresa_repository, CacheEmpresaRepository):
+        empresa_repository.invalidar_cache(empresas)
+    producto_repository = obtener_producto_repository()
+    if productos and isinstance(producto_repository, CacheProductoRepository):
+        producto_repository.invalidar_cache(productos)
+
+
+class DatosDerivadosAdminMixin:
+    """
+    Las ediciones del admin no pasan por los repositorios: después de cada
+    cambio se recalcula el resumen de inventario de las empresas afectadas,
+    la copia denormalizada de precios de los productos afectados, se
+    incrementa la versión de los productos de esas empresas y se descartan
+    las respuestas y las entidades de esos productos guardadas en caché.
+    Las subclases indican los productos afectados por `obj`; sus empresas
+    se leen de la BD, antes y después de guardar.
+    """
+
+    def empresas_afectadas(self, obj):
+        productos = self.productos_afectados(obj)
+        if not productos:
+            return set()
+        return set(ProductoModel.objects.filter(codigo__in=productos).values_list('empresa_id', flat=True))
+
+    def productos_afectados(self, obj):
+        return set()
+
+    def save_model(self, request, obj, form, change):
+        # Antes de guardar se leen también las relaciones anteriores al cambio
+        empresas = self.empresas_afectadas(obj) if change else set()
+        productos = self.productos_afectados(obj) if change else set()
+        super().save_model(request, obj, form, change)
+        self._sincronizar(empresas | self.empresas_afectadas(obj), productos | self.productos_afectados(obj))
+
+    def delete_model(self, request, obj):
+        empresas, productos = self.empresas_afectadas(obj), self.productos_afectados(obj)
+        super().delete_model(request, obj)
+        self._sincronizar(empresas, productos)
+
+    def delete_queryset(self, request, queryset):
+        empresas, productos = set(), set()
+        for obj in queryset:
+            empresas |= self.empresas_afectadas(obj)
+            productos |= self.productos_afectados(obj)
+        super().delete_queryset(request, queryset)
+        self._sincronizar(empresas, productos)
+
+    def _sincronizar(self, empresas, productos):
+        # Los productos borrados ya no existen: bulk_update simplemente no los encuentra
+        if productos:
+            precios_compactos.sincronizar(productos)
+        repositorio = DjangoResumenInventarioRepository()
+        for empresa_nit in empresas:
+            repositorio.reconstruir(empresa_nit)
+        versiones.incrementar(AmbitoVersion.PRODUCTOS, empresas)
+        cache_respuestas = obtener_cache_respuestas()
+        if cache_respuestas:
+            cache_respuestas.invalidar_productos()
+        _invalidar_caches_repositorios(productos=productos)
 
 
 @admin.register(EmpresaModel)
@@ -10,18 +83,62 @@ class EmpresaAdmin(admin.ModelAdmin):
     search_fields = ('nit', 'nombre')
     list_filter = ('nombre',)
 
+    # Las ediciones del admin también deben invalidar los ETag y la caché de respuestas
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        self._invalidar([obj.nit])
+
+    def delete_model(self, request, obj):
+        # Después de borrar, Django deja la clave primaria del objeto en None
+        nit = obj.nit
+        super().delete_model(request, obj)
+        self._invalidar([nit])
+
+    def delete_queryset(self, request, queryset):
+        nits = list(queryset.values_list('nit', flat=True))
+        super().delete_queryset(request, queryset)
+        self._invalidar(nits)
+
+    def _invalidar(self, nits):
+        versiones.incrementar(AmbitoVersion.EMPRESAS, nits)
+        cache_respuestas = obtener_cache_respuestas()
+        if cache_respuestas:
+            cache_respuestas.invalidar_empresas()
+        _invalidar_caches_repositorios(empresas=nits)
+
 
 @admin.register(ProductoModel)
-class ProductoAdmin(admin.ModelAdmin):
+class ProductoAdmin(DatosDerivadosAdminMixin, admin.ModelAdmin):
     list_display = ('codigo', 'nombre', 'empresa', 'caracteristicas')
     search_fields = ('codigo', 'nombre')
     list_filter = ('empresa',)
     raw_id_fields = ('empresa',)
 
+    def empresas_afectadas(self, obj):
+        # La empresa guardada en la BD (antes del cambio) y la del formulario
+        anterior = ProductoModel.objects.filter(pk=obj.pk).values_list('empresa_id', flat=True).first()
+        return {nit for nit in (anterior, obj.empresa_id) if nit}
+
+    def productos_afectados(self, obj):
+        return {obj.codigo}
+
 
 @admin.register(ProductoPrecioModel)
-class ProductoPrecioAdmin(admin.ModelAdmin):
+class ProductoPrecioAdmin(DatosDerivadosAdminMixin, admin.ModelAdmin):
     list_display = ('producto', 'moneda', 'valor')
     list_filter = ('moneda',)
     search_fields = ('producto__codigo', 'producto__nombre')
 
+    def productos_afectados(self, obj):
+        # El producto guardado en la BD (antes del cambio) y el del formulario
+        anterior = ProductoPrecioModel.objects.filter(pk=obj.pk).values_list('producto_id', flat=True).first()
+        return {codigo for codigo in (anterior, obj.producto_id) if codigo}
+
+
+@admin.register(InventarioResumenModel)
+class InventarioResumenAdmin(admin.ModelAdmin):
+    list_display = ('empresa', 'total_productos', 'con_precio', 'actualizado')
+    readonly_fields = ('empresa', 'total_productos', 'con_precio', 'estadisticas', 'actualizado')
+
+    def has_add_permission(self, request):
+        return False
@@ -8,4 +8,5 @@ class PersistenceConfig(AppConfig):
     
     def ready(self):
         import litethinking.infrastructure.persistence.admin
+        import litethinking.infrastructure.persistence.usuarios.senales
 
@@ -1,7 +1,12 @@
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Set
+
+from django.db import IntegrityError, transaction
 
 from ....domain.entities.empresa import Empresa
 from ....domain.ports.empresa_repository import EmpresaRepository
+from ....domain.ports.paginacion import Pagina
+from ....domain.ports.version_repository import AmbitoVersion
+from ..versiones import registro as versiones
 from .model import EmpresaModel
 
 
@@ -9,18 +14,35 @@ class DjangoEmpresaRepository(EmpresaRepository):
 
     def guardar(self, empresa: Empresa) -> Empresa:
 
-        empresa_model, created = EmpresaModel.objects.update_or_create(
-            nit=empresa.nit,
-            defaults={
-                'nombre': empresa.nombre,
-                'direccion': empresa.direccion,
-                'telefono': empresa.telefono,
-            }
-        )
+        with transaction.atomic():
+            empresa_model, created = EmpresaModel.objects.update_or_create(
+                nit=empresa.nit,
+                defaults={
+                    'nombre': empresa.nombre,
+                    'direccion': empresa.direccion,
+                    'telefono': empresa.telefono,
+                }
+            )
+            versiones.incrementar(AmbitoVersion.EMPRESAS, [empresa.nit])
      
-        empresa_model.refresh_from_db()
         return self._to_domain_entity(empresa_model)
     
+    def crear(self, empresa: Empresa) -> Empresa:
+        # Un único INSERT: la clave primaria detecta el NIT duplicado
+        try:
+            with transaction.atomic():
+                EmpresaModel.objects.create(
+                    nit=empresa.nit,
+                    nombre=empresa.nombre,
+                    direccion=empresa.direccion,
+                    telefono=empresa.telefono,
+                )
+                versiones.incrementar(AmbitoVersion.EMPRESAS, [empresa.nit])
+        except IntegrityError:
+            raise ValueError(f"Ya existe una empresa con el NIT: {empresa.nit}")
+        
+        return empresa
+    
     def buscar_por_nit(self, nit: str) -> Optional[Empresa]:
         try:
             empresa_model = EmpresaModel.objects.get(nit=nit)
@@ -32,10 +54,29 @@ class DjangoEmpresaRepository(EmpresaRepository):
         empresas_model = EmpresaModel.objects.all()
         return [self._to_domain_entity(emp) for emp in empresas_model]
     
+    def iterar_todas(self, tamano_lote: int = 1000) -> Iterator[Empresa]:
+        # iterator() lee con un cursor del lado del servidor (en PostgreSQL) por bloques de filas
+        for empresa_model in EmpresaModel.objects.order_by('nit').iterator(chunk_size=tamano_lote):
+            yield self._to_domain_entity(empresa_model)
+    
+    def listar_pagina(self, limite: int, despues_de: Optional[str] = None) -> Pagina[Empresa]:
+        empresas_model = EmpresaModel.objects.order_by('nit')
+        if despues_de is not None:
+            empresas_model = empresas_model.filter(nit__gt=despues_de)
+        
+        # Se pide un registro extra solo para saber si hay otra página
+        filas = list(empresas_model[:limite + 1])
+        hay_mas = len(filas) > limite
+        empresas = [self._to_domain_entity(emp) for emp in filas[:limite]]
+        
+        return Pagina(empresas, siguiente=empresas[-1].nit if hay_mas else None)
+    
     def eliminar(self, nit: str) -> bool:
         try:
-            empresa_model = EmpresaModel.objects.get(nit=nit)
-            empresa_model.delete()
+            with transaction.atomic():
+                empresa_model = EmpresaModel.objects.get(nit=nit)
+                empresa_model.delete()
+                versiones.incrementar(AmbitoVersion.EMPRESAS, [nit])
             return True
         except EmpresaModel.DoesNotExist:
             return False
@@ -45,8 +86,11 @@ class DjangoEmpresaRepository(EmpresaRepository):
     def existe(self, nit: str) -> bool:
         return EmpresaModel.objects.filter(nit=nit).exists()
     
+    def nits_existentes(self, nits: Iterable[str]) -> Set[str]:
+        return set(EmpresaModel.objects.filter(nit__in=list(nits)).values_list('nit', flat=True))
+    
     def _to_domain_entity(self, empresa_model: EmpresaModel) -> Empresa:
-        return Empresa(
+        return Empresa.from_persistence(
             nit=empresa_model.nit,
             nombre=empresa_model.nombre,
             direccion=empresa_model.direccion,
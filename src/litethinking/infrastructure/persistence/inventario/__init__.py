@@ -0,0 +1,7 @@
+"""
+Persistencia del resumen de inventario por empresa
+"""
+from .model import InventarioResumenModel
+from .repository_impl import DjangoResumenInventarioRepository
+
+__all__ = ['InventarioResumenModel', 'DjangoResumenInventarioRepository']
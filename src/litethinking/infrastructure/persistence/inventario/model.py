@@ -0,0 +1,26 @@
+from django.db import models
+
+from ..empresa.model import EmpresaModel
+
+
+class InventarioResumenModel(models.Model):
+
+    empresa = models.OneToOneField(
+        EmpresaModel,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="resumen_inventario",
+    )
+    total_productos = models.PositiveIntegerField("Total de productos", default=0)
+    con_precio = models.PositiveIntegerField("Productos con precio", default=0)
+    # {"COP": {"cantidad": 3, "suma": "30.00", "minimo": "5.00", "maximo": "20.00"}, ...}
+    estadisticas = models.JSONField("Estadísticas por moneda", default=dict)
+    actualizado = models.DateTimeField("Actualizado", auto_now=True)
+
+    class Meta:
+        db_table = "inventario_resumen"
+        verbose_name = "Resumen de Inventario"
+        verbose_name_plural = "Resúmenes de Inventario"
+
+    def __str__(self):
+        return f"Resumen {self.empresa_id}: {self.total_productos} productos"
@@ -0,0 +1,78 @@
+from decimal import Decimal
+from typing import Optional
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+
+from ....domain.entities.producto import Moneda
+from ....domain.entities.resumen_inventario import EstadisticaPrecios, ResumenInventario
+from ....domain.ports.resumen_inventario_repository import ResumenInventarioRepository
+from ..producto.model import ProductoModel, ProductoPrecioModel
+from .model import InventarioResumenModel
+from .resumen import decimal_a_texto
+
+
+class DjangoResumenInventarioRepository(ResumenInventarioRepository):
+
+    def obtener(self, empresa_nit: str) -> ResumenInventario:
+        resumen_model = InventarioResumenModel.objects.filter(empresa_id=empresa_nit).first()
+        if resumen_model is None:
+            return ResumenInventario(empresa_nit=empresa_nit)
+        return self._to_domain_entity(resumen_model)
+    
+    def reconstruir(self, empresa_nit: Optional[str] = None) -> int:
+        productos_model = ProductoModel.objects.all()
+        precios_model = ProductoPrecioModel.objects.all()
+        resumenes_model = InventarioResumenModel.objects.all()
+        if empresa_nit is not None:
+            productos_model = productos_model.filter(empresa_id=empresa_nit)
+            precios_model = precios_model.filter(producto__empresa_id=empresa_nit)
+            resumenes_model = resumenes_model.filter(empresa_id=empresa_nit)
+        
+        with transaction.atomic():
+            resumenes = {
+                fila['empresa_id']: InventarioResumenModel(
+                    empresa_id=fila['empresa_id'],
+                    total_productos=fila['total'],
+                    con_precio=fila['con_precio'],
+                    estadisticas={},
+                )
+                for fila in productos_model.order_by().values('empresa_id').annotate(
+                    total=Count('codigo', distinct=True),
+                    con_precio=Count('precios__producto', distinct=True),
+                )
+            }
+            
+            estadisticas = precios_model.order_by().values('producto__empresa_id', 'moneda').annotate(
+                cantidad=Count('id'), suma=Sum('valor'), minimo=Min('valor'), maximo=Max('valor')
+            )
+            for fila in estadisticas:
+                resumenes[fila['producto__empresa_id']].estadisticas[fila['moneda']] = {
+                    'cantidad': fila['cantidad'],
+                    'suma': decimal_a_texto(fila['suma']),
+                    'minimo': decimal_a_texto(fila['minimo']),
+                    'maximo': decimal_a_texto(fila['maximo']),
+                }
+            
+            resumenes_model.delete()
+            InventarioResumenModel.objects.bulk_create(resumenes.values())
+        
+        return len(resumenes)
+    
+    def _to_domain_entity(self, resumen_model: InventarioResumenModel) -> ResumenInventario:
+        estadisticas = {
+            Moneda(moneda): EstadisticaPrecios(
+                cantidad=valores['cantidad'],
+                suma=Decimal(valores['suma']),
+                minimo=Decimal(valores['minimo']) if valores['minimo'] is not None else None,
+                maximo=Decimal(valores['maximo']) if valores['maximo'] is not None else None,
+            )
+            for moneda, valores in resumen_model.estadisticas.items()
+        }
+        
+        return ResumenInventario(
+            empresa_nit=resumen_model.empresa_id,
+            total_productos=resumen_model.total_productos,
+            con_precio=resumen_model.con_precio,
+            estadisticas=estadisticas,
+        )
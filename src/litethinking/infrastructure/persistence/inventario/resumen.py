@@ -0,0 +1,151 @@
+"""
+Mantenimiento incremental del resumen de inventario.
+
+Los repositorios de escritura registran en un CambiosResumen el estado
+anterior y el nuevo de cada producto, y llaman a aplicar() dentro de la
+misma transacción. El mínimo y el máximo de una moneda solo se recalculan
+con una consulta cuando se retira justo el valor extremo.
+"""
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+
+from ..producto.model import ProductoPrecioModel
+from .model import InventarioResumenModel
+
+_CENTAVOS = Decimal('0.01')
+
+# Valor de cada moneda de un producto: {"COP": Decimal("10.00")}
+Valores = Dict[str, Decimal]
+
+
+def _redondear(valor: Decimal) -> Decimal:
+    return Decimal(valor).quantize(_CENTAVOS, rounding=ROUND_HALF_UP)
+
+
+def decimal_a_texto(valor: Decimal) -> str:
+    return str(_redondear(valor))
+
+
+class CambiosResumen:
+
+    def __init__(self):
+        self._total: Dict[str, int] = defaultdict(int)
+        self._con_precio: Dict[str, int] = defaultdict(int)
+        self._agregados: Dict[Tuple[str, str], List[Decimal]] = defaultdict(list)
+        self._quitados: Dict[Tuple[str, str], List[Decimal]] = defaultdict(list)
+    
+    def agregar(self, empresa_nit: str, valores: Valores) -> None:
+        self._registrar(empresa_nit, valores, 1, self._agregados)
+    
+    def quitar(self, empresa_nit: str, valores: Valores) -> None:
+        self._registrar(empresa_nit, valores, -1, self._quitados)
+    
+    def reemplazar(self, antes: Optional[Tuple[str, Valores]], empresa_nit: str, valores: Valores) -> None:
+        """Registra el paso de un producto de `antes` (None si es nuevo) a su estado actual."""
+        valores = {moneda: _redondear(valor) for moneda, valor in valores.items()}
+        if antes is not None:
+            if antes == (empresa_nit, valores):
+                return
+            self.quitar(*antes)
+        self.agregar(empresa_nit, valores)
+    
+    def aplicar(self) -> None:
+        """Escribe los cambios acumulados; debe llamarse dentro de la transacción de la escritura."""
+        nits = sorted(self._total.keys() | {nit for nit, _ in self._agregados.keys() | self._quitados.keys()})
+        if not nits:
+            return
+        
+        # Crea en ceros los resúmenes que falten y los bloquea en un orden fijo
+        InventarioResumenModel.objects.bulk_create(
+            [InventarioResumenModel(empresa_id=nit) for nit in nits],
+            ignore_conflicts=True,
+        )
+        resumenes = list(
+            InventarioResumenModel.objects.select_for_update().filter(empresa_id__in=nits).order_by('empresa_id')
+        )
+        
+        por_recalcular = []
+        ahora = timezone.now()
+        for resumen in resumenes:
+            nit = resumen.empresa_id
+            resumen.total_productos = max(0, resumen.total_productos + self._total[nit])
+            resumen.con_precio = max(0, resumen.con_precio + self._con_precio[nit])
+            resumen.actualizado = ahora
+            for clave in self._agregados.keys() | self._quitados.keys():
+                if clave[0] == nit and not self._aplicar_moneda(resumen.estadisticas, clave):
+                    por_recalcular.append(clave)
+        
+        if por_recalcular:
+            _recalcular_extremos({resumen.empresa_id: resumen for resumen in resumenes}, por_recalcular)
+        
+        InventarioResumenModel.objects.bulk_update(
+            resumenes, ['total_productos', 'con_precio', 'estadisticas', 'actualizado']
+        )
+    
+    def _registrar(self, empresa_nit: str, valores: Valores, signo: int, destino) -> None:
+        self._total[empresa_nit] += signo
+        if valores:
+            self._con_precio[empresa_nit] += signo
+        for moneda, valor in valores.items():
+            destino[(empresa_nit, moneda)].append(_redondear(valor))
+    
+    def _aplicar_moneda(self, estadisticas: dict, clave: Tuple[str, str]) -> bool:
+        """Actualiza la moneda en `estadisticas`; False si el mínimo o el máximo deben recalcularse."""
+        moneda = clave[1]
+        agregados = self._agregados.get(clave, [])
+        quitados = self._quitados.get(clave, [])
+        actual = estadisticas.get(moneda)
+        
+        cantidad = len(agregados) - len(quitados)
+        suma = sum(agregados, Decimal(0)) - sum(quitados, Decimal(0))
+        if actual:
+            cantidad += actual['cantidad']
+            suma += Decimal(actual['suma'])
+        
+        if cantidad <= 0:
+            estadisticas.pop(moneda, None)
+            return True
+        
+        extremos = list(agregados)
+        recalcular = False
+        if actual and actual['minimo'] is not None and actual['maximo'] is not None:
+            minimo, maximo = Decimal(actual['minimo']), Decimal(actual['maximo'])
+            # Si se retiró un extremo no se sabe cuál es el siguiente sin consultar
+            recalcular = minimo in quitados or maximo in quitados
+            extremos += [minimo, maximo]
+        elif actual:
+            # Quedó sin extremos en una escritura anterior
+            recalcular = True
+        recalcular = recalcular or not extremos
+        
+        estadisticas[moneda] = {
+            'cantidad': cantidad,
+            'suma': decimal_a_texto(suma),
+            'minimo': None if recalcular else decimal_a_texto(min(extremos)),
+            'maximo': None if recalcular else decimal_a_texto(max(extremos)),
+        }
+        return not recalcular
+
+
+def _recalcular_extremos(resumenes: Dict[str, InventarioResumenModel], claves: Iterable[Tuple[str, str]]) -> None:
+    filtro = Q()
+    for nit, moneda in claves:
+        filtro |= Q(producto__empresa_id=nit, moneda=moneda)
+    
+    filas = ProductoPrecioModel.objects.filter(filtro).values('producto__empresa_id', 'moneda').annotate(
+        minimo=Min('valor'), maximo=Max('valor')
+    )
+    for fila in filas:
+        estadistica = resumenes[fila['producto__empresa_id']].estadisticas[fila['moneda']]
+        estadistica['minimo'] = decimal_a_texto(fila['minimo'])
+        estadistica['maximo'] = decimal_a_texto(fila['maximo'])
+    
+    # Sin precios en la tabla la cantidad acumulada no corresponde a nada: se descarta
+    for nit, moneda in claves:
+        estadisticas = resumenes[nit].estadisticas
+        if moneda in estadisticas and estadisticas[moneda]['minimo'] is None:
+            del estadisticas[moneda]
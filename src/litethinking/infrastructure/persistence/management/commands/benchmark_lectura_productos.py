@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from litethinking.infrastructure.persistence.producto.repository_impl import DjangoProductoRepository
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara la lectura de productos con modelos de Django o con tuplas '
+        '(values_list), y con la tabla de precios o con la copia denormalizada '
+        'producto.precios_compactos'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--empresa', help='NIT de la empresa a listar (por defecto, todos los productos)')
+        parser.add_argument('--repeticiones', type=int, default=5)
+
+    def handle(self, *args, **options):
+        if options['repeticiones'] < 1:
+            raise CommandError('--repeticiones debe ser mayor que cero')
+
+        variantes = (
+            ('modelos', False, False),
+            ('modelos+copia', False, True),
+            ('tuplas', True, False),
+            ('tuplas+copia', True, True),
+        )
+        for nombre, rapida, denormalizados in variantes:
+            repositorio = DjangoProductoRepository(
+                precios_denormalizados=denormalizados,
+                hidratacion_rapida=rapida,
+            )
+            if options['empresa']:
+                leer = lambda: repositorio.listar_por_empresa(options['empresa'])
+            else:
+                leer = repositorio.listar_todos
+
+            tiempos = []
+            for _ in range(options['repeticiones']):
+                with CaptureQueriesContext(connection) as consultas:
+                    inicio = time.perf_counter()
+                    productos = leer()
+                    tiempos.append(time.perf_counter() - inicio)
+
+            tiempos.sort()
+            mediana = tiempos[len(tiempos) // 2]
+            por_fila = mediana / len(productos) * 1_000_000 if productos else 0
+            self.stdout.write(
+                f'{nombre:<14} productos={len(productos):<8} consultas={len(consultas):<3} '
+                f'mediana={mediana * 1000:.1f} ms  mejor={tiempos[0] * 1000:.1f} ms  '
+                f'por fila={por_fila:.1f} µs'
+            )
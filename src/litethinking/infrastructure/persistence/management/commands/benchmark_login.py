@@ -0,0 +1,81 @@
+import secrets
+import time
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import Group, User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from litethinking.presentation.api.auth.views import LoginView
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide POST /api/auth/login/ en este proceso: logins por segundo de un '
+        'worker, consultas por login y qué parte del tiempo es la verificación '
+        'de la contraseña. Sin --usuario usa un usuario temporal que se descarta al terminar'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--usuario', help='Usuario existente con el que iniciar sesión')
+        parser.add_argument('--password', help='Contraseña de --usuario')
+        parser.add_argument('--repeticiones', type=int, default=20)
+        parser.add_argument('--workers', type=int, default=1, help='Workers para estimar la capacidad total')
+
+    def handle(self, *args, **options):
+        if options['repeticiones'] < 1:
+            raise CommandError('--repeticiones debe ser mayor que cero')
+        if options['workers'] < 1:
+            raise CommandError('--workers debe ser mayor que cero')
+
+        if options['usuario']:
+            if not options['password']:
+                raise CommandError('--usuario requiere --password')
+            self._medir(options['usuario'], options['password'], options)
+            return
+
+        with transaction.atomic():
+            password = secrets.token_urlsafe(16)
+            usuario = User.objects.create_user(username=f'benchmark-login-{secrets.token_hex(4)}', password=password)
+            grupo = Group.objects.filter(name='Admin').first()
+            if grupo:
+                usuario.groups.add(grupo)
+            self._medir(usuario.username, password, options)
+            transaction.set_rollback(True)
+
+    def _medir(self, username, password, options):
+        credenciales = {'username': username, 'password': password}
+        vista = LoginView.as_view()
+        fabrica = APIRequestFactory()
+
+        verificaciones = []
+        logins = []
+        for _ in range(options['repeticiones']):
+            inicio = time.perf_counter()
+            usuario = authenticate(**credenciales)
+            verificaciones.append(time.perf_counter() - inicio)
+            if usuario is None:
+                raise CommandError('Usuario o contraseña incorrectos')
+
+            peticion = fabrica.post('/api/auth/login/', credenciales, format='json')
+            with CaptureQueriesContext(connection) as consultas:
+                inicio = time.perf_counter()
+                respuesta = vista(peticion)
+                logins.append(time.perf_counter() - inicio)
+            if respuesta.status_code != 200:
+                raise CommandError(f'El login respondió {respuesta.status_code}: {respuesta.data}')
+
+        verificacion = sorted(verificaciones)[len(verificaciones) // 2]
+        login = sorted(logins)[len(logins) // 2]
+        por_segundo = 1 / login
+        self.stdout.write(
+            f'verificación de contraseña  mediana={verificacion * 1000:.1f} ms\n'
+            f'login completo              mediana={login * 1000:.1f} ms  mejor={min(logins) * 1000:.1f} ms  '
+            f'consultas={len(consultas)}  rol={respuesta.data.get("rol")}\n'
+            f'la contraseña es el {verificacion / login:.0%} del login\n'
+            f'capacidad: {por_segundo:.1f} logins/s por worker, '
+            f'{por_segundo * options["workers"]:.1f} logins/s con {options["workers"]} worker(s) '
+            f'(si hay un núcleo libre por worker)'
+        )
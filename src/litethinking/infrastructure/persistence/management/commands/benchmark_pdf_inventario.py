@@ -0,0 +1,161 @@
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from reportlab import rl_config
+
+from litethinking.domain.entities.empresa import Empresa
+from litethinking.domain.entities.producto import Moneda, Producto
+from litethinking.infrastructure.reportes import ReportLabGeneradorPdf
+
+_EMPRESA = Empresa('900123456', 'Empresa de prueba S.A.S.', 'Calle 1 # 2-3', '6011234567')
+
+_GENERADO = datetime(2024, 1, 31, 18, 0, tzinfo=timezone.utc)
+
+_MONEDAS = (Moneda.COP, Moneda.USD, Moneda.EUR)
+
+# Monedas con precio del producto i en cada mezcla
+MEZCLAS = {
+    'sin_precios': lambda i: (),
+    'una_moneda': lambda i: _MONEDAS[:1],
+    'tres_monedas': lambda i: _MONEDAS,
+    'mixta': lambda i: _MONEDAS[:i % 4],
+}
+
+VARIANTES = (
+    ('estilos por PDF', False),
+    ('estilos precalculados', True),
+)
+
+
+def _productos_de_prueba(cantidad, mezcla):
+    # Algunas características superan los 50 caracteres y se recortan en el PDF
+    return [
+        Producto.from_persistence(
+            codigo=f'PROD-{i}',
+            nombre=f'Producto número {i}',
+            empresa_nit=_EMPRESA.nit,
+            caracteristicas='Características: peso 1 kg, color café, empaque de cartón reciclado' if i % 3 == 0
+            else 'Peso 1 kg',
+            descripcion='Descripción breve',
+            valores={moneda: Decimal(i * 1234567 % 100000000) / 100 for moneda in MEZCLAS[mezcla](i)},
+        )
+        for i in range(cantidad)
+    ]
+
+
+def _generar(generador, grande, productos) -> bytes:
+    if grande:
+        archivo, _ = generador.generar_grande(_EMPRESA, iter(productos), _GENERADO)
+    else:
+        archivo = generador.generar(_EMPRESA, productos, _GENERADO)
+    try:
+        return archivo.read()
+    finally:
+        archivo.close()
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide la generación del PDF de inventario con inventarios sintéticos: '
+        'tiempo, memoria máxima (tracemalloc) y perfil (cProfile), con los '
+        'estilos creados en cada PDF o precalculados una vez por proceso; '
+        'verifica que ambos PDF sean idénticos'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cantidad', type=int, nargs='+', default=[10, 1000, 10000, 50000])
+        parser.add_argument('--mezcla', nargs='+', choices=sorted(MEZCLAS), default=['mixta'])
+        parser.add_argument('--repeticiones', type=int, default=1)
+        parser.add_argument(
+            '--modo',
+            choices=['auto', 'normal', 'grande'],
+            default='auto',
+            help='auto: modo de inventario grande desde PDF_INVENTARIO_UMBRAL_GRANDE, como en la API',
+        )
+        parser.add_argument('--perfil', type=int, default=10, help='Funciones del perfil a mostrar (0: sin perfil)')
+
+    def handle(self, *args, **options):
+        if options['repeticiones'] < 1:
+            raise CommandError('--repeticiones debe ser mayor que cero')
+        if min(options['cantidad']) < 0:
+            raise CommandError('--cantidad no puede ser negativa')
+
+        configuracion = settings.PDF_INVENTARIO
+        generadores = [
+            (nombre, ReportLabGeneradorPdf(configuracion['FILAS_POR_TABLA'], estilos_precalculados=precalculados))
+            for nombre, precalculados in VARIANTES
+        ]
+
+        # Sin fechas ni identificadores aleatorios, para comparar los PDF byte a byte
+        invariante = rl_config.invariant
+        rl_config.invariant = 1
+        try:
+            # Carga de fuentes y módulos de ReportLab, y los estilos precalculados
+            for _, generador in generadores:
+                _generar(generador, False, _productos_de_prueba(10, 'mixta'))
+
+            for mezcla in options['mezcla']:
+                for cantidad in options['cantidad']:
+                    self._medir(generadores, cantidad, mezcla, options)
+        finally:
+            rl_config.invariant = invariante
+
+    def _medir(self, generadores, cantidad, mezcla, options):
+        if options['modo'] == 'auto':
+            umbral = settings.PDF_INVENTARIO['UMBRAL_GRANDE']
+            grande = bool(umbral) and cantidad >= umbral
+        else:
+            grande = options['modo'] == 'grande'
+
+        productos = _productos_de_prueba(cantidad, mezcla)
+        precios = sum(len(producto.precios) for producto in productos)
+        self.stdout.write(
+            f'\n{cantidad} productos, {precios} precios ({mezcla}), '
+            f'modo {"inventario grande" if grande else "normal"}'
+        )
+
+        referencia = None
+        base = None
+        for nombre, generador in generadores:
+            tiempos = []
+            for _ in range(options['repeticiones']):
+                inicio = time.perf_counter()
+                contenido = _generar(generador, grande, productos)
+                tiempos.append(time.perf_counter() - inicio)
+
+            # En una ejecución aparte: tracemalloc hace más lento todo lo que mide
+            tracemalloc.start()
+            try:
+                _generar(generador, grande, productos)
+                _, pico = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+            mejor = min(tiempos)
+            if referencia is None:
+                referencia, base = contenido, mejor
+            identico = 'idéntico' if contenido == referencia else 'DIFERENTE'
+            self.stdout.write(
+                f'  {nombre:<22} {mejor * 1000:>10.1f} ms  {cantidad / mejor:>9,.0f} productos/s  '
+                f'x{base / mejor:.2f}  memoria máx. {pico / 1024 / 1024:>7.1f} MB  '
+                f'{len(contenido):,} bytes  {identico}'
+            )
+
+            if options['perfil']:
+                self.stdout.write(self._perfil(generador, grande, productos, options['perfil']))
+
+    def _perfil(self, generador, grande, productos, lineas) -> str:
+        perfil = cProfile.Profile()
+        perfil.runcall(_generar, generador, grande, productos)
+        salida = io.StringIO()
+        pstats.Stats(perfil, stream=salida).strip_dirs().sort_stats('tottime').print_stats(lineas)
+        # Solo la tabla, sin el encabezado de pstats
+        tabla = salida.getvalue().split('ncalls', 1)[-1]
+        return '    ncalls' + tabla.rstrip().replace('\n', '\n    ')
@@ -0,0 +1,98 @@
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from litethinking.domain.entities.producto import Moneda, Producto
+from litethinking.presentation.api import renderers
+from litethinking.presentation.api.producto.serializer import (
+    ProductoPrecioSerializer,
+    ProductoSerializer,
+    producto_a_dict,
+)
+
+
+def _productos_de_prueba(cantidad):
+    # Incluye texto no ASCII y los separadores U+2028/U+2029 que el renderer escapa
+    return [
+        Producto.from_persistence(
+            codigo=f'PROD-{i}',
+            nombre=f'Producto número {i}',
+            empresa_nit='900123456',
+            caracteristicas='Características: peso 1 kg, color café' if i % 2 else '',
+            descripcion='Línea 1\u2028línea 2\u2029fin' if i % 10 == 0 else 'Descripción breve',
+            valores={
+                Moneda.COP: Decimal(i * 1000) / 100,
+                Moneda.USD: Decimal(i) / 100,
+            } if i % 5 else {},
+        )
+        for i in range(cantidad)
+    ]
+
+
+class _ProductoSerializerAnterior(ProductoSerializer):
+    # Representación previa a producto_a_dict: un serializer nuevo por cada precio
+
+    def to_representation(self, instance):
+        return {
+            'codigo': instance.codigo,
+            'nombre': instance.nombre,
+            'empresa_nit': instance.empresa_nit,
+            'caracteristicas': instance.caracteristicas,
+            'descripcion': instance.descripcion,
+            'precios': [
+                ProductoPrecioSerializer().to_representation(precio)
+                for precio in instance.precios
+            ],
+        }
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara el tiempo de serializar y codificar listados de productos: '
+        'ProductoSerializer + JSONRenderer, funciones entidad -> dict + '
+        'JSONRenderer, y funciones + JSONRapidoRenderer; verifica que la salida sea idéntica'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cantidad', type=int, nargs='+', default=[10000, 100000])
+        parser.add_argument('--repeticiones', type=int, default=3)
+
+    def handle(self, *args, **options):
+        if options['repeticiones'] < 1:
+            raise CommandError('--repeticiones debe ser mayor que cero')
+
+        motor = 'orjson' if renderers.orjson is not None else 'codificador de DRF (orjson no instalado)'
+        self.stdout.write(f'JSONRapidoRenderer usa: {motor}')
+
+        variantes = (
+            ('serializer + JSONRenderer',
+             lambda productos: JSONRenderer().render(_ProductoSerializerAnterior(productos, many=True).data)),
+            ('funciones + JSONRenderer',
+             lambda productos: JSONRenderer().render([producto_a_dict(p) for p in productos])),
+            ('funciones + JSONRapidoRenderer',
+             lambda productos: renderers.JSONRapidoRenderer().render([producto_a_dict(p) for p in productos])),
+        )
+
+        for cantidad in options['cantidad']:
+            productos = _productos_de_prueba(cantidad)
+            self.stdout.write(f'\n{cantidad} productos')
+
+            referencia = None
+            base = None
+            for nombre, serializar in variantes:
+                tiempos = []
+                for _ in range(options['repeticiones']):
+                    inicio = time.perf_counter()
+                    contenido = serializar(productos)
+                    tiempos.append(time.perf_counter() - inicio)
+
+                mejor = min(tiempos)
+                if referencia is None:
+                    referencia, base = contenido, mejor
+                identico = 'idéntico' if contenido == referencia else 'DIFERENTE'
+                self.stdout.write(
+                    f'  {nombre:<32} {mejor * 1000:>9.1f} ms  {cantidad / mejor:>12,.0f} productos/s  '
+                    f'x{base / mejor:.1f}  {len(contenido):,} bytes  {identico}'
+                )
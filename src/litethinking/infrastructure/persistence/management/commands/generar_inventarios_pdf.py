@@ -0,0 +1,69 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from litethinking.application.use_cases.inventario_use_cases import GenerarLotePdfInventarioUseCase
+from litethinking.infrastructure.reportes import DirectorioDestinoLotePdf, ZipDestinoLotePdf
+from litethinking.infrastructure.repositorios import (
+    obtener_empresa_repository,
+    obtener_producto_repository,
+    obtener_renderizador_lote_pdf,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera el PDF de inventario de varias empresas (o de todas) en varios '
+        'procesos, en un ZIP o en un directorio. Para pedirlo desde la API: '
+        'POST /api/inventario/lote/pdf/'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--empresa', nargs='+', help='NIT de las empresas (por defecto, todas)')
+        destino = parser.add_mutually_exclusive_group(required=True)
+        destino.add_argument('--zip', help='Archivo ZIP a crear')
+        destino.add_argument('--directorio', help='Directorio donde escribir un PDF por empresa')
+        parser.add_argument(
+            '--procesos',
+            type=int,
+            default=settings.LOTE_PDF['PROCESOS'],
+            help='Procesos que dibujan los PDF (0: uno por núcleo disponible; por defecto LOTE_PDF_PROCESOS)',
+        )
+
+    def handle(self, *args, **options):
+        if options['procesos'] < 0:
+            raise CommandError('--procesos no puede ser negativo')
+
+        renderizador = obtener_renderizador_lote_pdf(options['procesos'])
+        use_case = GenerarLotePdfInventarioUseCase(
+            obtener_empresa_repository(),
+            obtener_producto_repository(),
+            renderizador,
+            settings.LOTE_PDF['EMPRESAS_POR_CONSULTA'],
+        )
+
+        archivo_zip = open(options['zip'], 'wb') if options['zip'] else None
+        destino = ZipDestinoLotePdf(archivo_zip) if archivo_zip else DirectorioDestinoLotePdf(options['directorio'])
+
+        def progreso(procesadas, total, resultado):
+            detalle = f'error: {resultado.error}' if resultado.error else f'{resultado.total_productos} productos'
+            self.stdout.write(f'[{procesadas}/{total}] {resultado.empresa_nit} {resultado.empresa_nombre} ({detalle})')
+
+        self.stdout.write(f'Generando con {renderizador.procesos} proceso(s)')
+        inicio = time.perf_counter()
+        try:
+            resumen = use_case.ejecutar(destino, options['empresa'], progreso)
+        finally:
+            destino.cerrar()
+            if archivo_zip:
+                archivo_zip.close()
+        duracion = time.perf_counter() - inicio
+
+        self.stdout.write(
+            f'{resumen.generados} PDF de {resumen.total_empresas} empresas, '
+            f'{resumen.total_productos} productos en {duracion:.1f} s '
+            f'({resumen.generados / duracion if duracion else 0:.1f} PDF/s) -> {options["zip"] or options["directorio"]}'
+        )
+        if resumen.errores:
+            raise CommandError(f'{len(resumen.errores)} empresa(s) sin PDF: {", ".join(sorted(resumen.errores))}')
@@ -0,0 +1,106 @@
+import os
+import socket
+import tempfile
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from litethinking.application.use_cases.inventario_use_cases import (
+    GenerarLotePdfInventarioUseCase,
+    GenerarPdfInventarioUseCase,
+)
+from litethinking.application.use_cases.trabajo_pdf_use_cases import (
+    ProcesarTrabajoPdfUseCase,
+    PurgarTrabajosPdfUseCase,
+)
+from litethinking.infrastructure.reportes import ZipDestinoLotePdf, enviar_inventario_por_correo
+from litethinking.infrastructure.repositorios import (
+    obtener_cache_pdf,
+    obtener_empresa_repository,
+    obtener_empresa_repository_sin_cache,
+    obtener_generador_pdf,
+    obtener_producto_repository,
+    obtener_renderizador_lote_pdf,
+    obtener_resumen_inventario_repository,
+    obtener_trabajo_pdf_repository,
+    obtener_version_repository,
+)
+
+# Cada cuánto se eliminan los trabajos terminados fuera del periodo de retención
+PURGA_CADA_SEGUNDOS = 3600
+
+
+class Command(BaseCommand):
+    help = (
+        'Procesa la cola de PDF de inventario (POST /api/inventario/empresa/<nit>/pdf/). '
+        'Se pueden ejecutar varios a la vez: cada trabajo lo toma uno solo'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--intervalo', type=float, default=2.0, help='Segundos de espera cuando la cola está vacía')
+        parser.add_argument('--una-vez', action='store_true', help='Vaciar la cola y terminar (para cron)')
+
+    def handle(self, *args, **options):
+        if options['intervalo'] <= 0:
+            raise CommandError('--intervalo debe ser mayor que cero')
+
+        trabajador = f'{socket.gethostname()}:{os.getpid()}'
+        trabajo_repository = obtener_trabajo_pdf_repository()
+        generar_pdf = GenerarPdfInventarioUseCase(
+            obtener_empresa_repository_sin_cache(),
+            obtener_producto_repository(),
+            obtener_version_repository(),
+            obtener_resumen_inventario_repository(),
+            obtener_generador_pdf(),
+            obtener_cache_pdf(),
+            settings.PDF_INVENTARIO['UMBRAL_GRANDE'],
+        )
+        generar_lote = GenerarLotePdfInventarioUseCase(
+            obtener_empresa_repository(),
+            obtener_producto_repository(),
+            obtener_renderizador_lote_pdf(),
+            settings.LOTE_PDF['EMPRESAS_POR_CONSULTA'],
+        )
+        procesar = ProcesarTrabajoPdfUseCase(
+            trabajo_repository,
+            generar_pdf,
+            enviar_inventario_por_correo,
+            generar_lote,
+            lambda: ZipDestinoLotePdf(tempfile.TemporaryFile()),
+        )
+        purgar = PurgarTrabajosPdfUseCase(trabajo_repository)
+        retencion = timedelta(hours=settings.TRABAJOS_PDF['RETENCION_HORAS'])
+
+        self.stdout.write(f'Trabajador {trabajador} esperando trabajos')
+        ultima_purga = 0.0
+        try:
+            while True:
+                if time.monotonic() - ultima_purga >= PURGA_CADA_SEGUNDOS:
+                    eliminados = purgar.ejecutar(retencion, timezone.now())
+                    if eliminados:
+                        self.stdout.write(f'{eliminados} trabajos antiguos eliminados')
+                    ultima_purga = time.monotonic()
+
+                # Un proceso de larga duración no debe conservar conexiones caídas
+                close_old_connections()
+                inicio = time.perf_counter()
+                trabajo = procesar.ejecutar(trabajador)
+                if trabajo is None:
+                    if options['una_vez']:
+                        return
+                    time.sleep(options['intervalo'])
+                    continue
+
+                detalle = f'error: {trabajo.error}' if trabajo.error else f'{trabajo.total_productos} productos'
+                if trabajo.es_lote:
+                    detalle = f'{trabajo.procesados or 0}/{trabajo.total_empresas or 0} empresas, {detalle}'
+                self.stdout.write(
+                    f'{trabajo.id} {trabajo.empresa_nit or "lote"} {trabajo.estado.value} '
+                    f'({detalle}, {time.perf_counter() - inicio:.1f} s)'
+                )
+        except KeyboardInterrupt:
+            self.stdout.write('Trabajador detenido')
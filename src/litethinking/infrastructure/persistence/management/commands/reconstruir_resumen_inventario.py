@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from litethinking.application.use_cases.inventario_use_cases import ReconstruirResumenInventarioUseCase
+from litethinking.infrastructure.repositorios import obtener_resumen_inventario_repository
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula desde los productos el resumen de inventario por empresa '
+        '(necesario si se modificaron productos o precios por fuera de la aplicación)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--empresa', help='NIT de una sola empresa (por defecto, todas)')
+
+    def handle(self, *args, **options):
+        use_case = ReconstruirResumenInventarioUseCase(obtener_resumen_inventario_repository())
+        total = use_case.ejecutar(options['empresa'])
+        self.stdout.write(
+            self.style.SUCCESS(f'[OK] Resumen de inventario reconstruido para {total} empresa(s).')
+        )
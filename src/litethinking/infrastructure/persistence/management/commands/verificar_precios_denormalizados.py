@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+
+from litethinking.infrastructure.persistence.producto import precios_compactos
+from litethinking.infrastructure.persistence.producto.model import ProductoModel
+
+TAMANO_LOTE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara la copia denormalizada producto.precios_compactos con la tabla '
+        'de precios y, con --reparar, corrige los productos que no coinciden'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reparar', action='store_true', help='Reescribe la copia de los productos inconsistentes')
+        parser.add_argument('--empresa', help='NIT de una sola empresa (por defecto, todas)')
+
+    def handle(self, *args, **options):
+        productos_model = ProductoModel.objects.order_by('codigo')
+        if options['empresa']:
+            productos_model = productos_model.filter(empresa_id=options['empresa'])
+
+        revisados = 0
+        inconsistentes = []
+        lote = []
+        for fila in productos_model.values_list('codigo', 'precios_compactos').iterator(chunk_size=TAMANO_LOTE):
+            lote.append(fila)
+            if len(lote) == TAMANO_LOTE:
+                inconsistentes += self._revisar(lote)
+                revisados += len(lote)
+                lote = []
+        if lote:
+            inconsistentes += self._revisar(lote)
+            revisados += len(lote)
+
+        for codigo in inconsistentes[:20]:
+            self.stdout.write(self.style.WARNING(f'[INFO] Inconsistente: {codigo}'))
+        if len(inconsistentes) > 20:
+            self.stdout.write(self.style.WARNING(f'[INFO] ... y {len(inconsistentes) - 20} más'))
+
+        if inconsistentes and options['reparar']:
+            for inicio in range(0, len(inconsistentes), TAMANO_LOTE):
+                precios_compactos.sincronizar(inconsistentes[inicio:inicio + TAMANO_LOTE])
+            self.stdout.write(self.style.SUCCESS(f'[OK] {len(inconsistentes)} producto(s) reparados.'))
+
+        estilo = self.style.WARNING if inconsistentes and not options['reparar'] else self.style.SUCCESS
+        self.stdout.write(estilo(
+            f'[OK] {revisados} producto(s) revisados, {len(inconsistentes)} inconsistente(s).'
+        ))
+
+    def _revisar(self, lote):
+        esperados = precios_compactos.calcular(codigo for codigo, _ in lote)
+        # El orden de las monedas no importa para la consistencia
+        return [
+            codigo for codigo, actual in lote
+            if actual is None or dict(actual) != dict(esperados[codigo])
+        ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0003_productomodel_descripcion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='productomodel',
+            index=models.Index(fields=['empresa', 'codigo'], name='ix_producto__empresa_codigo'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0004_producto_indice_empresa_codigo'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='productomodel',
+            index=models.Index(fields=['empresa', 'nombre'], name='ix_producto__empresa_nombre'),
+        ),
+        migrations.AddIndex(
+            model_name='productomodel',
+            index=models.Index(fields=['nombre'], name='ix_producto__nombre_patron', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='productopreciomodel',
+            index=models.Index(fields=['moneda', 'valor', 'producto'], name='ix_precio__moneda_valor'),
+        ),
+    ]
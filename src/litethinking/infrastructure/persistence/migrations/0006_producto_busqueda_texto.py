@@ -0,0 +1,77 @@
+from django.db import migrations
+
+# PostgreSQL: columna tsvector generada (se recalcula sola en cada INSERT/UPDATE)
+# con pesos nombre > características > descripción, e índice GIN.
+POSTGRES_CREAR = [
+    """
+    ALTER TABLE producto ADD COLUMN busqueda tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('spanish', coalesce(nombre, '')), 'A') ||
+        setweight(to_tsvector('spanish', coalesce(caracteristicas, '')), 'B') ||
+        setweight(to_tsvector('spanish', coalesce(descripcion, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX ix_producto__busqueda ON producto USING GIN (busqueda)",
+]
+POSTGRES_ELIMINAR = [
+    "DROP INDEX IF EXISTS ix_producto__busqueda",
+    "ALTER TABLE producto DROP COLUMN IF EXISTS busqueda",
+]
+
+# SQLite (desarrollo local y pruebas): tabla FTS5 mantenida con triggers.
+# Las filas se ubican por código con MATCH para no recorrer toda la tabla.
+_SQLITE_BORRAR_VIEJO = (
+    "DELETE FROM producto_fts WHERE producto_fts MATCH "
+    "'codigo : \"' || replace(old.codigo, '\"', '\"\"') || '\"' AND codigo = old.codigo;"
+)
+_SQLITE_INSERTAR_NUEVO = (
+    "INSERT INTO producto_fts (codigo, nombre, caracteristicas, descripcion) "
+    "VALUES (new.codigo, new.nombre, new.caracteristicas, coalesce(new.descripcion, ''));"
+)
+SQLITE_CREAR = [
+    """
+    CREATE VIRTUAL TABLE producto_fts USING fts5(
+        codigo, nombre, caracteristicas, descripcion,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    f"CREATE TRIGGER producto_fts_insert AFTER INSERT ON producto BEGIN {_SQLITE_INSERTAR_NUEVO} END",
+    f"CREATE TRIGGER producto_fts_delete AFTER DELETE ON producto BEGIN {_SQLITE_BORRAR_VIEJO} END",
+    (
+        "CREATE TRIGGER producto_fts_update AFTER UPDATE OF codigo, nombre, caracteristicas, descripcion "
+        f"ON producto BEGIN {_SQLITE_BORRAR_VIEJO} {_SQLITE_INSERTAR_NUEVO} END"
+    ),
+    """
+    INSERT INTO producto_fts (codigo, nombre, caracteristicas, descripcion)
+    SELECT codigo, nombre, caracteristicas, coalesce(descripcion, '') FROM producto
+    """,
+]
+SQLITE_ELIMINAR = [
+    "DROP TRIGGER IF EXISTS producto_fts_insert",
+    "DROP TRIGGER IF EXISTS producto_fts_delete",
+    "DROP TRIGGER IF EXISTS producto_fts_update",
+    "DROP TABLE IF EXISTS producto_fts",
+]
+
+
+def _ejecutar(schema_editor, sentencias_por_motor):
+    for sentencia in sentencias_por_motor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sentencia)
+
+
+def crear_busqueda(apps, schema_editor):
+    _ejecutar(schema_editor, {'postgresql': POSTGRES_CREAR, 'sqlite': SQLITE_CREAR})
+
+
+def eliminar_busqueda(apps, schema_editor):
+    _ejecutar(schema_editor, {'postgresql': POSTGRES_ELIMINAR, 'sqlite': SQLITE_ELIMINAR})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0005_indices_filtros_producto'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_busqueda, eliminar_busqueda),
+    ]
@@ -0,0 +1,65 @@
+import django.db.models.deletion
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+
+
+def _texto(valor):
+    return str(Decimal(valor).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+
+
+def poblar_resumenes(apps, schema_editor):
+    ProductoModel = apps.get_model('persistence', 'ProductoModel')
+    ProductoPrecioModel = apps.get_model('persistence', 'ProductoPrecioModel')
+    InventarioResumenModel = apps.get_model('persistence', 'InventarioResumenModel')
+
+    resumenes = {
+        fila['empresa_id']: InventarioResumenModel(
+            empresa_id=fila['empresa_id'],
+            total_productos=fila['total'],
+            con_precio=fila['con_precio'],
+            estadisticas={},
+        )
+        for fila in ProductoModel.objects.order_by().values('empresa_id').annotate(
+            total=Count('codigo', distinct=True),
+            con_precio=Count('precios__producto', distinct=True),
+        )
+    }
+    filas = ProductoPrecioModel.objects.order_by().values('producto__empresa_id', 'moneda').annotate(
+        cantidad=Count('id'), suma=Sum('valor'), minimo=Min('valor'), maximo=Max('valor')
+    )
+    for fila in filas:
+        resumenes[fila['producto__empresa_id']].estadisticas[fila['moneda']] = {
+            'cantidad': fila['cantidad'],
+            'suma': _texto(fila['suma']),
+            'minimo': _texto(fila['minimo']),
+            'maximo': _texto(fila['maximo']),
+        }
+    InventarioResumenModel.objects.bulk_create(resumenes.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0006_producto_busqueda_texto'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventarioResumenModel',
+            fields=[
+                ('empresa', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='resumen_inventario', serialize=False, to='persistence.empresamodel')),
+                ('total_productos', models.PositiveIntegerField(default=0, verbose_name='Total de productos')),
+                ('con_precio', models.PositiveIntegerField(default=0, verbose_name='Productos con precio')),
+                ('estadisticas', models.JSONField(default=dict, verbose_name='Estadísticas por moneda')),
+                ('actualizado', models.DateTimeField(auto_now=True, verbose_name='Actualizado')),
+            ],
+            options={
+                'db_table': 'inventario_resumen',
+                'verbose_name': 'Resumen de Inventario',
+                'verbose_name_plural': 'Resúmenes de Inventario',
+            },
+        ),
+        migrations.RunPython(poblar_resumenes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import migrations, models
+
+TAMANO_LOTE = 1000
+
+
+def poblar_precios_compactos(apps, schema_editor):
+    ProductoModel = apps.get_model('persistence', 'ProductoModel')
+    ProductoPrecioModel = apps.get_model('persistence', 'ProductoPrecioModel')
+
+    codigos = list(ProductoModel.objects.order_by('codigo').values_list('codigo', flat=True))
+    for inicio in range(0, len(codigos), TAMANO_LOTE):
+        lote = codigos[inicio:inicio + TAMANO_LOTE]
+        precios = defaultdict(list)
+        for producto_id, moneda, valor in ProductoPrecioModel.objects.filter(
+            producto_id__in=lote
+        ).order_by('id').values_list('producto_id', 'moneda', 'valor'):
+            valor = str(Decimal(valor).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+            precios[producto_id].append([moneda, valor])
+        ProductoModel.objects.bulk_update(
+            [ProductoModel(codigo=codigo, precios_compactos=precios[codigo]) for codigo in lote],
+            ['precios_compactos'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0007_inventario_resumen'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productomodel',
+            name='precios_compactos',
+            field=models.JSONField(blank=True, editable=False, null=True, verbose_name='Precios (copia)'),
+        ),
+        migrations.RunPython(poblar_precios_compactos, migrations.RunPython.noop),
+    ]
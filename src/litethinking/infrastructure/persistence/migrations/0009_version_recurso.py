@@ -0,0 +1,44 @@
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def poblar_versiones(apps, schema_editor):
+    EmpresaModel = apps.get_model('persistence', 'EmpresaModel')
+    VersionRecursoModel = apps.get_model('persistence', 'VersionRecursoModel')
+
+    ahora = timezone.now()
+    VersionRecursoModel.objects.bulk_create(
+        [
+            VersionRecursoModel(ambito=ambito, empresa_nit=nit, version=1, modificado=ahora)
+            for nit in EmpresaModel.objects.values_list('nit', flat=True)
+            for ambito in ('empresas', 'productos')
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0008_producto_precios_compactos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VersionRecursoModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ambito', models.CharField(max_length=20, verbose_name='Ámbito')),
+                ('empresa_nit', models.CharField(max_length=20, verbose_name='NIT')),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='Versión')),
+                ('modificado', models.DateTimeField(verbose_name='Modificado')),
+            ],
+            options={
+                'verbose_name': 'Versión de Recurso',
+                'verbose_name_plural': 'Versiones de Recursos',
+                'db_table': 'version_recurso',
+                'constraints': [models.UniqueConstraint(fields=('ambito', 'empresa_nit'), name='uq_version_recurso')],
+            },
+        ),
+        migrations.RunPython(poblar_versiones, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('persistence', '0009_version_recurso'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VersionRolesModel',
+            fields=[
+                ('usuario', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='version_roles', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+                ('version', models.PositiveBigIntegerField(default=1, verbose_name='Versión')),
+            ],
+            options={
+                'verbose_name': 'Versión de Roles',
+                'verbose_name_plural': 'Versiones de Roles',
+                'db_table': 'version_roles',
+            },
+        ),
+    ]
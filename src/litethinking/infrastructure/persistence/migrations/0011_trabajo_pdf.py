@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('persistence', '0010_version_roles'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrabajoPdfModel',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('empresa_nit', models.CharField(max_length=20, verbose_name='NIT')),
+                ('estado', models.CharField(choices=[('pendiente', 'pendiente'), ('en_proceso', 'en_proceso'), ('completado', 'completado'), ('fallido', 'fallido')], default='pendiente', max_length=20, verbose_name='Estado')),
+                ('email_destino', models.EmailField(blank=True, max_length=254, verbose_name='Email destino')),
+                ('creado', models.DateTimeField(auto_now_add=True, verbose_name='Creado')),
+                ('iniciado', models.DateTimeField(blank=True, null=True, verbose_name='Iniciado')),
+                ('terminado', models.DateTimeField(blank=True, null=True, verbose_name='Terminado')),
+                ('trabajador', models.CharField(blank=True, max_length=100, verbose_name='Trabajador')),
+                ('intentos', models.PositiveSmallIntegerField(default=0, verbose_name='Intentos')),
+                ('total_productos', models.PositiveIntegerField(blank=True, null=True, verbose_name='Total de productos')),
+                ('archivo', models.FileField(blank=True, upload_to='trabajos_pdf/', verbose_name='Archivo')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('solicitado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='trabajos_pdf', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Trabajo PDF',
+                'verbose_name_plural': 'Trabajos PDF',
+                'db_table': 'trabajo_pdf',
+                'indexes': [models.Index(fields=['estado', 'creado'], name='trabajo_pdf_estado_creado')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0011_trabajo_pdf'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='trabajopdfmodel',
+            name='empresa_nit',
+            field=models.CharField(blank=True, max_length=20, verbose_name='NIT'),
+        ),
+        migrations.AddField(
+            model_name='trabajopdfmodel',
+            name='empresas',
+            field=models.JSONField(blank=True, null=True, verbose_name='Empresas del lote'),
+        ),
+        migrations.AddField(
+            model_name='trabajopdfmodel',
+            name='procesados',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Empresas procesadas'),
+        ),
+        migrations.AddField(
+            model_name='trabajopdfmodel',
+            name='total_empresas',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Total de empresas'),
+        ),
+        migrations.AddField(
+            model_name='trabajopdfmodel',
+            name='latido',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Último avance'),
+        ),
+    ]
@@ -0,0 +1,74 @@
+"""
+Búsqueda de texto completo sobre nombre, características y descripción.
+
+La migración 0006 crea la estructura según el motor: en PostgreSQL una
+columna tsvector generada con índice GIN y en SQLite una tabla FTS5
+mantenida por triggers. Ninguna de las dos forma parte de ProductoModel,
+por lo que aquí se consultan con SQL directo y solo se devuelven códigos.
+"""
+import re
+from typing import List
+
+from django.db import connections, router
+from django.db.models import Q
+
+from .model import ProductoModel
+
+_PALABRA = re.compile(r'\w+', re.UNICODE)
+
+_SQL_POSTGRES = """
+    SELECT codigo
+    FROM producto, websearch_to_tsquery('spanish', %s) AS consulta
+    WHERE busqueda @@ consulta
+    ORDER BY ts_rank_cd(busqueda, consulta) DESC, codigo
+    LIMIT %s OFFSET %s
+"""
+
+# bm25 devuelve valores menores para los mejores resultados; los pesos
+# corresponden a (codigo, nombre, caracteristicas, descripcion)
+_SQL_SQLITE = """
+    SELECT codigo
+    FROM producto_fts
+    WHERE producto_fts MATCH %s
+    ORDER BY bm25(producto_fts, 0.0, 10.0, 4.0, 1.0), codigo
+    LIMIT %s OFFSET %s
+"""
+
+
+def palabras_de(consulta: str) -> List[str]:
+    return _PALABRA.findall(consulta or '')
+
+
+def buscar_codigos(consulta: str, limite: int, desplazamiento: int) -> List[str]:
+    """Códigos de los productos que coinciden, del más al menos relevante."""
+    alias = router.db_for_read(ProductoModel)
+    conexion = connections[alias]
+    
+    if conexion.vendor == 'postgresql':
+        parametros = [consulta, limite, desplazamiento]
+        sql = _SQL_POSTGRES
+    elif conexion.vendor == 'sqlite':
+        # Cada palabra como frase entre comillas evita que la entrada del
+        # usuario se interprete como sintaxis de FTS5
+        frases = ' AND '.join(f'"{palabra}"' for palabra in palabras_de(consulta))
+        parametros = [f'{{nombre caracteristicas descripcion}} : ({frases})', limite, desplazamiento]
+        sql = _SQL_SQLITE
+    else:
+        return _buscar_codigos_sin_indice(alias, consulta, limite, desplazamiento)
+    
+    with conexion.cursor() as cursor:
+        cursor.execute(sql, parametros)
+        return [fila[0] for fila in cursor.fetchall()]
+
+
+def _buscar_codigos_sin_indice(alias: str, consulta: str, limite: int, desplazamiento: int) -> List[str]:
+    # Motores sin soporte: todas las palabras en algún campo, sin ranking
+    productos_model = ProductoModel.objects.using(alias)
+    for palabra in palabras_de(consulta):
+        productos_model = productos_model.filter(
+            Q(nombre__icontains=palabra)
+            | Q(caracteristicas__icontains=palabra)
+            | Q(descripcion__icontains=palabra)
+        )
+    codigos = productos_model.order_by('codigo').values_list('codigo', flat=True)
+    return list(codigos[desplazamiento:desplazamiento + limite])
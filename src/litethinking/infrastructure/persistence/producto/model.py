@@ -8,6 +8,8 @@ class ProductoModel(models.Model):
     nombre = models.CharField("Nombre del producto", max_length=255)
     caracteristicas = models.TextField("Características", blank=True)
     descripcion = models.TextField("Descripción", blank=True, null=True)
+    # Copia de los precios para leer sin JOIN; la fuente de verdad es ProductoPrecioModel
+    precios_compactos = models.JSONField("Precios (copia)", null=True, blank=True, editable=False)
 
     empresa = models.ForeignKey(
         EmpresaModel,
@@ -19,6 +21,18 @@ class ProductoModel(models.Model):
         db_table = "producto"
         verbose_name = "Producto"
         verbose_name_plural = "Productos"
+        indexes = [
+            # Paginación por clave dentro de una empresa
+            models.Index(fields=["empresa", "codigo"], name="ix_producto__empresa_codigo"),
+            # Filtro por prefijo y orden por nombre dentro de una empresa
+            models.Index(fields=["empresa", "nombre"], name="ix_producto__empresa_nombre"),
+            # LIKE 'prefijo%' sin empresa en PostgreSQL (ignorado en otros motores)
+            models.Index(
+                fields=["nombre"],
+                name="ix_producto__nombre_patron",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ]
 
     def __str__(self):
         return f"{self.nombre} ({self.codigo})"
@@ -50,6 +64,11 @@ class ProductoPrecioModel(models.Model):
                 name="uq_producto_precio__producto_moneda",
             )
         ]
+        indexes = [
+            # Rango de precios por moneda; incluir producto permite resolver
+            # el filtro y el JOIN solo con el índice
+            models.Index(fields=["moneda", "valor", "producto"], name="ix_precio__moneda_valor"),
+        ]
 
     def __str__(self):
         return f"{self.producto.codigo} {self.moneda} {self.valor}"
@@ -0,0 +1,45 @@
+"""
+Copia denormalizada de los precios en la columna producto.precios_compactos.
+
+ProductoPrecioModel sigue siendo la fuente de verdad. La copia es una lista
+de pares [moneda, valor] en el orden de los precios (una lista y no un
+objeto, porque jsonb no conserva el orden de las claves), y permite leer
+productos sin el JOIN/consulta extra de los precios cuando
+settings.PRODUCTO_PRECIOS_DENORMALIZADOS está activo.
+"""
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Iterable, List, Tuple
+
+from .model import ProductoModel, ProductoPrecioModel
+
+_CENTAVOS = Decimal('0.01')
+
+PreciosCompactos = List[List[str]]
+
+
+def compactar(precios: Iterable[Tuple[str, Decimal]]) -> PreciosCompactos:
+    return [
+        [moneda, str(Decimal(valor).quantize(_CENTAVOS, rounding=ROUND_HALF_UP))]
+        for moneda, valor in precios
+    ]
+
+
+def calcular(codigos: Iterable[str]) -> Dict[str, PreciosCompactos]:
+    """Copia esperada de cada producto según la tabla de precios."""
+    codigos = list(codigos)
+    precios = defaultdict(list)
+    for producto_id, moneda, valor in ProductoPrecioModel.objects.filter(
+        producto_id__in=codigos
+    ).order_by('id').values_list('producto_id', 'moneda', 'valor'):
+        precios[producto_id].append((moneda, valor))
+    return {codigo: compactar(precios[codigo]) for codigo in codigos}
+
+
+def sincronizar(codigos: Iterable[str]) -> None:
+    """Reescribe la copia de los productos indicados desde la tabla de precios."""
+    esperados = calcular(codigos)
+    ProductoModel.objects.bulk_update(
+        [ProductoModel(codigo=codigo, precios_compactos=compactos) for codigo, compactos in esperados.items()],
+        ['precios_compactos'],
+    )
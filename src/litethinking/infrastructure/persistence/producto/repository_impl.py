@@ -1,74 +1,558 @@
-from typing import List, Optional
+from decimal import ROUND_HALF_UP, Decimal
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import CharField, F, FilteredRelation, Q, Value
 
 from ....domain.entities.producto import Moneda, Producto, ProductoPrecio
+from ....domain.ports.consultas import FiltroProductos, OrdenProductos, ProyeccionProductos
+from ....domain.ports.paginacion import Clave, Pagina
 from ....domain.ports.producto_repository import ProductoRepository
+from ....domain.ports.version_repository import AmbitoVersion
+from ..inventario.resumen import CambiosResumen
+from ..versiones import registro as versiones
+from . import busqueda, precios_compactos
+from .precios_compactos import compactar
 from .model import ProductoModel, ProductoPrecioModel
 
+# Cantidad de productos escritos por sentencia en guardar_muchos
+TAMANO_LOTE = 1000
+
+_CENTAVOS = Decimal('0.01')
+
+# Columnas leídas con values_list en la hidratación rápida
+_CAMPOS = ('codigo', 'nombre', 'caracteristicas', 'descripcion', 'empresa_id')
+
+# Columna del modelo de cada campo de ProyeccionProductos
+_COLUMNAS = {
+    'codigo': 'codigo',
+    'nombre': 'nombre',
+    'empresa_nit': 'empresa_id',
+    'caracteristicas': 'caracteristicas',
+    'descripcion': 'descripcion',
+}
+
+_MONEDAS = {moneda.value: moneda for moneda in Moneda}
+
+# Campo de orden (además de la clave primaria) y si es descendente
+_ORDENES = {
+    OrdenProductos.CODIGO: (None, False),
+    OrdenProductos.NOMBRE: ('nombre', False),
+    OrdenProductos.NOMBRE_DESC: ('nombre', True),
+    OrdenProductos.PRECIO: ('valor_orden', False),
+    OrdenProductos.PRECIO_DESC: ('valor_orden', True),
+}
+
 
 class DjangoProductoRepository(ProductoRepository):
 
+    def __init__(self, precios_denormalizados: Optional[bool] = None, hidratacion_rapida: bool = True):
+        # Leer los precios de producto.precios_compactos en vez de la tabla de precios
+        if precios_denormalizados is None:
+            precios_denormalizados = settings.PRODUCTO_PRECIOS_DENORMALIZADOS
+        self._precios_denormalizados = precios_denormalizados
+        # Construir las entidades desde tuplas, sin instancias de modelos de Django
+        self._hidratacion_rapida = hidratacion_rapida
+    
     def guardar(self, producto: Producto) -> Producto:
-        producto_model, _ = ProductoModel.objects.update_or_create(
-            codigo=producto.codigo,
-            defaults={
-                'nombre': producto.nombre,
-                'caracteristicas': producto.caracteristicas,
-                'descripcion': producto.descripcion,
-                'empresa_id': producto.empresa_nit,
-            }
-        )
+        return self.guardar_muchos([producto])[0]
+    
+    def crear(self, producto: Producto) -> Producto:
+        # Solo INSERTs (más resumen de inventario y versión): la clave primaria y la
+        # llave foránea hacen las validaciones que antes requerían consultas previas
+        try:
+            with transaction.atomic():
+                self._insertar(producto)
+                cambios = CambiosResumen()
+                cambios.agregar(producto.empresa_nit, self._valores(producto))
+                cambios.aplicar()
+                versiones.incrementar(AmbitoVersion.PRODUCTOS, [producto.empresa_nit])
+        except IntegrityError:
+            # Solo en el camino de error se consulta para elegir el mensaje
+            if self.existe(producto.codigo):
+                raise ValueError(f"Ya existe un producto con el código: {producto.codigo}")
+            raise ValueError(f"No existe una empresa con el NIT: {producto.empresa_nit}")
         
-        ProductoPrecioModel.objects.filter(producto=producto_model).delete()
-        for precio in producto.precios:
-            ProductoPrecioModel.objects.create(
-                producto=producto_model,
-                moneda=precio.moneda.value,
-                valor=precio.valor
-            )
+        return self._a_entidad_guardada(producto)
+    
+    def guardar_muchos(self, productos: List[Producto]) -> List[Producto]:
+        # Si un código llega repetido prevalece su última versión
+        por_codigo = {producto.codigo: producto for producto in productos}
+        unicos = list(por_codigo.values())
+        
+        # Cambian los listados de la empresa nueva y de la anterior de cada producto
+        empresas = {producto.empresa_nit for producto in unicos}
+        try:
+            with transaction.atomic():
+                cambios = CambiosResumen()
+                for inicio in range(0, len(unicos), TAMANO_LOTE):
+                    empresas |= self._guardar_lote(unicos[inicio:inicio + TAMANO_LOTE], cambios)
+                cambios.aplicar()
+                versiones.incrementar(AmbitoVersion.PRODUCTOS, empresas)
+        except IntegrityError:
+            # La única llave foránea de los productos es la empresa: alguna no existe (o se acaba de borrar)
+            nits = {producto.empresa_nit for producto in unicos}
+            if len(nits) == 1:
+                raise ValueError(f"No existe una empresa con el NIT: {nits.pop()}")
+            raise ValueError("No existe alguna de las empresas de los productos")
         
-        return self._to_domain_entity(producto_model)
+        guardados = {codigo: self._a_entidad_guardada(producto) for codigo, producto in por_codigo.items()}
+        return [guardados[producto.codigo] for producto in productos]
     
-    def buscar_por_codigo(self, codigo: str) -> Optional[Producto]:
+    def buscar_por_codigo(self, codigo: str, proyeccion: Optional[ProyeccionProductos] = None) -> Optional[Producto]:
+        if self._hidratacion_rapida:
+            productos = self._listar_tuplas(
+                ProductoModel.objects.filter(codigo=codigo),
+                ProductoPrecioModel.objects.filter(producto_id=codigo),
+                proyeccion,
+            )
+            return productos[0] if productos else None
+        
         try:
-            producto_model = ProductoModel.objects.prefetch_related('precios').get(codigo=codigo)
-            return self._to_domain_entity(producto_model)
+            producto_model = self._productos(proyeccion).get(codigo=codigo)
+            return self._to_domain_entity(producto_model, proyeccion)
         except ProductoModel.DoesNotExist:
             return None
     
-    def listar_todos(self) -> List[Producto]:
-        productos_model = ProductoModel.objects.prefetch_related('precios').all()
-        return [self._to_domain_entity(prod) for prod in productos_model]
+    def listar_todos(self, proyeccion: Optional[ProyeccionProductos] = None) -> List[Producto]:
+        if self._hidratacion_rapida:
+            return self._listar_tuplas(ProductoModel.objects.all(), ProductoPrecioModel.objects.all(), proyeccion)
+        
+        productos_model = self._productos(proyeccion)
+        return [self._to_domain_entity(prod, proyeccion) for prod in productos_model]
     
-    def listar_por_empresa(self, empresa_nit: str) -> List[Producto]:
-        productos_model = ProductoModel.objects.prefetch_related('precios').filter(
-            empresa_id=empresa_nit
-        )
-        return [self._to_domain_entity(prod) for prod in productos_model]
+    def listar_por_empresa(self, empresa_nit: str, proyeccion: Optional[ProyeccionProductos] = None) -> List[Producto]:
+        if self._hidratacion_rapida:
+            return self._listar_tuplas(
+                ProductoModel.objects.filter(empresa_id=empresa_nit),
+                ProductoPrecioModel.objects.filter(producto__empresa_id=empresa_nit),
+                proyeccion,
+            )
+        
+        productos_model = self._productos(proyeccion).filter(empresa_id=empresa_nit)
+        return [self._to_domain_entity(prod, proyeccion) for prod in productos_model]
+    
+    def listar_por_empresas(
+        self,
+        empresa_nits: Iterable[str],
+        proyeccion: Optional[ProyeccionProductos] = None
+    ) -> Dict[str, List[Producto]]:
+        empresa_nits = list(empresa_nits)
+        if proyeccion is not None and 'empresa_nit' not in proyeccion.campos:
+            # Se agrupan por empresa: el NIT siempre se lee
+            proyeccion = ProyeccionProductos(proyeccion.campos + ('empresa_nit',), proyeccion.incluir_precios)
+        if self._hidratacion_rapida:
+            productos = self._listar_tuplas(
+                ProductoModel.objects.filter(empresa_id__in=empresa_nits).order_by('codigo'),
+                ProductoPrecioModel.objects.filter(producto__empresa_id__in=empresa_nits),
+                proyeccion,
+            )
+        else:
+            productos_model = self._productos(proyeccion).filter(empresa_id__in=empresa_nits).order_by('codigo')
+            productos = [self._to_domain_entity(prod, proyeccion) for prod in productos_model]
+        
+        por_empresa: Dict[str, List[Producto]] = {}
+        for producto in productos:
+            por_empresa.setdefault(producto.empresa_nit, []).append(producto)
+        return por_empresa
+    
+    def iterar_todos(
+        self,
+        tamano_lote: int = TAMANO_LOTE,
+        proyeccion: Optional[ProyeccionProductos] = None
+    ) -> Iterator[Producto]:
+        return self._iterar(self._productos(proyeccion), tamano_lote, proyeccion)
+    
+    def iterar_por_empresa(
+        self,
+        empresa_nit: str,
+        tamano_lote: int = TAMANO_LOTE,
+        proyeccion: Optional[ProyeccionProductos] = None
+    ) -> Iterator[Producto]:
+        return self._iterar(self._productos(proyeccion).filter(empresa_id=empresa_nit), tamano_lote, proyeccion)
+    
+    def buscar(
+        self,
+        filtro: FiltroProductos,
+        limite: int,
+        despues_de: Optional[Clave] = None,
+        proyeccion: Optional[ProyeccionProductos] = None
+    ) -> Pagina[Producto]:
+        campo, descendente = _ORDENES[filtro.orden]
+        # El campo de orden se lee siempre porque forma el cursor de la página siguiente
+        productos_model = self._productos(proyeccion, adicionales=[campo] if campo == 'nombre' else [])
+        if filtro.empresa_nit:
+            productos_model = productos_model.filter(empresa_id=filtro.empresa_nit)
+        if filtro.nombre_prefijo:
+            # startswith (sensible a mayúsculas) para poder usar el índice
+            productos_model = productos_model.filter(nombre__startswith=filtro.nombre_prefijo)
+        
+        if filtro.moneda is not None:
+            # Un único JOIN con el precio de la moneda pedida, que sirve tanto
+            # para filtrar como para ordenar
+            productos_model = productos_model.annotate(
+                precio_filtrado=FilteredRelation(
+                    'precios',
+                    condition=Q(precios__moneda=filtro.moneda.value),
+                ),
+                valor_orden=F('precio_filtrado__valor'),
+            ).filter(valor_orden__isnull=False)
+            if filtro.valor_min is not None:
+                productos_model = productos_model.filter(valor_orden__gte=filtro.valor_min)
+            if filtro.valor_max is not None:
+                productos_model = productos_model.filter(valor_orden__lte=filtro.valor_max)
+        
+        productos_model = self._ordenar_desde(productos_model, campo, descendente, despues_de)
+        
+        # Se pide un registro extra solo para saber si hay otra página
+        filas = list(productos_model[:limite + 1])
+        hay_mas = len(filas) > limite
+        filas = filas[:limite]
+        
+        siguiente = None
+        if hay_mas:
+            ultima = filas[-1]
+            siguiente = ultima.codigo if campo is None else [str(getattr(ultima, campo)), ultima.codigo]
+        
+        return Pagina([self._to_domain_entity(prod, proyeccion) for prod in filas], siguiente=siguiente)
+    
+    def buscar_texto(
+        self,
+        consulta: str,
+        limite: int,
+        desplazamiento: int = 0,
+        proyeccion: Optional[ProyeccionProductos] = None
+    ) -> Pagina[Producto]:
+        codigos = busqueda.buscar_codigos(consulta, limite + 1, desplazamiento)
+        hay_mas = len(codigos) > limite
+        codigos = codigos[:limite]
+        
+        productos_model = self._productos(proyeccion).in_bulk(codigos)
+        productos = [
+            self._to_domain_entity(productos_model[codigo], proyeccion)
+            for codigo in codigos
+            if codigo in productos_model
+        ]
+        
+        return Pagina(productos, siguiente=str(desplazamiento + limite) if hay_mas else None)
+    
+    def agregar_precio(self, codigo: str, precio: ProductoPrecio) -> Optional[Producto]:
+        valor = precio.valor.quantize(_CENTAVOS, rounding=ROUND_HALF_UP)
+        with transaction.atomic():
+            empresa_nit = self._bloquear([codigo]).get(codigo)
+            if empresa_nit is None:
+                return None
+            
+            valores_antes = dict(
+                ProductoPrecioModel.objects.filter(producto_id=codigo).values_list('moneda', 'valor')
+            )
+            if valores_antes.get(precio.moneda.value) != valor:
+                ProductoPrecioModel.objects.bulk_create(
+                    [ProductoPrecioModel(producto_id=codigo, moneda=precio.moneda.value, valor=valor)],
+                    update_conflicts=True,
+                    unique_fields=['producto', 'moneda'],
+                    update_fields=['valor'],
+                )
+                precios_compactos.sincronizar([codigo])
+                
+                cambios = CambiosResumen()
+                cambios.reemplazar(
+                    (empresa_nit, valores_antes),
+                    empresa_nit,
+                    {**valores_antes, precio.moneda.value: valor},
+                )
+                cambios.aplicar()
+                versiones.incrementar(AmbitoVersion.PRODUCTOS, [empresa_nit])
+        
+        return self.buscar_por_codigo(codigo)
     
     def eliminar(self, codigo: str) -> bool:
-        try:
-            producto_model = ProductoModel.objects.get(codigo=codigo)
-            producto_model.delete()
-            return True
-        except ProductoModel.DoesNotExist:
-            return False
+        with transaction.atomic():
+            empresa_nit = self._bloquear([codigo]).get(codigo)
+            if empresa_nit is None:
+                return False
+            
+            valores = dict(ProductoPrecioModel.objects.filter(producto_id=codigo).values_list('moneda', 'valor'))
+            ProductoModel.objects.filter(codigo=codigo).delete()
+            
+            cambios = CambiosResumen()
+            cambios.quitar(empresa_nit, valores)
+            cambios.aplicar()
+            versiones.incrementar(AmbitoVersion.PRODUCTOS, [empresa_nit])
+        return True
     
     def existe(self, codigo: str) -> bool:
         return ProductoModel.objects.filter(codigo=codigo).exists()
     
-    def _to_domain_entity(self, producto_model: ProductoModel) -> Producto:
-        precios = []
-        for precio_model in producto_model.precios.all():
-            moneda = Moneda(precio_model.moneda)
-            precio = ProductoPrecio(moneda=moneda, valor=precio_model.valor)
-            precios.append(precio)
+    def _ordenar_desde(self, productos_model, campo: Optional[str], descendente: bool, despues_de: Optional[Clave]):
+        """Ordena por (campo, codigo) y se posiciona después de la clave recibida."""
+        mayor = 'lt' if descendente else 'gt'
+        signo = '-' if descendente else ''
+        
+        if campo is None:
+            if despues_de is not None:
+                if not isinstance(despues_de, str):
+                    raise ValueError("El cursor no corresponde al orden solicitado")
+                productos_model = productos_model.filter(**{f'codigo__{mayor}': despues_de})
+            return productos_model.order_by(f'{signo}codigo')
+        
+        if despues_de is not None:
+            if not isinstance(despues_de, list) or len(despues_de) != 2:
+                raise ValueError("El cursor no corresponde al orden solicitado")
+            valor, codigo = despues_de
+            if campo == 'valor_orden':
+                try:
+                    valor = Decimal(valor)
+                except ArithmeticError:
+                    raise ValueError("El cursor no es válido")
+            productos_model = productos_model.filter(
+                Q(**{f'{campo}__{mayor}': valor}) | Q(**{campo: valor, f'codigo__{mayor}': codigo})
+            )
+        return productos_model.order_by(f'{signo}{campo}', f'{signo}codigo')
+    
+    def _listar_tuplas(self, productos_model, precios_model, proyeccion: Optional[ProyeccionProductos] = None) -> List[Producto]:
+        """
+        Hidratación para lecturas: lee tuplas con values_list, agrupa los
+        precios por producto en una sola pasada y construye las entidades
+        sin instanciar modelos. `precios_model` debe cubrir a `productos_model`.
+        Con `proyeccion` las columnas no pedidas se leen como NULL y los
+        precios solo se consultan si se piden.
+        """
+        columnas = _CAMPOS
+        if proyeccion is not None and not proyeccion.completa:
+            pedidas = {_COLUMNAS[campo] for campo in proyeccion.campos}
+            columnas = [
+                columna if columna in pedidas else Value(None, output_field=CharField())
+                for columna in _CAMPOS
+            ]
+        
+        if proyeccion is not None and not proyeccion.incluir_precios:
+            filas = list(productos_model.values_list(*columnas))
+            precios = {}
+        elif self._precios_denormalizados:
+            filas = list(productos_model.values_list(*columnas, 'precios_compactos'))
+            # Productos sin copia (escritos por fuera del repositorio): se leen de la tabla
+            sin_copia = [fila[0] for fila in filas if fila[5] is None]
+            precios = self._agrupar_precios(precios_model.filter(producto_id__in=sin_copia)) if sin_copia else {}
+            for fila in filas:
+                if fila[5] is not None:
+                    precios[fila[0]] = {_MONEDAS[moneda]: Decimal(valor) for moneda, valor in fila[5]}
+        else:
+            filas = list(productos_model.values_list(*columnas))
+            if not filas:
+                return []
+            precios = self._agrupar_precios(precios_model)
+        
+        return [
+            Producto.from_persistence(
+                codigo=fila[0],
+                nombre=fila[1],
+                empresa_nit=fila[4],
+                caracteristicas=fila[2],
+                descripcion=fila[3],
+                valores=precios.get(fila[0])
+            )
+            for fila in filas
+        ]
+    
+    def _agrupar_precios(self, precios_model) -> Dict[str, Dict[Moneda, Decimal]]:
+        precios = defaultdict(dict)
+        for producto_id, moneda, valor in precios_model.order_by('id').values_list('producto_id', 'moneda', 'valor'):
+            precios[producto_id][_MONEDAS[moneda]] = valor
+        return precios
+    
+    def _productos(self, proyeccion: Optional[ProyeccionProductos] = None, adicionales: Iterable[str] = ()):
+        if proyeccion is None or proyeccion.completa:
+            if self._precios_denormalizados:
+                return ProductoModel.objects.all()
+            return ProductoModel.objects.defer('precios_compactos').prefetch_related('precios')
+        
+        # Solo las columnas pedidas y, si no se piden precios, sin la precarga
+        columnas = [_COLUMNAS[campo] for campo in proyeccion.campos] + list(adicionales)
+        if proyeccion.incluir_precios and self._precios_denormalizados:
+            columnas.append('precios_compactos')
+        productos_model = ProductoModel.objects.only(*columnas)
+        if proyeccion.incluir_precios and not self._precios_denormalizados:
+            productos_model = productos_model.prefetch_related('precios')
+        return productos_model
+    
+    def _iterar(self, productos_model, tamano_lote: int, proyeccion: Optional[ProyeccionProductos] = None) -> Iterator[Producto]:
+        # iterator() lee con un cursor del lado del servidor (en PostgreSQL) y,
+        # al indicar chunk_size, precarga los precios de cada bloque de filas
+        productos_model = productos_model.order_by('codigo')
+        for producto_model in productos_model.iterator(chunk_size=tamano_lote):
+            yield self._to_domain_entity(producto_model, proyeccion)
+    
+    def _insertar(self, producto: Producto) -> None:
+        ProductoModel.objects.create(
+            codigo=producto.codigo,
+            nombre=producto.nombre,
+            caracteristicas=producto.caracteristicas,
+            descripcion=producto.descripcion,
+            empresa_id=producto.empresa_nit,
+            precios_compactos=compactar(self._valores(producto).items()),
+        )
+        if producto.precios:
+            ProductoPrecioModel.objects.bulk_create([
+                ProductoPrecioModel(
+                    producto_id=producto.codigo,
+                    moneda=precio.moneda.value,
+                    valor=precio.valor,
+                )
+                for precio in producto.precios
+            ])
+    
+    def _guardar_lote(self, productos: List[Producto], cambios: CambiosResumen) -> Set[str]:
+        """
+        Escribe un lote de productos con un número fijo de sentencias:
+        bloqueo y lectura de la empresa actual, inserción de los productos
+        nuevos, upsert de los existentes, lectura de precios actuales, borrado
+        de las monedas retiradas y upsert de los precios nuevos o modificados.
+        Registra en `cambios` lo que afecta al resumen y devuelve las empresas
+        a las que pertenecían los productos existentes.
+        """
+        codigos = [producto.codigo for producto in productos]
+        empresas_antes = self._bloquear(codigos)
+        
+        # Los nuevos con INSERT sin ON CONFLICT: si otra transacción acaba de crear
+        # alguno, falla y se vuelve a leer bloqueado (ya no cuenta como nuevo)
+        nuevos = [producto for producto in productos if producto.codigo not in empresas_antes]
+        if nuevos:
+            try:
+                with transaction.atomic():
+                    ProductoModel.objects.bulk_create([self._modelo(producto) for producto in nuevos])
+            except IntegrityError:
+                empresas_antes = self._bloquear(codigos)
+                nuevos = [producto for producto in productos if producto.codigo not in empresas_antes]
+                ProductoModel.objects.bulk_create([self._modelo(producto) for producto in nuevos])
+        
+        existentes = [producto for producto in productos if producto.codigo in empresas_antes]
+        if existentes:
+            ProductoModel.objects.bulk_create(
+                [self._modelo(producto) for producto in existentes],
+                update_conflicts=True,
+                unique_fields=['codigo'],
+                update_fields=['nombre', 'caracteristicas', 'descripcion', 'empresa', 'precios_compactos'],
+            )
+        
+        actuales: Dict[Tuple[str, str], Tuple[int, Decimal]] = {}
+        valores_antes: Dict[str, Dict[str, Decimal]] = defaultdict(dict)
+        for precio_id, producto_id, moneda, valor in ProductoPrecioModel.objects.filter(
+            producto_id__in=codigos
+        ).values_list('id', 'producto_id', 'moneda', 'valor'):
+            actuales[(producto_id, moneda)] = (precio_id, valor)
+            valores_antes[producto_id][moneda] = valor
+        
+        precios_a_escribir = []
+        for producto in productos:
+            antes = None
+            if producto.codigo in empresas_antes:
+                antes = (empresas_antes[producto.codigo], valores_antes[producto.codigo])
+            cambios.reemplazar(antes, producto.empresa_nit, self._valores(producto))
+            
+            for precio in producto.precios:
+                actual = actuales.pop((producto.codigo, precio.moneda.value), None)
+                # Se compara con lo que guardaría la columna (2 decimales), no con el valor recibido
+                valor = precio.valor.quantize(_CENTAVOS, rounding=ROUND_HALF_UP)
+                if actual is None or actual[1] != valor:
+                    precios_a_escribir.append(ProductoPrecioModel(
+                        producto_id=producto.codigo,
+                        moneda=precio.moneda.value,
+                        valor=valor,
+                    ))
+        
+        # Lo que queda en actuales son monedas que el producto ya no tiene
+        if actuales:
+            ProductoPrecioModel.objects.filter(
+                id__in=[precio_id for precio_id, _ in actuales.values()]
+            ).delete()
+        
+        if precios_a_escribir:
+            ProductoPrecioModel.objects.bulk_create(
+                precios_a_escribir,
+                update_conflicts=True,
+                unique_fields=['producto', 'moneda'],
+                update_fields=['valor'],
+            )
+        
+        return set(empresas_antes.values())
+    
+    def _bloquear(self, codigos: List[str]) -> Dict[str, str]:
+        """
+        Bloquea hasta el final de la transacción los productos existentes de
+        `codigos` y devuelve su empresa. Una escritura concurrente del mismo
+        producto espera aquí, así que el estado anterior (empresa y precios)
+        que se descuenta del resumen es siempre el vigente.
+        """
+        return dict(
+            ProductoModel.objects.select_for_update()
+            .filter(codigo__in=codigos)
+            .order_by('codigo')
+            .values_list('codigo', 'empresa_id')
+        )
+    
+    def _modelo(self, producto: Producto) -> ProductoModel:
+        return ProductoModel(
+            codigo=producto.codigo,
+            nombre=producto.nombre,
+            caracteristicas=producto.caracteristicas,
+            descripcion=producto.descripcion,
+            empresa_id=producto.empresa_nit,
+            precios_compactos=compactar(self._valores(producto).items()),
+        )
+    
+    def _valores(self, producto: Producto) -> Dict[str, Decimal]:
+        return {moneda.value: valor for moneda, valor in producto.valores.items()}
+    
+    def _a_entidad_guardada(self, producto: Producto) -> Producto:
+        # Refleja el redondeo de la columna decimal sin volver a leer la BD;
+        # la entidad recibida ya pasó las validaciones
+        valores = {
+            moneda: valor.quantize(_CENTAVOS, rounding=ROUND_HALF_UP)
+            for moneda, valor in producto.valores.items()
+        }
+        
+        return Producto.from_persistence(
+            codigo=producto.codigo,
+            nombre=producto.nombre,
+            empresa_nit=producto.empresa_nit,
+            caracteristicas=producto.caracteristicas,
+            descripcion=producto.descripcion,
+            valores=valores
+        )
+    
+    def _to_domain_entity(self, producto_model: ProductoModel, proyeccion: Optional[ProyeccionProductos] = None) -> Producto:
+        if proyeccion is not None and not proyeccion.completa:
+            return self._entidad_proyectada(producto_model, proyeccion)
         
-        return Producto(
+        return Producto.from_persistence(
             codigo=producto_model.codigo,
             nombre=producto_model.nombre,
             empresa_nit=producto_model.empresa_id,
             caracteristicas=producto_model.caracteristicas,
             descripcion=producto_model.descripcion or "",
-            precios=precios
+            valores=self._valores_modelo(producto_model)
         )
-
+    
+    def _entidad_proyectada(self, producto_model: ProductoModel, proyeccion: ProyeccionProductos) -> Producto:
+        # Solo se leen los atributos cargados: uno diferido haría una consulta por fila
+        datos = dict.fromkeys(ProyeccionProductos.CAMPOS)
+        for campo in proyeccion.campos:
+            datos[campo] = getattr(producto_model, _COLUMNAS[campo])
+        if 'descripcion' in proyeccion.campos:
+            datos['descripcion'] = datos['descripcion'] or ""
+        
+        valores = self._valores_modelo(producto_model) if proyeccion.incluir_precios else None
+        return Producto.from_persistence(valores=valores, **datos)
+    
+    def _valores_modelo(self, producto_model: ProductoModel) -> Dict[Moneda, Decimal]:
+        valores = {}
+        if self._precios_denormalizados and producto_model.precios_compactos is not None:
+            for moneda, valor in producto_model.precios_compactos:
+                valores[_MONEDAS[moneda]] = Decimal(valor)
+        else:
+            for precio_model in producto_model.precios.all():
+                valores[_MONEDAS[precio_model.moneda]] = precio_model.valor
+        return valores
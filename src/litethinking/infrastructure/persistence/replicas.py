@@ -0,0 +1,123 @@
+"""
+Enrutamiento de lecturas a una réplica de solo lectura.
+
+Si settings.DATABASES define el alias "replica", las lecturas van a la
+réplica y las escrituras a "default". Para que cada usuario vea sus propias
+escrituras a pesar del retraso de replicación:
+
+- Dentro de una petición, después de la primera escritura (o en cualquier
+  petición con método no seguro) todas las lecturas van a la primaria.
+- Las lecturas dentro de una transacción de la primaria nunca van a la réplica.
+- Tras una petición que escribió, ReplicaMiddleware fija las lecturas de ese
+  cliente a la primaria durante REPLICA_FIJAR_SEGUNDOS. El cliente se
+  identifica por el usuario de su access token (una entrada en la caché
+  REPLICA_FIJAR_CACHE_BACKEND), porque el frontend llama a la API desde otro
+  origen y el navegador no envía cookies SameSite=Lax en esas peticiones. Sin
+  token (la API navegable con sesión) se usa la cookie lt_primaria.
+"""
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+ALIAS_REPLICA = 'replica'
+COOKIE_FIJAR_PRIMARIA = 'lt_primaria'
+
+_PREFIJO = "litethinking:primaria"
+
+# Solo lee y valida el token (firma y vencimiento), sin consultar la base de datos
+_autenticacion_jwt = JWTAuthentication()
+
+_leer_de_primaria: ContextVar[bool] = ContextVar('leer_de_primaria', default=False)
+_hubo_escritura: ContextVar[bool] = ContextVar('hubo_escritura', default=False)
+
+
+def replica_configurada() -> bool:
+    return ALIAS_REPLICA in settings.DATABASES
+
+
+def _usuario_token(request) -> Optional[str]:
+    encabezado = _autenticacion_jwt.get_header(request)
+    token_crudo = _autenticacion_jwt.get_raw_token(encabezado) if encabezado else None
+    if token_crudo is None:
+        return None
+    try:
+        token = _autenticacion_jwt.get_validated_token(token_crudo)
+    except (InvalidToken, TokenError):
+        return None
+    usuario_id = token.get(api_settings.USER_ID_CLAIM)
+    return None if usuario_id is None else str(usuario_id)
+
+
+def _clave_fijada(usuario_id: str) -> str:
+    return f"{_PREFIJO}:{usuario_id}"
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if not replica_configurada():
+            return None
+        if _leer_de_primaria.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return ALIAS_REPLICA
+    
+    def db_for_write(self, model, **hints):
+        # Lo que se lea después en esta petición debe ver esta escritura
+        _leer_de_primaria.set(True)
+        _hubo_escritura.set(True)
+        return DEFAULT_DB_ALIAS
+    
+    def allow_relation(self, obj1, obj2, **hints):
+        # Ambos alias contienen los mismos datos
+        return True
+    
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # La réplica recibe el esquema por replicación, nunca por migraciones
+        return db != ALIAS_REPLICA
+
+
+class ReplicaMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        usuario_id = _usuario_token(request) if replica_configurada() else None
+        # Los hilos del servidor se reutilizan: el estado se reinicia en cada petición
+        fijar = request.method not in ('GET', 'HEAD', 'OPTIONS') or self._fijado(request, usuario_id)
+        token_leer = _leer_de_primaria.set(fijar)
+        token_escritura = _hubo_escritura.set(False)
+        try:
+            response = self.get_response(request)
+            escribio = _hubo_escritura.get()
+        finally:
+            _leer_de_primaria.reset(token_leer)
+            _hubo_escritura.reset(token_escritura)
+        
+        if escribio and replica_configurada():
+            if usuario_id is not None:
+                caches[settings.REPLICA_FIJAR_CACHE_BACKEND].set(
+                    _clave_fijada(usuario_id), 1, settings.REPLICA_FIJAR_SEGUNDOS
+                )
+            else:
+                response.set_cookie(
+                    COOKIE_FIJAR_PRIMARIA,
+                    '1',
+                    max_age=settings.REPLICA_FIJAR_SEGUNDOS,
+                    httponly=True,
+                    samesite='Lax',
+                )
+        return response
+    
+    def _fijado(self, request, usuario_id: Optional[str]) -> bool:
+        if COOKIE_FIJAR_PRIMARIA in request.COOKIES:
+            return True
+        if usuario_id is None:
+            return False
+        return caches[settings.REPLICA_FIJAR_CACHE_BACKEND].get(_clave_fijada(usuario_id)) is not None
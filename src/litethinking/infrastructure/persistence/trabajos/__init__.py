@@ -0,0 +1,7 @@
+"""
+Persistencia de los trabajos de generación de PDF en segundo plano
+"""
+from .model import TrabajoPdfModel
+from .repository_impl import DjangoTrabajoPdfRepository
+
+__all__ = ['TrabajoPdfModel', 'DjangoTrabajoPdfRepository']
@@ -0,0 +1,54 @@
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+from ....domain.entities.trabajo_pdf import EstadoTrabajo
+
+
+class TrabajoPdfModel(models.Model):
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Vacío en los lotes, que usan `empresas`
+    empresa_nit = models.CharField("NIT", max_length=20, blank=True)
+    # Solo en los lotes de varias empresas: NIT de cada una, o lista vacía para todas
+    empresas = models.JSONField("Empresas del lote", null=True, blank=True)
+    estado = models.CharField(
+        "Estado",
+        max_length=20,
+        choices=[(estado.value, estado.value) for estado in EstadoTrabajo],
+        default=EstadoTrabajo.PENDIENTE.value,
+    )
+    email_destino = models.EmailField("Email destino", blank=True)
+    solicitado_por = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="trabajos_pdf",
+    )
+    creado = models.DateTimeField("Creado", auto_now_add=True)
+    iniciado = models.DateTimeField("Iniciado", null=True, blank=True)
+    terminado = models.DateTimeField("Terminado", null=True, blank=True)
+    # Quién lo tiene reclamado y cuántas veces se reclamó
+    trabajador = models.CharField("Trabajador", max_length=100, blank=True)
+    intentos = models.PositiveSmallIntegerField("Intentos", default=0)
+    total_productos = models.PositiveIntegerField("Total de productos", null=True, blank=True)
+    # Avance de un lote; `latido` evita que uno largo se dé por abandonado
+    procesados = models.PositiveIntegerField("Empresas procesadas", null=True, blank=True)
+    total_empresas = models.PositiveIntegerField("Total de empresas", null=True, blank=True)
+    latido = models.DateTimeField("Último avance", null=True, blank=True)
+    archivo = models.FileField("Archivo", upload_to="trabajos_pdf/", blank=True)
+    error = models.TextField("Error", blank=True)
+
+    class Meta:
+        db_table = "trabajo_pdf"
+        verbose_name = "Trabajo PDF"
+        verbose_name_plural = "Trabajos PDF"
+        indexes = [
+            # Cola: los pendientes (y los abandonados en proceso) por antigüedad
+            models.Index(fields=['estado', 'creado'], name='trabajo_pdf_estado_creado'),
+        ]
+
+    def __str__(self):
+        return f"{self.id} {self.empresa_nit or 'lote'}: {self.estado}"
@@ -0,0 +1,163 @@
+import os
+from datetime import datetime, timedelta
+from typing import BinaryIO, List, Optional
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import File
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ....domain.entities.trabajo_pdf import EstadoTrabajo, TrabajoPdf
+from ....domain.ports.trabajo_pdf_repository import TrabajoPdfRepository
+from .model import TrabajoPdfModel
+
+# Candidatos que se prueban por llamada cuando otros trabajadores ganan la carrera
+_CANDIDATOS = 10
+
+
+class DjangoTrabajoPdfRepository(TrabajoPdfRepository):
+
+    def __init__(self, vencimiento: Optional[timedelta] = None, max_intentos: Optional[int] = None):
+        configuracion = settings.TRABAJOS_PDF
+        # Tiempo sin terminar tras el cual un trabajo en proceso se da por abandonado
+        self._vencimiento = vencimiento or timedelta(seconds=configuracion['VENCIMIENTO'])
+        self._max_intentos = max_intentos or configuracion['MAX_INTENTOS']
+    
+    def crear(self, empresa_nit: str, email_destino: Optional[str] = None, solicitado_por: Optional[int] = None) -> TrabajoPdf:
+        trabajo_model = TrabajoPdfModel.objects.create(
+            empresa_nit=empresa_nit,
+            email_destino=email_destino or "",
+            solicitado_por_id=solicitado_por,
+        )
+        return self._to_domain_entity(trabajo_model)
+    
+    def crear_lote(self, empresa_nits: Optional[List[str]] = None, solicitado_por: Optional[int] = None) -> TrabajoPdf:
+        trabajo_model = TrabajoPdfModel.objects.create(
+            empresas=list(empresa_nits or []),
+            solicitado_por_id=solicitado_por,
+        )
+        return self._to_domain_entity(trabajo_model)
+    
+    def obtener(self, trabajo_id: str) -> Optional[TrabajoPdf]:
+        try:
+            trabajo_model = TrabajoPdfModel.objects.filter(id=trabajo_id).first()
+        except ValidationError:
+            # No es un UUID
+            return None
+        return self._to_domain_entity(trabajo_model) if trabajo_model else None
+    
+    def reclamar_siguiente(self, trabajador: str) -> Optional[TrabajoPdf]:
+        ahora = timezone.now()
+        limite = ahora - self._vencimiento
+        # Un lote que sigue avanzando no está abandonado aunque lleve más tiempo
+        abandonados = (
+            Q(estado=EstadoTrabajo.EN_PROCESO.value, iniciado__lt=limite)
+            & (Q(latido__isnull=True) | Q(latido__lt=limite))
+        )
+        
+        # Los abandonados que ya agotaron sus intentos no se vuelven a tomar
+        TrabajoPdfModel.objects.filter(abandonados, intentos__gte=self._max_intentos).update(
+            estado=EstadoTrabajo.FALLIDO.value,
+            terminado=ahora,
+            error="El trabajo se interrumpió demasiadas veces",
+        )
+        
+        candidatos = (
+            TrabajoPdfModel.objects
+            .filter(Q(estado=EstadoTrabajo.PENDIENTE.value) | abandonados)
+            .order_by('creado')
+            .values_list('id', 'estado', 'intentos')[:_CANDIDATOS]
+        )
+        for trabajo_id, estado, intentos in candidatos:
+            # UPDATE condicionado al estado e intentos leídos: si otro trabajador
+            # lo tomó primero no coincide ninguna fila y se prueba el siguiente
+            reclamados = TrabajoPdfModel.objects.filter(id=trabajo_id, estado=estado, intentos=intentos).update(
+                estado=EstadoTrabajo.EN_PROCESO.value,
+                trabajador=trabajador,
+                iniciado=ahora,
+                intentos=F('intentos') + 1,
+            )
+            if reclamados:
+                return self.obtener(trabajo_id)
+        return None
+    
+    def avanzar(self, trabajo: TrabajoPdf, trabajador: str, procesados: int, total_empresas: int) -> bool:
+        return bool(self._reclamado(trabajo, trabajador).update(
+            procesados=procesados,
+            total_empresas=total_empresas,
+            latido=timezone.now(),
+        ))
+    
+    def completar(self, trabajo: TrabajoPdf, trabajador: str, archivo: BinaryIO, total_productos: int, error: str = "") -> bool:
+        reclamado = self._reclamado(trabajo, trabajador)
+        if not reclamado.exists():
+            return False
+        
+        extension = os.path.splitext(trabajo.nombre_archivo)[1]
+        campo = TrabajoPdfModel.archivo.field
+        nombre = campo.storage.save(campo.generate_filename(None, f"{trabajo.id}{extension}"), File(archivo))
+        actualizados = reclamado.update(
+            estado=EstadoTrabajo.COMPLETADO.value,
+            terminado=timezone.now(),
+            archivo=nombre,
+            total_productos=total_productos,
+            error=error,
+        )
+        if not actualizados:
+            campo.storage.delete(nombre)
+        return bool(actualizados)
+    
+    def fallar(self, trabajo: TrabajoPdf, trabajador: str, error: str) -> bool:
+        return bool(self._reclamado(trabajo, trabajador).update(
+            estado=EstadoTrabajo.FALLIDO.value,
+            terminado=timezone.now(),
+            error=error,
+        ))
+    
+    def abrir_pdf(self, trabajo_id: str) -> Optional[BinaryIO]:
+        try:
+            trabajo_model = TrabajoPdfModel.objects.filter(id=trabajo_id, estado=EstadoTrabajo.COMPLETADO.value).first()
+        except ValidationError:
+            return None
+        if trabajo_model is None or not trabajo_model.archivo:
+            return None
+        return trabajo_model.archivo.open('rb')
+    
+    def purgar(self, terminados_antes_de: datetime) -> int:
+        terminados = TrabajoPdfModel.objects.filter(
+            estado__in=[EstadoTrabajo.COMPLETADO.value, EstadoTrabajo.FALLIDO.value],
+            terminado__lt=terminados_antes_de,
+        )
+        storage = TrabajoPdfModel.archivo.field.storage
+        for nombre in terminados.exclude(archivo="").values_list('archivo', flat=True):
+            storage.delete(nombre)
+        eliminados, _ = terminados.delete()
+        return eliminados
+    
+    def _reclamado(self, trabajo: TrabajoPdf, trabajador: str):
+        # Sigue en proceso con el mismo reclamo que tomó este trabajador
+        return TrabajoPdfModel.objects.filter(
+            id=trabajo.id,
+            estado=EstadoTrabajo.EN_PROCESO.value,
+            trabajador=trabajador,
+            intentos=trabajo.intentos,
+        )
+    
+    def _to_domain_entity(self, trabajo_model: TrabajoPdfModel) -> TrabajoPdf:
+        return TrabajoPdf(
+            id=str(trabajo_model.id),
+            empresa_nit=trabajo_model.empresa_nit,
+            estado=EstadoTrabajo(trabajo_model.estado),
+            creado=trabajo_model.creado,
+            email_destino=trabajo_model.email_destino or None,
+            solicitado_por=trabajo_model.solicitado_por_id,
+            iniciado=trabajo_model.iniciado,
+            terminado=trabajo_model.terminado,
+            intentos=trabajo_model.intentos,
+            total_productos=trabajo_model.total_productos,
+            error=trabajo_model.error,
+            empresas=trabajo_model.empresas,
+            procesados=trabajo_model.procesados,
+            total_empresas=trabajo_model.total_empresas,
+        )
@@ -0,0 +1,6 @@
+"""
+Versión de los roles de cada usuario (claims del JWT)
+"""
+from .model import VersionRolesModel
+
+__all__ = ['VersionRolesModel']
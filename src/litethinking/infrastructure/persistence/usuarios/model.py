@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.db import models
+
+
+class VersionRolesModel(models.Model):
+
+    usuario = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='version_roles',
+        verbose_name="Usuario"
+    )
+    version = models.PositiveBigIntegerField("Versión", default=1)
+
+    class Meta:
+        db_table = "version_roles"
+        verbose_name = "Versión de Roles"
+        verbose_name_plural = "Versiones de Roles"
+
+    def __str__(self):
+        return f"{self.usuario_id}: v{self.version}"
@@ -0,0 +1,76 @@
+"""
+Roles de los usuarios para los claims del access token.
+
+Cada usuario con tokens emitidos tiene una versión de roles que se incrementa
+cuando cambian sus grupos, se desactiva o cambia su contraseña. El token
+lleva la versión con la que se emitió; al autenticar se compara con la
+vigente, que se lee de la caché (la base de datos solo cuando no está).
+Con una caché compartida el cambio se aplica en la siguiente petición; con
+la memoria de cada proceso, a más tardar en TTL segundos.
+"""
+from typing import Iterable, List, Optional
+
+from django.conf import settings
+from django.contrib.auth.models import Group
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+
+from .model import VersionRolesModel
+
+# Grupos que la API reconoce como roles, de mayor a menor prioridad
+ROLES = ('Admin', 'Externo')
+
+_PREFIJO = "litethinking:roles"
+
+
+def _cache():
+    return caches[settings.ROLES_JWT['BACKEND']]
+
+
+def _clave(usuario_id) -> str:
+    return f"{_PREFIJO}:{usuario_id}"
+
+
+def roles_de_usuario(usuario_id) -> List[str]:
+    nombres = set(Group.objects.filter(user__id=usuario_id, name__in=ROLES).values_list('name', flat=True))
+    return [rol for rol in ROLES if rol in nombres]
+
+
+def version_para_emitir(usuario_id) -> int:
+    """Versión vigente para un token nuevo; crea la fila la primera vez."""
+    version, _ = VersionRolesModel.objects.get_or_create(usuario_id=usuario_id)
+    return version.version
+
+
+def version_vigente(usuario_id) -> Optional[int]:
+    """Versión contra la que se validan los tokens, o None si el usuario ya no existe."""
+    cache = _cache()
+    clave = _clave(usuario_id)
+    version = cache.get(clave)
+    if version is None:
+        version = VersionRolesModel.objects.filter(usuario_id=usuario_id).values_list('version', flat=True).first()
+        if version is None:
+            return None
+        cache.set(clave, version, settings.ROLES_JWT['TTL'])
+    return version
+
+
+def incrementar(usuarios: Iterable) -> None:
+    """
+    Invalida los tokens emitidos a `usuarios`. Se llama dentro de la transacción
+    del cambio; la caché se limpia al confirmarla para no volver a guardar el
+    valor anterior con una lectura concurrente.
+    """
+    ids = sorted({usuario_id for usuario_id in usuarios if usuario_id is not None})
+    if not ids:
+        return
+    
+    # Sin fila no hay tokens con claims que invalidar: se crea al emitir el primero
+    VersionRolesModel.objects.filter(usuario_id__in=ids).update(version=F('version') + 1)
+    olvidar(ids)
+
+
+def olvidar(usuarios: Iterable) -> None:
+    claves = [_clave(usuario_id) for usuario_id in usuarios]
+    transaction.on_commit(lambda: _cache().delete_many(claves))
@@ -0,0 +1,57 @@
+"""
+Cambios que invalidan los roles de los tokens ya emitidos. Se registran
+desde PersistenceConfig.ready().
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import roles
+
+User = get_user_model()
+
+# Campos del usuario que invalidan sus tokens al cambiar
+_CAMPOS_SENSIBLES = {'is_active', 'password'}
+
+
+@receiver(m2m_changed, sender=User.groups.through, dispatch_uid='roles_grupos_usuario')
+def grupos_cambiados(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        # user.groups.add/remove/clear
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            roles.incrementar([instance.pk])
+        return
+    
+    # group.user_set.add/remove/clear: pk_set son usuarios
+    if action in ('post_add', 'post_remove'):
+        roles.incrementar(pk_set)
+    elif action == 'pre_clear':
+        roles.incrementar(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Group, dispatch_uid='roles_grupo_guardado')
+def grupo_guardado(sender, instance, created, **kwargs):
+    # Un grupo renombrado puede dejar de ser (o pasar a ser) un rol
+    if not created:
+        roles.incrementar(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Group, dispatch_uid='roles_grupo_eliminado')
+def grupo_eliminado(sender, instance, **kwargs):
+    # El borrado en cascada de user_groups no envía m2m_changed
+    roles.incrementar(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=User, dispatch_uid='roles_usuario_guardado')
+def usuario_guardado(sender, instance, created, update_fields, **kwargs):
+    if created:
+        return
+    if update_fields is None or _CAMPOS_SENSIBLES & set(update_fields):
+        roles.incrementar([instance.pk])
+
+
+@receiver(post_delete, sender=User, dispatch_uid='roles_usuario_eliminado')
+def usuario_eliminado(sender, instance, **kwargs):
+    # La fila de versión se borra en cascada; falta la copia en caché
+    roles.olvidar([instance.pk])
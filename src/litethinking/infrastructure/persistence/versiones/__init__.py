@@ -0,0 +1,7 @@
+"""
+Persistencia de las versiones de los recursos de la API (ETag / Last-Modified)
+"""
+from .model import VersionRecursoModel
+from .repository_impl import DjangoVersionRepository
+
+__all__ = ['VersionRecursoModel', 'DjangoVersionRepository']
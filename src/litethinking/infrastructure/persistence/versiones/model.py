@@ -0,0 +1,21 @@
+from django.db import models
+
+
+class VersionRecursoModel(models.Model):
+
+    # Valor de AmbitoVersion y NIT de la empresa
+    ambito = models.CharField("Ámbito", max_length=20)
+    empresa_nit = models.CharField("NIT", max_length=20)
+    version = models.PositiveBigIntegerField("Versión", default=0)
+    modificado = models.DateTimeField("Modificado")
+
+    class Meta:
+        db_table = "version_recurso"
+        verbose_name = "Versión de Recurso"
+        verbose_name_plural = "Versiones de Recursos"
+        constraints = [
+            models.UniqueConstraint(fields=['ambito', 'empresa_nit'], name='uq_version_recurso'),
+        ]
+
+    def __str__(self):
+        return f"{self.ambito} {self.empresa_nit}: v{self.version}"
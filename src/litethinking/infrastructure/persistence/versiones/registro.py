@@ -0,0 +1,31 @@
+"""
+Registro de escrituras para los GET condicionales.
+
+Los repositorios de escritura llaman a incrementar() dentro de la misma
+transacción que la escritura. Solo hay filas por empresa: la versión de los
+listados globales se deriva de ellas al leer, así ninguna escritura bloquea
+una fila compartida por todas las empresas.
+"""
+from typing import Iterable
+
+from django.db.models import F
+from django.utils import timezone
+
+from ....domain.ports.version_repository import AmbitoVersion
+from .model import VersionRecursoModel
+
+
+def incrementar(ambito: AmbitoVersion, empresas: Iterable[str]) -> None:
+    nits = sorted({nit for nit in empresas if nit})
+    if not nits:
+        return
+    
+    ahora = timezone.now()
+    VersionRecursoModel.objects.bulk_create(
+        [VersionRecursoModel(ambito=ambito.value, empresa_nit=nit, modificado=ahora) for nit in nits],
+        ignore_conflicts=True,
+    )
+    VersionRecursoModel.objects.filter(ambito=ambito.value, empresa_nit__in=nits).update(
+        version=F('version') + 1,
+        modificado=ahora,
+    )
@@ -0,0 +1,21 @@
+from typing import Optional
+
+from django.db.models import Max, Sum
+
+from ....domain.ports.version_repository import AmbitoVersion, VersionRecurso, VersionRepository
+from .model import VersionRecursoModel
+
+
+class DjangoVersionRepository(VersionRepository):
+
+    def obtener(self, ambito: AmbitoVersion, empresa_nit: Optional[str] = None) -> Optional[VersionRecurso]:
+        versiones_model = VersionRecursoModel.objects.filter(ambito=ambito.value)
+        if empresa_nit is not None:
+            fila = versiones_model.filter(empresa_nit=empresa_nit).values_list('version', 'modificado').first()
+            return VersionRecurso(*fila) if fila else None
+        
+        # Las versiones solo crecen y las filas no se borran: la suma cambia con cada escritura
+        fila = versiones_model.aggregate(numero=Sum('version'), modificado=Max('modificado'))
+        if fila['numero'] is None:
+            return None
+        return VersionRecurso(fila['numero'], fila['modificado'])
@@ -0,0 +1,32 @@
+"""
+Reportes generados para los usuarios: PDF de inventario, lotes de PDF de
+varias empresas y su envío por correo
+"""
+from .correo import enviar_inventario_por_correo, enviar_pdf_por_correo
+from .inventario_pdf import (
+    VERSION_PLANTILLA,
+    ReportLabGeneradorPdf,
+    escribir_pdf_inventario_grande,
+    formatear_fecha,
+    generar_pdf_inventario,
+)
+from .lote import (
+    DirectorioDestinoLotePdf,
+    ProcesosRenderizadorLotePdf,
+    ZipDestinoLotePdf,
+    procesos_disponibles,
+)
+
+__all__ = [
+    'DirectorioDestinoLotePdf',
+    'ProcesosRenderizadorLotePdf',
+    'ReportLabGeneradorPdf',
+    'VERSION_PLANTILLA',
+    'enviar_inventario_por_correo',
+    'enviar_pdf_por_correo',
+    'escribir_pdf_inventario_grande',
+    'formatear_fecha',
+    'generar_pdf_inventario',
+    'procesos_disponibles',
+    'ZipDestinoLotePdf',
+]
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.utils import timezone
+
+from ...domain.entities.pdf_inventario import PdfInventario
+
+
+def enviar_pdf_por_correo(pdf_content: bytes, empresa_nit: str, empresa_nombre: str, email_destino: str, fecha_generacion: str):
+    """Envía el PDF del inventario por correo electrónico."""
+    try:
+        email_from = settings.DEFAULT_FROM_EMAIL
+        if not email_from or not email_from.strip():
+            raise ValueError(
+                "La configuración de email no está completa. "
+                "Por favor, configure EMAIL_HOST_USER o DEFAULT_FROM_EMAIL en las variables de entorno."
+            )
+        
+        if not settings.EMAIL_HOST_USER or not settings.EMAIL_HOST_USER.strip():
+            raise ValueError("EMAIL_HOST_USER no está configurado en las variables de entorno.")
+        
+        if not settings.EMAIL_HOST_PASSWORD:
+            raise ValueError("EMAIL_HOST_PASSWORD no está configurado en las variables de entorno.")
+        
+        filename = f'inventario_{empresa_nit}_{fecha_generacion}.pdf'
+        
+        email = EmailMessage(
+            subject=f'Inventario de Productos - {empresa_nombre}',
+            body=f'''
+Estimado/a,
+
+Adjunto encontrará el reporte de inventario de productos de la empresa {empresa_nombre}.
+
+Fecha de generación: {fecha_generacion}
+
+Este es un correo automático, por favor no responda.
+
+Saludos cordiales,
+Sistema LiteThinking
+            ''',
+            from_email=email_from,
+            to=[email_destino],
+        )
+        
+        email.attach(filename, pdf_content, 'application/pdf')
+        email.send()
+        
+    except Exception as e:
+        raise
+
+
+def enviar_inventario_por_correo(pdf: PdfInventario, email_destino: str):
+    fecha_generacion = timezone.localtime(pdf.generado).strftime('%Y%m%d_%H%M%S')
+    enviar_pdf_por_correo(pdf.leer(), pdf.empresa_nit, pdf.empresa_nombre, email_destino, fecha_generacion)
@@ -0,0 +1,307 @@
+import tempfile
+from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+
+from django.utils import timezone
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, LongTable, Table, TableStyle, Paragraph, Spacer
+
+from ...domain.entities.producto import Moneda
+from ...domain.ports.generador_pdf import GeneradorPdfInventario
+
+
+# Parte de la clave de la caché de PDF: cambiarla al modificar el diseño
+VERSION_PLANTILLA = "1"
+
+# Filas de cada tabla en el modo para inventarios grandes
+FILAS_POR_TABLA = 500
+
+# Archivos temporales de hasta este tamaño se mantienen en memoria
+_MAX_BYTES_EN_MEMORIA = 1024 * 1024
+
+_ANCHOS_COLUMNAS = [1.2 * inch, 2.5 * inch, 2.5 * inch, 1.8 * inch]
+
+_ENCABEZADO_TABLA = ['Código', 'Nombre', 'Características', 'Precios']
+
+_SEPARADORES = str.maketrans({',': '.', '.': ','})
+
+
+def formatear_fecha(fecha: datetime) -> str:
+    return timezone.localtime(fecha).strftime('%d/%m/%Y %H:%M:%S')
+
+
+class _Estilos:
+    """Estilos de párrafo y de tabla, y formato de los precios, de un PDF de inventario."""
+    
+    def __init__(self):
+        styles = getSampleStyleSheet()
+        self.titulo = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            textColor=colors.HexColor('#1a1a1a'),
+            spaceAfter=30,
+            alignment=1,  # Centrado
+        )
+        self.encabezado = ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=12,
+            textColor=colors.HexColor('#333333'),
+            spaceAfter=12,
+        )
+        self.normal = styles['Normal']
+        self.tabla = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a90e2')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('TOPPADDING', (0, 0), (-1, 0), 12),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')]),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 6),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 1), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+        ])
+    
+    def precio(self, precio) -> str:
+        
+        valor_formateado = f"{precio.valor:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+        return f"{precio.moneda.value}: {valor_formateado}"
+
+
+class _EstilosPrecalculados(_Estilos):
+    """
+    Mismo resultado que _Estilos, con el formato de cada moneda preparado de
+    antemano. Los estilos no cambian al dibujar, así que una sola instancia
+    se comparte entre todos los PDF del proceso (ver _estilos_del_proceso).
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._prefijos = {moneda: f"{moneda.value}: " for moneda in Moneda}
+    
+    def precio(self, precio) -> str:
+        
+        # Intercambia los separadores: 1,234.50 -> 1.234,50
+        return self._prefijos[precio.moneda] + f"{precio.valor:,.2f}".translate(_SEPARADORES)
+
+
+@lru_cache(maxsize=None)
+def _estilos_del_proceso() -> _EstilosPrecalculados:
+    return _EstilosPrecalculados()
+
+
+def _encabezado(
+    empresa,
+    fecha_generacion_formateada: str,
+    datos_al_formateado: Optional[str],
+    estilos: _Estilos
+) -> list:
+    normal_style = estilos.normal
+    elements = [
+        Paragraph("Vista de Inventario", estilos.titulo),
+        Spacer(1, 0.2 * inch),
+        Paragraph(f"<b>Empresa:</b> {empresa.nombre}", estilos.encabezado),
+        Paragraph(f"<b>NIT:</b> {empresa.nit}", normal_style),
+        Paragraph(f"<b>Dirección:</b> {empresa.direccion}", normal_style),
+        Paragraph(f"<b>Teléfono:</b> {empresa.telefono}", normal_style),
+    ]
+    if datos_al_formateado:
+        elements.append(Paragraph(f"<b>Datos al:</b> {datos_al_formateado}", normal_style))
+    elements.append(Paragraph(
+        f"<b>Fecha de generación:</b> {fecha_generacion_formateada}",
+        normal_style
+    ))
+    elements.append(Spacer(1, 0.3 * inch))
+    return elements
+
+
+def _fila(producto, estilos: _Estilos) -> list:
+    if producto.precios:
+        precios_str = "<br/>".join(estilos.precio(precio) for precio in producto.precios)
+    else:
+        precios_str = "Sin precios"
+    
+    caracteristicas = producto.caracteristicas or "N/A"
+    if len(caracteristicas) > 50:
+        caracteristicas = caracteristicas[:47] + "..."
+    
+    return [
+        producto.codigo,
+        producto.nombre,
+        caracteristicas,
+        Paragraph(precios_str, estilos.normal)
+    ]
+
+
+def _pie(total_productos: int, estilos: _Estilos) -> list:
+    normal_style = estilos.normal
+    if not total_productos:
+        return [Paragraph(
+            "<i>No hay productos registrados para esta empresa.</i>",
+            normal_style
+        )]
+    return [
+        Spacer(1, 0.2 * inch),
+        Paragraph(f"<b>Total de productos:</b> {total_productos}", normal_style),
+    ]
+
+
+def generar_pdf_inventario(
+    empresa,
+    productos,
+    fecha_generacion_formateada: str,
+    datos_al_formateado: Optional[str] = None,
+    estilos: Optional[_Estilos] = None
+) -> bytes:
+
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    estilos = estilos or _Estilos()
+    elements = _encabezado(empresa, fecha_generacion_formateada, datos_al_formateado, estilos)
+    
+    if productos:
+        data = [_ENCABEZADO_TABLA] + [_fila(producto, estilos) for producto in productos]
+        table = Table(data, colWidths=_ANCHOS_COLUMNAS)
+        table.setStyle(estilos.tabla)
+        elements.append(table)
+    elements.extend(_pie(len(productos), estilos))
+    
+    doc.build(elements)
+    
+    pdf = buffer.getvalue()
+    buffer.close()
+    
+    return pdf
+
+
+class _ElementosPorDemanda(list):
+    """
+    Lista de elementos para SimpleDocTemplate.build que se rellena desde un
+    iterador. ReportLab consume la lista por el frente y consulta len() antes
+    de tomar cada elemento, así que basta con reponer ahí: solo quedan en
+    memoria los pocos elementos que aún no se dibujaron.
+    """
+    
+    def __init__(self, elementos: Iterator, reserva: int = 2):
+        super().__init__()
+        self._elementos = elementos
+        self._reserva = reserva
+    
+    def __len__(self) -> int:
+        
+        while self._elementos is not None and list.__len__(self) < self._reserva:
+            elemento = next(self._elementos, None)
+            if elemento is None:
+                self._elementos = None
+            else:
+                self.append(elemento)
+        return list.__len__(self)
+
+
+def escribir_pdf_inventario_grande(
+    destino: BinaryIO,
+    empresa,
+    productos: Iterable,
+    fecha_generacion_formateada: str,
+    datos_al_formateado: Optional[str] = None,
+    filas_por_tabla: int = FILAS_POR_TABLA,
+    estilos: Optional[_Estilos] = None
+) -> int:
+    """
+    Escribe el PDF en `destino` recorriendo `productos` una sola vez y
+    devuelve cuántos se incluyeron. En lugar de una tabla con todas las filas
+    (partirla en páginas cuesta más cuanto más larga es) se dibuja una
+    LongTable cada `filas_por_tabla` productos, con el encabezado repetido en
+    cada página; las filas de cada tabla se arman justo antes de dibujarla.
+    """
+    doc = SimpleDocTemplate(destino, pagesize=A4)
+    estilos = estilos or _Estilos()
+    total = 0
+    
+    def tabla(filas: List[list]) -> LongTable:
+        table = LongTable([_ENCABEZADO_TABLA] + filas, colWidths=_ANCHOS_COLUMNAS, repeatRows=1)
+        table.setStyle(estilos.tabla)
+        return table
+    
+    def elementos():
+        nonlocal total
+        yield from _encabezado(empresa, fecha_generacion_formateada, datos_al_formateado, estilos)
+        filas = []
+        for producto in productos:
+            filas.append(_fila(producto, estilos))
+            total += 1
+            if len(filas) == filas_por_tabla:
+                yield tabla(filas)
+                filas = []
+        if filas:
+            yield tabla(filas)
+        yield from _pie(total, estilos)
+    
+    doc.build(_ElementosPorDemanda(elementos()))
+    return total
+
+
+class ReportLabGeneradorPdf(GeneradorPdfInventario):
+    """
+    PDF de inventario con ReportLab. El modo para inventarios grandes escribe
+    a un archivo temporal que se borra al cerrarlo (p. ej. al terminar de
+    enviarlo con FileResponse). Con `estilos_precalculados` la hoja de
+    estilos, los estilos de tabla y el formato de cada moneda se crean una
+    vez por proceso en lugar de en cada PDF; el resultado es el mismo.
+    """
+    
+    def __init__(self, filas_por_tabla: int = FILAS_POR_TABLA, estilos_precalculados: bool = False):
+        self._filas_por_tabla = filas_por_tabla
+        self._estilos_precalculados = estilos_precalculados
+    
+    @property
+    def plantilla(self) -> str:
+        return VERSION_PLANTILLA
+    
+    def generar(self, empresa, productos, generado: datetime, datos_al: Optional[datetime] = None) -> BinaryIO:
+        return BytesIO(generar_pdf_inventario(
+            empresa,
+            productos,
+            formatear_fecha(generado),
+            formatear_fecha(datos_al) if datos_al else None,
+            self._estilos(),
+        ))
+    
+    def generar_grande(
+        self,
+        empresa,
+        productos: Iterator,
+        generado: datetime,
+        datos_al: Optional[datetime] = None
+    ) -> Tuple[BinaryIO, int]:
+        archivo = tempfile.SpooledTemporaryFile(max_size=_MAX_BYTES_EN_MEMORIA, suffix='.pdf')
+        try:
+            total = escribir_pdf_inventario_grande(
+                archivo,
+                empresa,
+                productos,
+                formatear_fecha(generado),
+                formatear_fecha(datos_al) if datos_al else None,
+                self._filas_por_tabla,
+                self._estilos(),
+            )
+        except BaseException:
+            archivo.close()
+            raise
+        archivo.seek(0)
+        return archivo, total
+    
+    def _estilos(self) -> _Estilos:
+        
+        return _estilos_del_proceso() if self._estilos_precalculados else _Estilos()
@@ -0,0 +1,129 @@
+"""
+PDF de inventario de varias empresas en varios procesos: cada proceso
+dibuja PDF completos, así que no compiten por el GIL.
+"""
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+
+from ...domain.entities.empresa import Empresa
+from ...domain.entities.lote_pdf import ResultadoPdfEmpresa
+from ...domain.entities.producto import Producto
+from ...domain.ports.lote_pdf import DestinoLotePdf, RenderizadorLotePdf
+from .inventario_pdf import FILAS_POR_TABLA, ReportLabGeneradorPdf
+
+# Inventarios enviados por proceso que aún no terminan
+_EN_ESPERA_POR_PROCESO = 2
+
+# Generador de cada proceso del lote (ver _iniciar_proceso)
+_generador: Optional[ReportLabGeneradorPdf] = None
+_umbral_grande = 0
+
+
+def procesos_disponibles() -> int:
+    """Núcleos que puede usar este proceso (en un contenedor pueden ser menos que los del equipo)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _iniciar_proceso(filas_por_tabla: int, estilos_precalculados: bool, umbral_grande: int) -> None:
+    global _generador, _umbral_grande
+    _generador = ReportLabGeneradorPdf(filas_por_tabla, estilos_precalculados)
+    _umbral_grande = umbral_grande
+
+
+def _renderizar(empresa: Empresa, productos: List[Producto], generado: datetime) -> ResultadoPdfEmpresa:
+    try:
+        if _umbral_grande and len(productos) >= _umbral_grande:
+            archivo, total_productos = _generador.generar_grande(empresa, iter(productos), generado)
+        else:
+            archivo, total_productos = _generador.generar(empresa, productos, generado), len(productos)
+        with archivo:
+            contenido = archivo.read()
+    except Exception as e:
+        return ResultadoPdfEmpresa(empresa.nit, empresa.nombre, error=f"Error al generar el PDF: {e}")
+    return ResultadoPdfEmpresa(empresa.nit, empresa.nombre, total_productos, contenido)
+
+
+class ProcesosRenderizadorLotePdf(RenderizadorLotePdf):
+    """
+    Reparte los PDF entre `procesos` procesos (0: uno por núcleo disponible).
+    Los procesos se inician con "spawn": no heredan las conexiones a la BD
+    ni los hilos de quien los crea. Cada proceso tiene como mucho dos
+    inventarios en espera, para no reunir el lote completo en memoria.
+    Con un solo proceso los PDF se dibujan aquí mismo, uno tras otro.
+    """
+    
+    def __init__(
+        self,
+        procesos: int = 0,
+        filas_por_tabla: int = FILAS_POR_TABLA,
+        estilos_precalculados: bool = False,
+        umbral_grande: int = 0
+    ):
+        self.procesos = procesos or procesos_disponibles()
+        self._configuracion = (filas_por_tabla, estilos_precalculados, umbral_grande)
+    
+    def renderizar(
+        self,
+        inventarios: Iterable[Tuple[Empresa, List[Producto]]],
+        generado: datetime
+    ) -> Iterator[ResultadoPdfEmpresa]:
+        if self.procesos == 1:
+            _iniciar_proceso(*self._configuracion)
+            for empresa, productos in inventarios:
+                yield _renderizar(empresa, productos, generado)
+            return
+        
+        with ProcessPoolExecutor(
+            max_workers=self.procesos,
+            mp_context=get_context('spawn'),
+            initializer=_iniciar_proceso,
+            initargs=self._configuracion,
+        ) as ejecutor:
+            pendientes = set()
+            for empresa, productos in inventarios:
+                pendientes.add(ejecutor.submit(_renderizar, empresa, productos, generado))
+                if len(pendientes) >= self.procesos * _EN_ESPERA_POR_PROCESO:
+                    terminados, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+                    for futuro in terminados:
+                        yield futuro.result()
+            while pendientes:
+                terminados, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+                for futuro in terminados:
+                    yield futuro.result()
+
+
+class ZipDestinoLotePdf(DestinoLotePdf):
+    """
+    Un ZIP con un PDF por empresa, escrito en `archivo`. Los PDF se guardan
+    sin volver a comprimir: su contenido ya está comprimido.
+    """
+    
+    def __init__(self, archivo: BinaryIO):
+        self._archivo = archivo
+        self._zip = zipfile.ZipFile(archivo, 'w', compression=zipfile.ZIP_STORED)
+    
+    def agregar(self, nombre_archivo: str, contenido: bytes) -> None:
+        self._zip.writestr(nombre_archivo, contenido)
+    
+    def cerrar(self) -> Optional[BinaryIO]:
+        self._zip.close()
+        self._archivo.seek(0)
+        return self._archivo
+
+
+class DirectorioDestinoLotePdf(DestinoLotePdf):
+
+    def __init__(self, directorio: str):
+        self._directorio = Path(directorio)
+        self._directorio.mkdir(parents=True, exist_ok=True)
+    
+    def agregar(self, nombre_archivo: str, contenido: bytes) -> None:
+        (self._directorio / nombre_archivo).write_bytes(contenido)
@@ -0,0 +1,142 @@
+"""
+Instancias compartidas de los repositorios que usan las vistas.
+Todas las vistas deben usar las mismas instancias para que la caché de
+lectura se invalide sin importar por qué endpoint llegue la escritura.
+"""
+import hashlib
+from functools import lru_cache
+from typing import Optional
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from ..domain.ports.cache_pdf import CachePdfInventario
+from ..domain.ports.cache_respuestas import CacheRespuestas
+from ..domain.ports.empresa_repository import EmpresaRepository
+from ..domain.ports.generador_pdf import GeneradorPdfInventario
+from ..domain.ports.lote_pdf import RenderizadorLotePdf
+from ..domain.ports.producto_repository import ProductoRepository
+from ..domain.ports.resumen_inventario_repository import ResumenInventarioRepository
+from ..domain.ports.trabajo_pdf_repository import TrabajoPdfRepository
+from ..domain.ports.version_repository import VersionRepository
+from .cache.empresa_repository import CacheEmpresaRepository
+from .cache.lectura import CacheLectura
+from .cache.pdf import ArchivosCachePdf, DjangoCachePdf
+from .cache.producto_repository import CacheProductoRepository
+from .cache.respuestas import DjangoCacheRespuestas
+from .persistence.empresa.repository_impl import DjangoEmpresaRepository
+from .persistence.inventario.repository_impl import DjangoResumenInventarioRepository
+from .persistence.producto.repository_impl import DjangoProductoRepository
+from .persistence.trabajos.repository_impl import DjangoTrabajoPdfRepository
+from .persistence.versiones.repository_impl import DjangoVersionRepository
+from .reportes.inventario_pdf import ReportLabGeneradorPdf
+from .reportes.lote import ProcesosRenderizadorLotePdf
+
+
+def _crear_cache(prefijo: str) -> CacheLectura:
+    configuracion = settings.REPOSITORIO_CACHE
+    return CacheLectura(
+        prefijo=prefijo,
+        max_entradas=configuracion['MAX_ENTRADAS'],
+        ttl=configuracion['TTL'],
+        backend=configuracion['BACKEND'] or None,
+    )
+
+
+@lru_cache(maxsize=None)
+def obtener_empresa_repository() -> EmpresaRepository:
+    repositorio = DjangoEmpresaRepository()
+    if settings.REPOSITORIO_CACHE['ACTIVA']:
+        return CacheEmpresaRepository(repositorio, _crear_cache('empresa'), obtener_version_repository())
+    return repositorio
+
+
+@lru_cache(maxsize=None)
+def obtener_empresa_repository_sin_cache() -> EmpresaRepository:
+    # Para lo que se guarda en otra caché compartida (p. ej. los PDF): siempre lee de la BD
+    return DjangoEmpresaRepository()
+
+
+@lru_cache(maxsize=None)
+def obtener_producto_repository() -> ProductoRepository:
+    repositorio = DjangoProductoRepository()
+    if settings.REPOSITORIO_CACHE['ACTIVA']:
+        return CacheProductoRepository(repositorio, _crear_cache('producto'), obtener_version_repository())
+    return repositorio
+
+
+@lru_cache(maxsize=None)
+def obtener_resumen_inventario_repository() -> ResumenInventarioRepository:
+    # Ya es una lectura por clave primaria: no pasa por la caché
+    return DjangoResumenInventarioRepository()
+
+
+@lru_cache(maxsize=None)
+def obtener_trabajo_pdf_repository() -> TrabajoPdfRepository:
+    # Cola compartida entre la API y los trabajadores: siempre se lee de la BD
+    return DjangoTrabajoPdfRepository()
+
+
+@lru_cache(maxsize=None)
+def obtener_version_repository() -> VersionRepository:
+    # Las versiones deciden si la caché del cliente sigue vigente: no se cachean aquí
+    return DjangoVersionRepository()
+
+
+@lru_cache(maxsize=None)
+def obtener_cache_respuestas() -> Optional[CacheRespuestas]:
+    configuracion = settings.RESPUESTAS_CACHE
+    if not configuracion['ACTIVA']:
+        return None
+    return DjangoCacheRespuestas(
+        backend=configuracion['BACKEND'],
+        ttl=configuracion['TTL'],
+        gracia=configuracion['GRACIA'],
+        espera=configuracion['ESPERA'],
+    )
+
+
+def _ambito_base_de_datos() -> str:
+    # Las versiones de dos BD (o de una recreada) pueden coincidir: sus cachés no se mezclan
+    bd = connections[DEFAULT_DB_ALIAS].settings_dict
+    datos = f"{bd['ENGINE']}|{bd.get('HOST') or ''}|{bd.get('PORT') or ''}|{bd['NAME']}"
+    return hashlib.sha256(datos.encode('utf-8')).hexdigest()[:16]
+
+
+@lru_cache(maxsize=None)
+def obtener_cache_pdf() -> Optional[CachePdfInventario]:
+    configuracion = settings.PDF_CACHE
+    if not configuracion['ACTIVA']:
+        return None
+    max_bytes = configuracion['MAX_MB'] * 1024 * 1024
+    if configuracion['TIPO'] == 'django':
+        return DjangoCachePdf(
+            backend=configuracion['BACKEND'],
+            ttl=configuracion['TTL'],
+            max_bytes_entrada=max_bytes,
+            ambito=_ambito_base_de_datos(),
+        )
+    if configuracion['TIPO'] != 'archivos':
+        raise ImproperlyConfigured("PDF_CACHE_TIPO debe ser 'archivos' o 'django'")
+    return ArchivosCachePdf(configuracion['DIRECTORIO'], max_bytes, _ambito_base_de_datos())
+
+
+@lru_cache(maxsize=None)
+def obtener_generador_pdf() -> GeneradorPdfInventario:
+    configuracion = settings.PDF_INVENTARIO
+    return ReportLabGeneradorPdf(
+        filas_por_tabla=configuracion['FILAS_POR_TABLA'],
+        estilos_precalculados=configuracion['ESTILOS_PRECALCULADOS'],
+    )
+
+
+def obtener_renderizador_lote_pdf(procesos: Optional[int] = None) -> RenderizadorLotePdf:
+    # Sin caché: `procesos` puede cambiar por ejecución (p. ej. el argumento de un comando)
+    configuracion = settings.PDF_INVENTARIO
+    return ProcesosRenderizadorLotePdf(
+        procesos=settings.LOTE_PDF['PROCESOS'] if procesos is None else procesos,
+        filas_por_tabla=configuracion['FILAS_POR_TABLA'],
+        estilos_precalculados=configuracion['ESTILOS_PRECALCULADOS'],
+        umbral_grande=configuracion['UMBRAL_GRANDE'],
+    )
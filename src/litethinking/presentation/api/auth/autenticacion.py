@@ -0,0 +1,28 @@
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from ....infrastructure.persistence.usuarios.roles import version_vigente
+from .tokens import CLAIM_ROLES, CLAIM_VERSION_ROLES, UsuarioToken
+
+
+class JWTRolesAuthentication(JWTStatelessUserAuthentication):
+    """
+    Autentica con el access token sin leer el usuario ni sus grupos de la base
+    de datos: los permisos usan los roles del claim `roles`. El claim `rv` debe
+    coincidir con la versión de roles vigente del usuario; si sus grupos
+    cambiaron después de emitir el token se responde 401 y el cliente lo
+    renueva con el refresh token, que vuelve a leer los roles.
+    """
+    
+    def get_user(self, validated_token):
+        usuario = super().get_user(validated_token)
+        if CLAIM_ROLES not in validated_token or CLAIM_VERSION_ROLES not in validated_token:
+            raise InvalidToken("El token no incluye los roles del usuario")
+        
+        if validated_token[CLAIM_VERSION_ROLES] != version_vigente(usuario.id):
+            raise AuthenticationFailed(
+                "Los roles del usuario cambiaron; renueve el token",
+                code='roles_desactualizados',
+            )
+        return UsuarioToken(validated_token)
@@ -1,5 +1,9 @@
 from rest_framework import serializers
-from django.contrib.auth.models import User
+from django.contrib.auth.models import User, update_last_login
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenObtainSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import CLAIM_ROLES, RefreshTokenConRoles
 
 
 class RegistroSerializer(serializers.ModelSerializer):
@@ -58,3 +62,32 @@ class RegistroSerializer(serializers.ModelSerializer):
         )
         return user
 
+
+class LoginSerializer(TokenObtainPairSerializer):
+    """
+    Emite el par de tokens y agrega `rol` a la respuesta con el usuario que
+    ya autenticó TokenObtainSerializer: la contraseña se verifica una sola vez
+    y el rol sale de los roles leídos para el access token.
+    """
+    token_class = RefreshTokenConRoles
+    
+    def validate(self, attrs):
+        data = TokenObtainSerializer.validate(self, attrs)
+        
+        refresh = self.get_token(self.user)
+        access = refresh.access_token
+        data['refresh'] = str(refresh)
+        data['access'] = str(access)
+        
+        # roles_de_usuario los devuelve en orden de prioridad
+        roles = access[CLAIM_ROLES]
+        data['rol'] = roles[0] if roles else None
+        
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, self.user)
+        
+        return data
+
+
+class RefreshConRolesSerializer(TokenRefreshSerializer):
+    token_class = RefreshTokenConRoles
@@ -0,0 +1,35 @@
+from functools import cached_property
+
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from ....infrastructure.persistence.usuarios.roles import roles_de_usuario, version_para_emitir
+
+CLAIM_ROLES = 'roles'
+CLAIM_VERSION_ROLES = 'rv'
+
+
+class RefreshTokenConRoles(RefreshToken):
+    """
+    Los access tokens derivados llevan los roles del usuario al momento de
+    emitirlos. No se guardan en el refresh token: al renovar se vuelven a leer.
+    """
+    
+    @property
+    def access_token(self) -> AccessToken:
+        access = super().access_token
+        usuario_id = self[api_settings.USER_ID_CLAIM]
+        # Primero la versión: si los grupos cambian entre ambas lecturas el
+        # token queda con la versión anterior y se rechaza, nunca al revés
+        access[CLAIM_VERSION_ROLES] = version_para_emitir(usuario_id)
+        access[CLAIM_ROLES] = roles_de_usuario(usuario_id)
+        return access
+
+
+class UsuarioToken(TokenUser):
+    """Usuario autenticado construido solo con los claims del access token."""
+    
+    @cached_property
+    def roles(self) -> frozenset:
+        return frozenset(self.token.get(CLAIM_ROLES, ()))
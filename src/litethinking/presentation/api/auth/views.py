@@ -4,30 +4,15 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from .serializer import RegistroSerializer
+from .serializer import LoginSerializer, RefreshConRolesSerializer, RegistroSerializer
 
 
 class LoginView(TokenObtainPairView):
-    def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
-        
-        if response.status_code == 200:
-            from django.contrib.auth import authenticate
-            username = request.data.get('username')
-            password = request.data.get('password')
-            user = authenticate(username=username, password=password)
-            
-            if user:
-                grupos = user.groups.all()
-                rol = grupos.first().name if grupos.exists() else None
-                
-                response.data['rol'] = rol
-        
-        return response
+    serializer_class = LoginSerializer
 
 
 class RefreshTokenView(TokenRefreshView):
-    pass
+    serializer_class = RefreshConRolesSerializer
 
 
 @api_view(['POST'])
@@ -0,0 +1,85 @@
+"""
+Caché del cuerpo ya codificado de las respuestas GET de la API.
+
+Solo se guardan respuestas 200 de los renderers JSON; la API navegable,
+las exportaciones en streaming y los errores siempre pasan por la vista.
+La clave incluye la ruta completa, el tipo de contenido negociado, el rol
+de quien consulta y el número de la versión con el que respuesta_condicional
+calcula el ETag. Esa versión se lee de la base de datos en cada petición, así
+que cualquier escritura (de otro proceso, de un comando o del admin) deja
+fuera las entradas anteriores aunque la caché sea la memoria de cada proceso.
+"""
+from functools import wraps
+from typing import Callable, List
+
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from ...infrastructure.cache.lectura import lectura_directa
+from ...infrastructure.repositorios import obtener_cache_respuestas
+from .permissions import rol_de
+
+
+def _codificar(request, respuesta: Response):
+    renderer = request.accepted_renderer
+    cuerpo = renderer.render(
+        respuesta.data,
+        request.accepted_media_type,
+        {'request': request, 'response': respuesta},
+    )
+    content_type = renderer.media_type
+    if renderer.charset:
+        content_type = f"{content_type}; charset={renderer.charset}"
+    return content_type, cuerpo
+
+
+def respuesta_en_cache(nombre: str, generaciones: Callable[..., List[str]]):
+    """
+    `generaciones(request, *args, **kwargs)` devuelve las generaciones de
+    caché de las que depende la respuesta (ver infrastructure.cache.respuestas).
+    Debe ir debajo de @respuesta_condicional: sin versión no se usa la caché.
+    """
+    def decorador(vista):
+
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            cache = obtener_cache_respuestas()
+            version = getattr(request, 'version_recurso', None)
+            if (
+                cache is None
+                or version is None
+                or request.method != 'GET'
+                or 'stream' in request.query_params
+                or not isinstance(request.accepted_renderer, JSONRenderer)
+            ):
+                return vista(request, *args, **kwargs)
+
+            clave = (
+                f"{nombre}|{version.numero}|{rol_de(request.user)}|"
+                f"{request.accepted_media_type}|{request.get_full_path()}"
+            )
+            sin_guardar = []
+
+            def construir():
+                # La entrada se comparte entre procesos y dura más que la caché de
+                # lectura de los repositorios: se arma con datos leídos de la BD
+                with lectura_directa():
+                    respuesta = vista(request, *args, **kwargs)
+                if not isinstance(respuesta, Response) or respuesta.status_code != 200:
+                    sin_guardar.append(respuesta)
+                    return None
+                return _codificar(request, respuesta)
+
+            guardada, estado = cache.obtener(clave, generaciones(request, *args, **kwargs), construir)
+            if guardada is None:
+                return sin_guardar[0]
+
+            content_type, cuerpo = guardada
+            respuesta = HttpResponse(cuerpo, content_type=content_type)
+            respuesta['X-Cache'] = estado
+            return respuesta
+
+        return envoltura
+
+    return decorador
@@ -0,0 +1,70 @@
+"""
+GET condicionales con ETag y Last-Modified calculados a partir de las
+versiones que mantienen los repositorios de escritura. Si el cliente ya
+tiene la versión vigente se responde 304 sin consultar los datos ni serializar.
+"""
+import zlib
+from functools import wraps
+from typing import Callable, Optional
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from ...application.use_cases.version_use_cases import ObtenerVersionUseCase
+from ...domain.ports.version_repository import AmbitoVersion, VersionRecurso
+from ...infrastructure.repositorios import obtener_version_repository
+
+version_repository = obtener_version_repository()
+
+
+def _etag(request, ambito: AmbitoVersion, version: VersionRecurso) -> str:
+    # La misma versión se representa distinto según el Accept (JSON o API navegable)
+    variante = zlib.crc32(request.META.get('HTTP_ACCEPT', '').encode('latin-1', 'replace'))
+    return f'"{ambito.value}-{version.numero}-{variante:08x}"'
+
+
+def _agregar_cabeceras(respuesta, etag: str, modificado: int) -> None:
+    respuesta['ETag'] = etag
+    respuesta['Last-Modified'] = http_date(modificado)
+    # El cliente puede guardar la respuesta, pero debe revalidarla en cada uso
+    patch_cache_control(respuesta, private=True, no_cache=True)
+    patch_vary_headers(respuesta, ['Accept'])
+
+
+def respuesta_condicional(ambito: AmbitoVersion, empresa: Optional[Callable[..., Optional[str]]] = None):
+    """
+    Agrega ETag / Last-Modified a las respuestas GET de la vista y responde
+    304 si coinciden con If-None-Match / If-Modified-Since.
+    `empresa(request, *args, **kwargs)` devuelve el NIT del que dependen los
+    datos; sin él se usa la versión de todas las empresas.
+    Debe ir debajo de @api_view y @permission_classes para que la autenticación
+    y los permisos también se verifiquen en las respuestas 304.
+    """
+    def decorador(vista):
+
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return vista(request, *args, **kwargs)
+
+            empresa_nit = empresa(request, *args, **kwargs) if empresa else None
+            version = ObtenerVersionUseCase(version_repository).ejecutar(ambito, empresa_nit)
+            if version is None:
+                return vista(request, *args, **kwargs)
+
+            # respuesta_en_cache arma la clave de la respuesta guardada con esta misma versión
+            request.version_recurso = version
+            etag = _etag(request, ambito, version)
+            modificado = int(version.modificado.timestamp())
+            respuesta = get_conditional_response(request, etag=etag, last_modified=modificado)
+            if respuesta is None:
+                respuesta = vista(request, *args, **kwargs)
+                if respuesta.status_code != 200:
+                    return respuesta
+
+            _agregar_cabeceras(respuesta, etag, modificado)
+            return respuesta
+
+        return envoltura
+
+    return decorador
@@ -11,10 +11,21 @@ class EmpresaSerializer(serializers.Serializer):
     telefono = serializers.CharField(max_length=30, required=True, allow_blank=False)
     
     def to_representation(self, instance: Empresa):
-        return {
-            'nit': instance.nit,
-            'nombre': instance.nombre,
-            'direccion': instance.direccion,
-            'telefono': instance.telefono,
-        }
+        return empresa_a_dict(instance)
 
+
+def empresa_a_dict(empresa: Empresa) -> dict:
+    # Conversión directa para las lecturas, sin pasar por el ListSerializer de DRF
+    return {
+        'nit': empresa.nit,
+        'nombre': empresa.nombre,
+        'direccion': empresa.direccion,
+        'telefono': empresa.telefono,
+    }
+
+
+COLUMNAS_CSV = ('nit', 'nombre', 'direccion', 'telefono')
+
+
+def empresa_a_fila(empresa: Empresa) -> list:
+    return [empresa.nit, empresa.nombre, empresa.direccion, empresa.telefono]
@@ -1,6 +1,6 @@
 from django.db.models import ProtectedError
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
@@ -8,23 +8,54 @@ from ....application.use_cases.empresa_use_cases import (
     ActualizarEmpresaUseCase,
     CrearEmpresaUseCase,
     EliminarEmpresaUseCase,
+    IterarEmpresasUseCase,
+    ListarEmpresasPaginadoUseCase,
     ListarEmpresasUseCase,
     ObtenerEmpresaUseCase,
 )
-from ....infrastructure.persistence.empresa.repository_impl import DjangoEmpresaRepository
+from ....domain.ports.version_repository import AmbitoVersion
+from ....infrastructure.cache.respuestas import GENERACION_EMPRESAS
+from ....infrastructure.repositorios import obtener_cache_respuestas, obtener_empresa_repository
+from ..cache_respuestas import respuesta_en_cache
+from ..condicional import respuesta_condicional
+from ..paginacion import leer_parametros_paginacion, respuesta_paginada, solicita_paginacion
 from ..permissions import IsAdminOrReadOnly, IsAdmin
-from .serializer import EmpresaSerializer
+from ..renderers import renderers_con_exportacion
+from ..streaming import formato_negociado, respuesta_streaming
+from .serializer import COLUMNAS_CSV, EmpresaSerializer, empresa_a_dict, empresa_a_fila
 
-empresa_repository = DjangoEmpresaRepository()
+empresa_repository = obtener_empresa_repository()
+cache_respuestas = obtener_cache_respuestas()
 
 @api_view(['GET', 'POST'])
+@renderer_classes(renderers_con_exportacion())
 @permission_classes([IsAuthenticated, IsAdminOrReadOnly])
+@respuesta_condicional(AmbitoVersion.EMPRESAS)
+@respuesta_en_cache('empresas', lambda request: [GENERACION_EMPRESAS])
 def empresas_list_create(request):
     if request.method == 'GET':
+        formato = formato_negociado(request)
+        if formato:
+            if solicita_paginacion(request):
+                return Response(
+                    {'error': 'Los formatos de exportación devuelven el listado completo: no admiten paginación'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            empresas = IterarEmpresasUseCase(empresa_repository).ejecutar()
+            return respuesta_streaming(formato, empresas, empresa_a_dict, COLUMNAS_CSV, empresa_a_fila)
+        
+        if solicita_paginacion(request):
+            try:
+                limite, despues_de = leer_parametros_paginacion(request)
+                use_case = ListarEmpresasPaginadoUseCase(empresa_repository)
+                pagina = use_case.ejecutar(limite=limite, despues_de=despues_de)
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            return respuesta_paginada(pagina, empresa_a_dict)
+        
         use_case = ListarEmpresasUseCase(empresa_repository)
         empresas = use_case.ejecutar()
-        serializer = EmpresaSerializer(empresas, many=True)
-        return Response(serializer.data)
+        return Response([empresa_a_dict(empresa) for empresa in empresas])
     
     elif request.method == 'POST':
         serializer = EmpresaSerializer(data=request.data)
@@ -32,7 +63,7 @@ def empresas_list_create(request):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            use_case = CrearEmpresaUseCase(empresa_repository)
+            use_case = CrearEmpresaUseCase(empresa_repository, cache_respuestas)
             empresa = use_case.ejecutar(
                 nit=serializer.validated_data['nit'],
                 nombre=serializer.validated_data['nombre'],
@@ -47,6 +78,7 @@ def empresas_list_create(request):
 
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated, IsAdminOrReadOnly])
+@respuesta_condicional(AmbitoVersion.EMPRESAS, empresa=lambda request, nit: nit)
 def empresa_detail(request, nit):
     if request.method == 'GET':
         use_case = ObtenerEmpresaUseCase(empresa_repository)
@@ -62,7 +94,7 @@ def empresa_detail(request, nit):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            use_case = ActualizarEmpresaUseCase(empresa_repository)
+            use_case = ActualizarEmpresaUseCase(empresa_repository, cache_respuestas)
             empresa = use_case.ejecutar(
                 nit=nit,
                 nombre=serializer.validated_data['nombre'],
@@ -76,7 +108,7 @@ def empresa_detail(request, nit):
     
     elif request.method == 'DELETE':
         try:
-            use_case = EliminarEmpresaUseCase(empresa_repository)
+            use_case = EliminarEmpresaUseCase(empresa_repository, cache_respuestas)
             eliminado = use_case.ejecutar(nit)
             if not eliminado:
                 return Response({'error': 'Empresa no encontrada'}, status=status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,47 @@
+from rest_framework import serializers
+
+from ....domain.entities.resumen_inventario import ResumenInventario
+from ....domain.entities.trabajo_pdf import EstadoTrabajo, TrabajoPdf
+
+
+class ResumenInventarioSerializer(serializers.Serializer):
+    
+    def to_representation(self, instance: ResumenInventario):
+        return {
+            'empresa_nit': instance.empresa_nit,
+            'total_productos': instance.total_productos,
+            'con_precio': instance.con_precio,
+            'sin_precio': instance.sin_precio,
+            'precios': {
+                moneda.value: {
+                    'cantidad': estadistica.cantidad,
+                    'minimo': str(estadistica.minimo) if estadistica.minimo is not None else None,
+                    'maximo': str(estadistica.maximo) if estadistica.maximo is not None else None,
+                    'promedio': str(estadistica.promedio),
+                }
+                for moneda, estadistica in sorted(instance.estadisticas.items())
+            },
+        }
+
+
+class TrabajoPdfSerializer(serializers.Serializer):
+    
+    def to_representation(self, instance: TrabajoPdf):
+        datos = {
+            'id': instance.id,
+            'empresa_nit': instance.empresa_nit or None,
+            'estado': instance.estado.value,
+            'creado': instance.creado.isoformat(),
+            'iniciado': instance.iniciado.isoformat() if instance.iniciado else None,
+            'terminado': instance.terminado.isoformat() if instance.terminado else None,
+            'email_destino': instance.email_destino,
+            'total_productos': instance.total_productos,
+            'error': instance.error or None,
+        }
+        if instance.es_lote:
+            datos['empresas'] = instance.empresas or None
+            datos['procesados'] = instance.procesados or 0
+            datos['total_empresas'] = instance.total_empresas
+        if instance.estado == EstadoTrabajo.COMPLETADO:
+            datos['descarga'] = self.context['url_descarga']
+        return datos
@@ -1,30 +1,48 @@
-from datetime import datetime
-from io import BytesIO
 import os
 import threading
 import re
 
 from django.conf import settings
-from django.core.mail import EmailMessage
-from django.http import HttpResponse
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from django.http import FileResponse
+from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from ....application.use_cases.empresa_use_cases import ObtenerEmpresaUseCase
 from ..permissions import IsAdmin
-from ....application.use_cases.producto_use_cases import ListarProductosUseCase
-from ....infrastructure.persistence.empresa.repository_impl import DjangoEmpresaRepository
-from ....infrastructure.persistence.producto.repository_impl import DjangoProductoRepository
-
-empresa_repository = DjangoEmpresaRepository()
-producto_repository = DjangoProductoRepository()
+from ....application.use_cases.inventario_use_cases import GenerarPdfInventarioUseCase, ObtenerResumenInventarioUseCase
+from ....application.use_cases.trabajo_pdf_use_cases import (
+    AbrirPdfTrabajoUseCase,
+    ObtenerTrabajoPdfUseCase,
+    SolicitarLotePdfUseCase,
+    SolicitarPdfInventarioUseCase,
+)
+from ....domain.entities.trabajo_pdf import EstadoTrabajo
+from ....domain.ports.version_repository import AmbitoVersion
+from ....infrastructure.reportes import enviar_inventario_por_correo, formatear_fecha
+from ....infrastructure.repositorios import (
+    obtener_cache_pdf,
+    obtener_empresa_repository,
+    obtener_empresa_repository_sin_cache,
+    obtener_generador_pdf,
+    obtener_producto_repository,
+    obtener_resumen_inventario_repository,
+    obtener_trabajo_pdf_repository,
+    obtener_version_repository,
+)
+from ..condicional import respuesta_condicional
+from .serializer import ResumenInventarioSerializer, TrabajoPdfSerializer
+
+empresa_repository = obtener_empresa_repository()
+empresa_repository_sin_cache = obtener_empresa_repository_sin_cache()
+producto_repository = obtener_producto_repository()
+resumen_inventario_repository = obtener_resumen_inventario_repository()
+trabajo_pdf_repository = obtener_trabajo_pdf_repository()
+version_repository = obtener_version_repository()
+cache_pdf = obtener_cache_pdf()
+generador_pdf = obtener_generador_pdf()
 
 
 def _validar_email(email: str) -> bool:
@@ -32,151 +50,42 @@ def _validar_email(email: str) -> bool:
     return re.match(pattern, email) is not None
 
 
-def _enviar_pdf_por_correo(pdf_content: bytes, empresa_nit: str, empresa_nombre: str, email_destino: str, fecha_generacion: str):
-    """Envía el PDF del inventario por correo electrónico."""
-    try:
-        email_from = settings.DEFAULT_FROM_EMAIL
-        if not email_from or not email_from.strip():
-            raise ValueError(
-                "La configuración de email no está completa. "
-                "Por favor, configure EMAIL_HOST_USER o DEFAULT_FROM_EMAIL en las variables de entorno."
-            )
-        
-        if not settings.EMAIL_HOST_USER or not settings.EMAIL_HOST_USER.strip():
-            raise ValueError("EMAIL_HOST_USER no está configurado en las variables de entorno.")
-        
-        if not settings.EMAIL_HOST_PASSWORD:
-            raise ValueError("EMAIL_HOST_PASSWORD no está configurado en las variables de entorno.")
-        
-        filename = f'inventario_{empresa_nit}_{fecha_generacion}.pdf'
-        
-        email = EmailMessage(
-            subject=f'Inventario de Productos - {empresa_nombre}',
-            body=f'''
-Estimado/a,
-
-Adjunto encontrará el reporte de inventario de productos de la empresa {empresa_nombre}.
-
-Fecha de generación: {fecha_generacion}
+def _trabajo_a_dict(request, trabajo) -> dict:
+    url_descarga = request.build_absolute_uri(reverse('trabajo_pdf_descarga', args=[trabajo.id]))
+    return TrabajoPdfSerializer(trabajo, context={'url_descarga': url_descarga}).data
 
-Este es un correo automático, por favor no responda.
 
-Saludos cordiales,
-Sistema LiteThinking
-            ''',
-            from_email=email_from,
-            to=[email_destino],
+def _encolar_pdf(request, empresa_nit):
+    # Solo se registra el trabajo: el PDF lo genera `manage.py procesar_trabajos_pdf`
+    email_destino = str(request.data.get('email') or request.query_params.get('email') or '').strip()
+    if email_destino and not _validar_email(email_destino):
+        return Response(
+            {'error': 'El formato del correo electrónico no es válido'},
+            status=status.HTTP_400_BAD_REQUEST
         )
-        
-        email.attach(filename, pdf_content, 'application/pdf')
-        email.send()
-        
-    except Exception as e:
-        raise
-
-
-def _generar_pdf_inventario(empresa, productos, fecha_generacion_formateada: str) -> bytes:
-
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    elements = []
     
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        textColor=colors.HexColor('#1a1a1a'),
-        spaceAfter=30,
-        alignment=1,  # Centrado
-    )
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=12,
-        textColor=colors.HexColor('#333333'),
-        spaceAfter=12,
-    )
-    normal_style = styles['Normal']
-    
-    elements.append(Paragraph("Vista de Inventario", title_style))
-    elements.append(Spacer(1, 0.2 * inch))
-    
-    elements.append(Paragraph(f"<b>Empresa:</b> {empresa.nombre}", heading_style))
-    elements.append(Paragraph(f"<b>NIT:</b> {empresa.nit}", normal_style))
-    elements.append(Paragraph(f"<b>Dirección:</b> {empresa.direccion}", normal_style))
-    elements.append(Paragraph(f"<b>Teléfono:</b> {empresa.telefono}", normal_style))
-    elements.append(Paragraph(
-        f"<b>Fecha de generación:</b> {fecha_generacion_formateada}",
-        normal_style
-    ))
-    elements.append(Spacer(1, 0.3 * inch))
-    
-    if productos:
-        data = [['Código', 'Nombre', 'Características', 'Precios']]
-        
-        for producto in productos:
-            precios_texto = []
-            if producto.precios:
-                for precio in producto.precios:
-                    valor_formateado = f"{precio.valor:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-                    precios_texto.append(f"{precio.moneda.value}: {valor_formateado}")
-                precios_str = "<br/>".join(precios_texto)
-            else:
-                precios_str = "Sin precios"
-            
-            caracteristicas = producto.caracteristicas or "N/A"
-            if len(caracteristicas) > 50:
-                caracteristicas = caracteristicas[:47] + "..."
-            
-            data.append([
-                producto.codigo,
-                producto.nombre,
-                caracteristicas,
-                Paragraph(precios_str, normal_style)
-            ])
-        
-        table = Table(data, colWidths=[1.2 * inch, 2.5 * inch, 2.5 * inch, 1.8 * inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a90e2')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('TOPPADDING', (0, 0), (-1, 0), 12),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')]),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 6),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 1), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-        ]))
-        
-        elements.append(table)
-        elements.append(Spacer(1, 0.2 * inch))
-        elements.append(Paragraph(
-            f"<b>Total de productos:</b> {len(productos)}",
-            normal_style
-        ))
-    else:
-        elements.append(Paragraph(
-            "<i>No hay productos registrados para esta empresa.</i>",
-            normal_style
-        ))
-    
-    doc.build(elements)
-    
-    pdf = buffer.getvalue()
-    buffer.close()
+    use_case = SolicitarPdfInventarioUseCase(trabajo_pdf_repository, empresa_repository)
+    trabajo = use_case.ejecutar(empresa_nit, email_destino or None, request.user.id)
+    if not trabajo:
+        return Response(
+            {'error': f'No existe una empresa con el NIT: {empresa_nit}'},
+            status=status.HTTP_404_NOT_FOUND
+        )
     
-    return pdf
+    return _trabajo_aceptado(request, trabajo)
 
 
-@api_view(['GET'])
+def _trabajo_aceptado(request, trabajo):
+    respuesta = Response(_trabajo_a_dict(request, trabajo), status=status.HTTP_202_ACCEPTED)
+    respuesta['Location'] = request.build_absolute_uri(reverse('trabajo_pdf_estado', args=[trabajo.id]))
+    return respuesta
+
+
+@api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated, IsAdmin])
 def generar_inventario_pdf(request, empresa_nit):
+    if request.method == 'POST':
+        return _encolar_pdf(request, empresa_nit)
 
     try:
         email_destino = request.query_params.get('email', '').strip()
@@ -189,22 +98,26 @@ def generar_inventario_pdf(request, empresa_nit):
                     status=status.HTTP_400_BAD_REQUEST
                 )
         
-        empresa_use_case = ObtenerEmpresaUseCase(empresa_repository)
-        empresa = empresa_use_case.ejecutar(empresa_nit)
+        use_case = GenerarPdfInventarioUseCase(
+            empresa_repository_sin_cache,
+            producto_repository,
+            version_repository,
+            resumen_inventario_repository,
+            generador_pdf,
+            cache_pdf,
+            settings.PDF_INVENTARIO['UMBRAL_GRANDE'],
+        )
+        pdf = use_case.ejecutar(empresa_nit)
         
-        if not empresa:
+        if not pdf:
             return Response(
                 {'error': f'No existe una empresa con el NIT: {empresa_nit}'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        producto_use_case = ListarProductosUseCase(producto_repository)
-        productos = producto_use_case.ejecutar(empresa_nit=empresa_nit)
-        
-        fecha_generacion = datetime.now().strftime('%Y%m%d_%H%M%S')
-        fecha_generacion_formateada = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
-        
-        pdf = _generar_pdf_inventario(empresa, productos, fecha_generacion_formateada)
+        # Un PDF de la caché conserva la fecha en que se generó; "datos_al" es
+        # la de la última modificación de la empresa o sus productos
+        fecha_generacion = timezone.localtime(pdf.generado).strftime('%Y%m%d_%H%M%S')
         
         if enviar_por_correo:
 
@@ -212,18 +125,18 @@ def generar_inventario_pdf(request, empresa_nit):
             
             if is_vercel:
                 try:
-                    _enviar_pdf_por_correo(pdf, empresa_nit, empresa.nombre, email_destino, fecha_generacion)
+                    enviar_inventario_por_correo(pdf, email_destino)
                 except Exception as e:
                     thread = threading.Thread(
-                        target=_enviar_pdf_por_correo,
-                        args=(pdf, empresa_nit, empresa.nombre, email_destino, fecha_generacion),
+                        target=enviar_inventario_por_correo,
+                        args=(pdf, email_destino),
                         daemon=False
                     )
                     thread.start()
             else:
                 thread = threading.Thread(
-                    target=_enviar_pdf_por_correo,
-                    args=(pdf, empresa_nit, empresa.nombre, email_destino, fecha_generacion),
+                    target=enviar_inventario_por_correo,
+                    args=(pdf, email_destino),
                     daemon=True
                 )
                 thread.start()
@@ -232,18 +145,19 @@ def generar_inventario_pdf(request, empresa_nit):
                 {
                     'message': f'El archivo PDF se está enviando a {email_destino}',
                     'empresa_nit': empresa_nit,
-                    'empresa_nombre': empresa.nombre,
+                    'empresa_nombre': pdf.empresa_nombre,
                     'email_destino': email_destino,
-                    'total_productos': len(productos),
-                    'fecha_generacion': fecha_generacion_formateada
+                    'total_productos': pdf.total_productos,
+                    'fecha_generacion': formatear_fecha(pdf.generado),
+                    'datos_al': formatear_fecha(pdf.datos_al) if pdf.datos_al else None,
                 },
                 status=status.HTTP_200_OK
             )
         else:
-            response = HttpResponse(pdf, content_type='application/pdf')
-            filename = f'inventario_{empresa.nit}_{fecha_generacion}.pdf'
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            return response
+            # Se envía por partes y FileResponse cierra el archivo al terminar
+            # (si es temporal, con eso se borra)
+            filename = f'inventario_{pdf.empresa_nit}_{fecha_generacion}.pdf'
+            return FileResponse(pdf.archivo, as_attachment=True, filename=filename, content_type='application/pdf')
         
     except Exception as e:
         return Response(
@@ -251,3 +165,68 @@ def generar_inventario_pdf(request, empresa_nit):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsAdmin])
+def generar_inventarios_pdf_lote(request):
+    # Un ZIP con el PDF de cada empresa, generado por `manage.py procesar_trabajos_pdf`
+    empresa_nits = request.data.get('empresas')
+    if empresa_nits is not None and (
+        not isinstance(empresa_nits, list) or not all(isinstance(nit, str) for nit in empresa_nits)
+    ):
+        return Response(
+            {'error': "'empresas' debe ser una lista de NIT"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        use_case = SolicitarLotePdfUseCase(trabajo_pdf_repository, empresa_repository)
+        trabajo = use_case.ejecutar(empresa_nits, request.user.id)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return _trabajo_aceptado(request, trabajo)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdmin])
+@respuesta_condicional(AmbitoVersion.PRODUCTOS, empresa=lambda request, nit: nit)
+def resumen_inventario(request, nit):
+    # Lectura de una sola fila mantenida por los repositorios de escritura
+    use_case = ObtenerResumenInventarioUseCase(resumen_inventario_repository, empresa_repository)
+    resumen = use_case.ejecutar(nit)
+    
+    if not resumen:
+        return Response(
+            {'error': f'No existe una empresa con el NIT: {nit}'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    return Response(ResumenInventarioSerializer(resumen).data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdmin])
+def trabajo_pdf_estado(request, trabajo_id):
+    trabajo = ObtenerTrabajoPdfUseCase(trabajo_pdf_repository).ejecutar(trabajo_id)
+    if not trabajo:
+        return Response({'error': 'Trabajo no encontrado'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(_trabajo_a_dict(request, trabajo))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdmin])
+def trabajo_pdf_descarga(request, trabajo_id):
+    trabajo = ObtenerTrabajoPdfUseCase(trabajo_pdf_repository).ejecutar(trabajo_id)
+    if not trabajo:
+        return Response({'error': 'Trabajo no encontrado'}, status=status.HTTP_404_NOT_FOUND)
+    if trabajo.estado != EstadoTrabajo.COMPLETADO:
+        return Response(
+            {'error': 'El PDF aún no está disponible', 'estado': trabajo.estado.value},
+            status=status.HTTP_409_CONFLICT
+        )
+    
+    archivo = AbrirPdfTrabajoUseCase(trabajo_pdf_repository).ejecutar(trabajo.id)
+    if archivo is None:
+        return Response({'error': 'El PDF ya no está disponible'}, status=status.HTTP_410_GONE)
+    return FileResponse(archivo, as_attachment=True, filename=trabajo.nombre_archivo, content_type=trabajo.tipo_contenido)
@@ -0,0 +1,21 @@
+import os
+
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from ....infrastructure.repositorios import obtener_cache_pdf, obtener_cache_respuestas
+from ..permissions import IsAdmin
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdmin])
+def metricas_cache(request):
+    # Los contadores son del proceso que atiende la petición
+    cache_respuestas = obtener_cache_respuestas()
+    cache_pdf = obtener_cache_pdf()
+    return Response({
+        'proceso': os.getpid(),
+        'respuestas': cache_respuestas.estadisticas() if cache_respuestas else None,
+        'pdf': cache_pdf.estadisticas() if cache_pdf else None,
+    })
@@ -0,0 +1,67 @@
+import base64
+import binascii
+import json
+from typing import Callable, Optional, Tuple
+
+from rest_framework.response import Response
+
+from ...domain.ports.paginacion import Clave, Pagina
+
+LIMITE_POR_DEFECTO = 100
+LIMITE_MAXIMO = 1000
+
+
+def solicita_paginacion(request) -> bool:
+    """Los listados solo se paginan si el cliente envía `limit` o `cursor`."""
+    return 'limit' in request.query_params or 'cursor' in request.query_params
+
+
+def codificar_cursor(clave: Clave) -> str:
+    contenido = json.dumps({'k': clave}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(contenido).decode('ascii').rstrip('=')
+
+
+def _clave_valida(clave) -> bool:
+    if isinstance(clave, str):
+        return True
+    return isinstance(clave, list) and all(isinstance(parte, str) for parte in clave)
+
+
+def decodificar_cursor(cursor: str) -> Clave:
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        contenido = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        clave = contenido['k']
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise ValueError("El cursor no es válido")
+    
+    if not _clave_valida(clave):
+        raise ValueError("El cursor no es válido")
+    return clave
+
+
+def leer_parametros_paginacion(request) -> Tuple[int, Optional[Clave]]:
+
+    limite_param = request.query_params.get('limit')
+    if limite_param in (None, ''):
+        limite = LIMITE_POR_DEFECTO
+    else:
+        try:
+            limite = int(limite_param)
+        except ValueError:
+            raise ValueError("El parámetro 'limit' debe ser un número entero")
+        limite = min(limite, LIMITE_MAXIMO)
+    
+    cursor = request.query_params.get('cursor')
+    despues_de = decodificar_cursor(cursor) if cursor else None
+    
+    return limite, despues_de
+
+
+def respuesta_paginada(pagina: Pagina, a_dict: Callable) -> Response:
+
+    siguiente = codificar_cursor(pagina.siguiente) if pagina.siguiente is not None else None
+    return Response({
+        'results': [a_dict(item) for item in pagina.items],
+        'next': siguiente,
+    })
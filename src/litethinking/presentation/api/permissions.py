@@ -1,12 +1,26 @@
 from rest_framework import permissions
 
+from ...infrastructure.persistence.usuarios.roles import ROLES
+
+
+def _roles(user) -> frozenset:
+    # Con JWTRolesAuthentication vienen en el token; un usuario cargado de la
+    # base de datos (p. ej. con sesión) los consulta una vez por petición
+    roles = getattr(user, 'roles', None)
+    if roles is None:
+        roles = getattr(user, '_roles_api', None)
+        if roles is None:
+            roles = frozenset(user.groups.filter(name__in=ROLES).values_list('name', flat=True))
+            user._roles_api = roles
+    return roles
+
 
 class IsAdmin(permissions.BasePermission):
     def has_permission(self, request, view):
         if not request.user or not request.user.is_authenticated:
             return False
         
-        return request.user.groups.filter(name='Admin').exists()
+        return 'Admin' in _roles(request.user)
 
 class IsAdminOrExterno(permissions.BasePermission):
 
@@ -14,7 +28,7 @@ class IsAdminOrExterno(permissions.BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
         
-        return request.user.groups.filter(name__in=['Admin', 'Externo']).exists()
+        return bool(_roles(request.user))
 
 class IsAdminOrReadOnly(permissions.BasePermission):
     def has_permission(self, request, view):
@@ -22,7 +36,16 @@ class IsAdminOrReadOnly(permissions.BasePermission):
             return False
         
         if request.method in permissions.SAFE_METHODS:
-            return request.user.groups.filter(name__in=['Admin', 'Externo']).exists()
+            return bool(_roles(request.user))
         
-        return request.user.groups.filter(name='Admin').exists()
+        return 'Admin' in _roles(request.user)
+
+
 
+def rol_de(user):
+    """Rol del usuario (Admin tiene prioridad sobre Externo), o None si no tiene."""
+    if not user or not user.is_authenticated:
+        return None
+    
+    roles = _roles(user)
+    return next((rol for rol in ROLES if rol in roles), None)
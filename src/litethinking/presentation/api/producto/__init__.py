@@ -6,6 +6,8 @@ from .views import (
     producto_agregar_precio,
     producto_detail,
     producto_generar_descripcion,
+    productos_buscar,
+    productos_importar,
     productos_list_create,
     productos_por_empresa,
 )
@@ -16,6 +18,8 @@ __all__ = [
     'producto_agregar_precio',
     'producto_detail',
     'producto_generar_descripcion',
+    'productos_buscar',
+    'productos_importar',
     'productos_list_create',
     'productos_por_empresa',
 ]
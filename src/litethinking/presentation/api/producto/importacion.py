@@ -0,0 +1,58 @@
+import codecs
+import csv
+import json
+from typing import Iterable, Iterator
+
+from ....application.use_cases.producto_use_cases import FilaImportacion
+from ....domain.entities.producto import Moneda
+
+COLUMNAS_PRODUCTO = ('codigo', 'nombre', 'empresa_nit', 'caracteristicas', 'descripcion')
+
+# En CSV cada moneda es una columna con el valor del precio (vacía si no aplica)
+COLUMNAS_PRECIO = tuple(moneda.value for moneda in Moneda)
+
+TIPOS_CSV = ('text/csv',)
+TIPOS_NDJSON = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+
+
+def _limpiar_clave(valor):
+    return valor.strip() if isinstance(valor, str) else valor
+
+
+def leer_filas_csv(lineas: Iterable[bytes]) -> Iterator[FilaImportacion]:
+    """Lee el CSV registro a registro; la primera línea debe ser el encabezado."""
+    lector = csv.DictReader(codecs.iterdecode(lineas, 'utf-8-sig'))
+    
+    for numero, registro in enumerate(lector, start=1):
+        datos = {columna: registro.get(columna) for columna in COLUMNAS_PRODUCTO}
+        datos['codigo'] = _limpiar_clave(datos['codigo'])
+        datos['empresa_nit'] = _limpiar_clave(datos['empresa_nit'])
+        datos['precios'] = [
+            {'moneda': moneda, 'valor': registro[moneda]}
+            for moneda in COLUMNAS_PRECIO
+            if (registro.get(moneda) or '').strip()
+        ]
+        yield FilaImportacion(numero, datos)
+
+
+def leer_filas_ndjson(lineas: Iterable[bytes]) -> Iterator[FilaImportacion]:
+    """Lee un producto por línea con la misma forma que devuelve la API."""
+    numero = 0
+    for linea in lineas:
+        if not linea.strip():
+            continue
+        numero += 1
+        
+        try:
+            datos = json.loads(linea)
+        except ValueError:
+            yield FilaImportacion(numero, error="La línea no es un JSON válido")
+            continue
+        
+        if not isinstance(datos, dict):
+            yield FilaImportacion(numero, error="Cada línea debe ser un objeto JSON")
+            continue
+        
+        datos['codigo'] = _limpiar_clave(datos.get('codigo'))
+        datos['empresa_nit'] = _limpiar_clave(datos.get('empresa_nit'))
+        yield FilaImportacion(numero, datos)
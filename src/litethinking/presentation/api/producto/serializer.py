@@ -1,7 +1,11 @@
-import re
+from decimal import Decimal
+from functools import partial
+from typing import Callable, Optional, Tuple
+
 from rest_framework import serializers
 
-from ....domain.entities.producto import Moneda, Producto, ProductoPrecio
+from ....domain.entities.producto import CODIGO_PATRON, Moneda, Producto, ProductoPrecio
+from ....domain.ports.consultas import ProyeccionProductos
 
 
 class ProductoPrecioSerializer(serializers.Serializer):
@@ -9,10 +13,7 @@ class ProductoPrecioSerializer(serializers.Serializer):
     valor = serializers.DecimalField(max_digits=14, decimal_places=2)
     
     def to_representation(self, instance: ProductoPrecio):
-        return {
-            'moneda': instance.moneda.value,
-            'valor': str(instance.valor),
-        }
+        return precio_a_dict(instance.moneda, instance.valor)
 
 
 class ProductoSerializer(serializers.Serializer):
@@ -28,8 +29,7 @@ class ProductoSerializer(serializers.Serializer):
         if not value or not value.strip():
             raise serializers.ValidationError("El código del producto es requerido")
         
-        codigo_pattern = re.compile(r'^[A-Za-z]+-\d+$')
-        if not codigo_pattern.match(value.strip()):
+        if not CODIGO_PATRON.match(value.strip()):
             raise serializers.ValidationError(
                 "El código debe seguir el formato 'nombre-numero' (ej: PROD-001, LAPTOP-123). "
                 "Solo se permiten letras, un guion y números."
@@ -38,15 +38,71 @@ class ProductoSerializer(serializers.Serializer):
         return value.strip()
     
     def to_representation(self, instance: Producto):
-        return {
-            'codigo': instance.codigo,
-            'nombre': instance.nombre,
-            'empresa_nit': instance.empresa_nit,
-            'caracteristicas': instance.caracteristicas,
-            'descripcion': instance.descripcion,
-            'precios': [
-                ProductoPrecioSerializer().to_representation(precio)
-                for precio in instance.precios
-            ],
-        }
+        return producto_a_dict(instance)
+
+
+# Conversión directa entidad -> dict para las lecturas, sin pasar por los
+# serializers de DRF (un ListSerializer y un serializer por precio)
+
+def precio_a_dict(moneda: Moneda, valor: Decimal) -> dict:
+    return {
+        'moneda': moneda.value,
+        'valor': str(valor),
+    }
+
+
+def producto_a_dict(producto: Producto) -> dict:
+    return {
+        'codigo': producto.codigo,
+        'nombre': producto.nombre,
+        'empresa_nit': producto.empresa_nit,
+        'caracteristicas': producto.caracteristicas,
+        'descripcion': producto.descripcion,
+        'precios': [precio_a_dict(moneda, valor) for moneda, valor in producto.valores.items()],
+    }
+
+
+def _producto_proyectado_a_dict(proyeccion: ProyeccionProductos, producto: Producto) -> dict:
+    datos = {campo: getattr(producto, campo) for campo in proyeccion.campos}
+    if proyeccion.incluir_precios:
+        datos['precios'] = [precio_a_dict(moneda, valor) for moneda, valor in producto.valores.items()]
+    return datos
+
+
+def conversor_a_dict(proyeccion: Optional[ProyeccionProductos]) -> Callable[[Producto], dict]:
+    """Función entidad -> dict con solo los campos de `proyeccion` (todos si es None)."""
+    if proyeccion is None or proyeccion.completa:
+        return producto_a_dict
+    return partial(_producto_proyectado_a_dict, proyeccion)
+
+
+# Exportación CSV: una columna por moneda con el precio del producto en ella
+COLUMNAS_CSV = ('codigo', 'nombre', 'empresa_nit', 'caracteristicas', 'descripcion') + tuple(m.value for m in Moneda)
+
+
+def producto_a_fila(producto: Producto) -> list:
+    valores = producto.valores
+    return [
+        producto.codigo,
+        producto.nombre,
+        producto.empresa_nit,
+        producto.caracteristicas,
+        producto.descripcion,
+        *(valores.get(moneda) for moneda in Moneda),
+    ]
+
+
+def _producto_proyectado_a_fila(proyeccion: ProyeccionProductos, producto: Producto) -> list:
+    fila = [getattr(producto, campo) for campo in proyeccion.campos]
+    if proyeccion.incluir_precios:
+        valores = producto.valores
+        fila.extend(valores.get(moneda) for moneda in Moneda)
+    return fila
+
 
+def tabla_csv(proyeccion: Optional[ProyeccionProductos]) -> Tuple[tuple, Callable[[Producto], list]]:
+    """Columnas y función entidad -> fila de la exportación CSV según `proyeccion`."""
+    if proyeccion is None or proyeccion.completa:
+        return COLUMNAS_CSV, producto_a_fila
+    columnas = proyeccion.campos + (tuple(m.value for m in Moneda) if proyeccion.incluir_precios else ())
+    return columnas, partial(_producto_proyectado_a_fila, proyeccion)
@@ -1,43 +1,183 @@
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
+from typing import Optional
+import csv
 import os
 
 from django.conf import settings
 from openai import OpenAI
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from ....application.use_cases.producto_use_cases import (
     AgregarPrecioProductoUseCase,
+    BuscarProductosTextoUseCase,
+    BuscarProductosUseCase,
     CrearProductoUseCase,
     EliminarProductoUseCase,
+    ImportarProductosUseCase,
+    IterarProductosUseCase,
     ListarProductosUseCase,
     ObtenerProductoUseCase,
 )
 from ....domain.entities.producto import Moneda
-from ....infrastructure.persistence.empresa.repository_impl import DjangoEmpresaRepository
-from ....infrastructure.persistence.producto.repository_impl import DjangoProductoRepository
+from ....domain.ports.consultas import FiltroProductos, OrdenProductos, ProyeccionProductos
+from ....domain.ports.version_repository import AmbitoVersion
+from ....infrastructure.cache.respuestas import generaciones_producto, generaciones_productos_empresa
+from ....infrastructure.repositorios import (
+    obtener_cache_respuestas,
+    obtener_empresa_repository,
+    obtener_producto_repository,
+)
+from ..cache_respuestas import respuesta_en_cache
+from ..condicional import respuesta_condicional
+from ..paginacion import leer_parametros_paginacion, respuesta_paginada, solicita_paginacion
 from ..permissions import IsAdmin
-from .serializer import ProductoSerializer
+from ..renderers import renderers_con_exportacion
+from ..streaming import FORMATOS_STREAMING, formato_negociado, respuesta_streaming
+from .importacion import TIPOS_CSV, TIPOS_NDJSON, leer_filas_csv, leer_filas_ndjson
+from .serializer import ProductoSerializer, conversor_a_dict, tabla_csv
+
+empresa_repository = obtener_empresa_repository()
+producto_repository = obtener_producto_repository()
+cache_respuestas = obtener_cache_respuestas()
+
+
+def _leer_proyeccion(request) -> Optional[ProyeccionProductos]:
+    """
+    `fields` lista los campos a devolver (el código siempre va) e
+    `include=precios` agrega los precios. Sin ninguno de los dos se devuelve todo.
+    """
+    campos = request.query_params.get('fields')
+    incluir = request.query_params.get('include')
+    if campos is None and incluir is None:
+        return None
+    
+    incluir = {parte.strip() for parte in (incluir or '').split(',') if parte.strip()}
+    if incluir - {'precios'}:
+        raise ValueError("El parámetro 'include' solo admite: precios")
+    if campos is None:
+        return ProyeccionProductos()
+    
+    campos = {parte.strip() for parte in campos.split(',') if parte.strip()}
+    if 'precios' in campos:
+        campos.discard('precios')
+        incluir.add('precios')
+    return ProyeccionProductos(campos, incluir_precios='precios' in incluir)
+
+
+def _exportar_productos(request, empresa_nit):
+    # `stream` tiene prioridad; si no viene, el formato negociado con Accept o `format`
+    formato = request.query_params.get('stream') or formato_negociado(request)
+    if formato not in FORMATOS_STREAMING:
+        return Response(
+            {'error': f"El parámetro 'stream' debe ser uno de: {', '.join(FORMATOS_STREAMING)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        proyeccion = _leer_proyeccion(request)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    use_case = IterarProductosUseCase(producto_repository)
+    productos = use_case.ejecutar(empresa_nit=empresa_nit, proyeccion=proyeccion)
+    columnas, a_fila = tabla_csv(proyeccion)
+    return respuesta_streaming(formato, productos, conversor_a_dict(proyeccion), columnas, a_fila)
+
+
+PARAMETROS_FILTRO = ('moneda', 'precio_min', 'precio_max', 'nombre', 'orden')
+
+
+def _solicita_busqueda(request) -> bool:
+    return solicita_paginacion(request) or any(p in request.query_params for p in PARAMETROS_FILTRO)
+
+
+def _solicita_exportacion(request) -> bool:
+    return 'stream' in request.query_params or formato_negociado(request) is not None
+
+
+def _exportacion_con_busqueda(request) -> bool:
+    return 'stream' not in request.query_params and _solicita_busqueda(request)
+
+
+def _leer_decimal(request, parametro: str):
+    valor = request.query_params.get(parametro)
+    if valor in (None, ''):
+        return None
+    try:
+        decimal = Decimal(valor)
+    except InvalidOperation:
+        raise ValueError(f"El parámetro '{parametro}' debe ser un número")
+    if not decimal.is_finite():
+        raise ValueError(f"El parámetro '{parametro}' debe ser un número")
+    return decimal
+
+
+def _leer_filtro(request, empresa_nit) -> FiltroProductos:
+    moneda = request.query_params.get('moneda')
+    orden = request.query_params.get('orden') or OrdenProductos.CODIGO.value
+    try:
+        moneda = Moneda(moneda) if moneda else None
+    except ValueError:
+        raise ValueError(f"Moneda no válida. Opciones: {', '.join(m.value for m in Moneda)}")
+    try:
+        orden = OrdenProductos(orden)
+    except ValueError:
+        raise ValueError(f"Orden no válido. Opciones: {', '.join(o.value for o in OrdenProductos)}")
+    
+    return FiltroProductos(
+        empresa_nit=empresa_nit,
+        moneda=moneda,
+        valor_min=_leer_decimal(request, 'precio_min'),
+        valor_max=_leer_decimal(request, 'precio_max'),
+        nombre_prefijo=request.query_params.get('nombre'),
+        orden=orden,
+    )
+
+
+def _listar_productos_paginado(request, empresa_nit):
+    try:
+        limite, despues_de = leer_parametros_paginacion(request)
+        filtro = _leer_filtro(request, empresa_nit)
+        proyeccion = _leer_proyeccion(request)
+        use_case = BuscarProductosUseCase(producto_repository)
+        pagina = use_case.ejecutar(filtro, limite=limite, despues_de=despues_de, proyeccion=proyeccion)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return respuesta_paginada(pagina, conversor_a_dict(proyeccion))
 
-empresa_repository = DjangoEmpresaRepository()
-producto_repository = DjangoProductoRepository()
+
+def _listar_productos(request, empresa_nit):
+    try:
+        proyeccion = _leer_proyeccion(request)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    use_case = ListarProductosUseCase(producto_repository)
+    productos = use_case.ejecutar(empresa_nit=empresa_nit, proyeccion=proyeccion)
+    a_dict = conversor_a_dict(proyeccion)
+    return Response([a_dict(producto) for producto in productos])
 
 
 @api_view(['GET', 'POST'])
+@renderer_classes(renderers_con_exportacion())
 @permission_classes([IsAuthenticated, IsAdmin])
+@respuesta_condicional(AmbitoVersion.PRODUCTOS, empresa=lambda request: request.query_params.get('empresa_nit') or None)
 def productos_list_create(request):
     if request.method == 'GET':
         empresa_nit = request.query_params.get('empresa_nit')
-        use_case = ListarProductosUseCase(producto_repository)
-        productos = use_case.ejecutar(empresa_nit=empresa_nit)
-        serializer = ProductoSerializer(productos, many=True)
-        return Response(serializer.data)
+        if _solicita_exportacion(request):
+            if _exportacion_con_busqueda(request):
+                return Response({'error': "Los formatos de exportación devuelven el listado completo: no admiten paginación ni filtros"}, status=status.HTTP_400_BAD_REQUEST)
+            return _exportar_productos(request, empresa_nit)
+        if _solicita_busqueda(request):
+            return _listar_productos_paginado(request, empresa_nit)
+        return _listar_productos(request, empresa_nit)
     
     elif request.method == 'POST':
         try:
-            use_case = CrearProductoUseCase(producto_repository, empresa_repository)
+            use_case = CrearProductoUseCase(producto_repository, cache_respuestas)
             producto = use_case.ejecutar(
                 codigo=request.data.get('codigo'),
                 nombre=request.data.get('nombre'),
@@ -51,19 +191,46 @@ def productos_list_create(request):
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdmin])
+@respuesta_condicional(AmbitoVersion.PRODUCTOS)
+def productos_buscar(request):
+    try:
+        limite, cursor = leer_parametros_paginacion(request)
+        if cursor is None:
+            desplazamiento = 0
+        elif isinstance(cursor, str) and cursor.isdigit():
+            desplazamiento = int(cursor)
+        else:
+            raise ValueError("El cursor no es válido")
+        
+        proyeccion = _leer_proyeccion(request)
+        use_case = BuscarProductosTextoUseCase(producto_repository)
+        pagina = use_case.ejecutar(request.query_params.get('q', ''), limite, desplazamiento, proyeccion)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return respuesta_paginada(pagina, conversor_a_dict(proyeccion))
+
+
 @api_view(['GET', 'DELETE'])
 @permission_classes([IsAuthenticated])
+@respuesta_condicional(AmbitoVersion.PRODUCTOS)
+@respuesta_en_cache('producto', lambda request, codigo: generaciones_producto(codigo))
 def producto_detail(request, codigo):
     if request.method == 'GET':
+        try:
+            proyeccion = _leer_proyeccion(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
         use_case = ObtenerProductoUseCase(producto_repository)
-        producto = use_case.ejecutar(codigo)
+        producto = use_case.ejecutar(codigo, proyeccion)
         if not producto:
             return Response({'error': 'Producto no encontrado'}, status=status.HTTP_404_NOT_FOUND)
-        serializer = ProductoSerializer(producto)
-        return Response(serializer.data)
+        return Response(conversor_a_dict(proyeccion)(producto))
     
     elif request.method == 'DELETE':
-        use_case = EliminarProductoUseCase(producto_repository)
+        use_case = EliminarProductoUseCase(producto_repository, cache_respuestas)
         eliminado = use_case.ejecutar(codigo)
         if not eliminado:
             return Response({'error': 'Producto no encontrado'}, status=status.HTTP_404_NOT_FOUND)
@@ -74,7 +241,7 @@ def producto_detail(request, codigo):
 @permission_classes([IsAuthenticated, IsAdmin])
 def producto_agregar_precio(request, codigo):
     try:
-        use_case = AgregarPrecioProductoUseCase(producto_repository)
+        use_case = AgregarPrecioProductoUseCase(producto_repository, cache_respuestas)
         moneda = Moneda(request.data.get('moneda'))
         valor = Decimal(str(request.data.get('valor')))
         producto = use_case.ejecutar(
@@ -90,6 +257,51 @@ def producto_agregar_precio(request, codigo):
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsAdmin])
+def productos_importar(request):
+    
+    content_type = (request.content_type or '').split(';')[0].strip().lower()
+    if content_type in TIPOS_CSV:
+        leer_filas = leer_filas_csv
+    elif content_type in TIPOS_NDJSON:
+        leer_filas = leer_filas_ndjson
+    else:
+        return Response(
+            {'error': 'El cuerpo debe enviarse como text/csv o application/x-ndjson'},
+            status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+        )
+    
+    # Se lee directamente del stream para no cargar el archivo completo en memoria
+    stream = request.stream
+    if stream is None:
+        return Response({'error': 'El archivo de importación está vacío'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    # Un error de lectura termina el archivo ahí: las filas anteriores se guardan igual
+    # y la respuesta indica cuántas, junto con el error
+    errores_lectura = []
+    
+    def filas():
+        try:
+            yield from leer_filas(stream)
+        except (UnicodeDecodeError, csv.Error) as e:
+            errores_lectura.append(e)
+    
+    use_case = ImportarProductosUseCase(producto_repository, empresa_repository, cache_respuestas=cache_respuestas)
+    resultado = use_case.ejecutar(filas())
+    
+    datos = {
+        'procesados': resultado.procesados,
+        'guardados': resultado.guardados,
+        'total_errores': resultado.total_errores,
+        'errores': resultado.errores,
+    }
+    if errores_lectura:
+        datos['error'] = f'No fue posible leer el archivo: {str(errores_lectura[0])}'
+        return Response(datos, status=status.HTTP_400_BAD_REQUEST)
+    return Response(datos, status=status.HTTP_200_OK)
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated, IsAdmin])
 def producto_generar_descripcion(request):
@@ -183,10 +395,16 @@ def producto_generar_descripcion(request):
 
 
 @api_view(['GET'])
+@renderer_classes(renderers_con_exportacion())
 @permission_classes([IsAuthenticated])
+@respuesta_condicional(AmbitoVersion.PRODUCTOS, empresa=lambda request, nit: nit)
+@respuesta_en_cache('productos_empresa', lambda request, nit: generaciones_productos_empresa(nit))
 def productos_por_empresa(request, nit):
-    use_case = ListarProductosUseCase(producto_repository)
-    productos = use_case.ejecutar(empresa_nit=nit)
-    serializer = ProductoSerializer(productos, many=True)
-    return Response(serializer.data)
+    if _solicita_exportacion(request):
+        if _exportacion_con_busqueda(request):
+            return Response({'error': "Los formatos de exportación devuelven el listado completo: no admiten paginación ni filtros"}, status=status.HTTP_400_BAD_REQUEST)
+        return _exportar_productos(request, nit)
+    if _solicita_busqueda(request):
+        return _listar_productos_paginado(request, nit)
+    return _listar_productos(request, nit)
 
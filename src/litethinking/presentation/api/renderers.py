@@ -0,0 +1,125 @@
+"""
+Codificación JSON rápida para las respuestas de la API.
+
+Si orjson está instalado (dependencia opcional, extra "rapido") se usa para
+codificar; si no, se usa el mismo codificador de DRF. En ambos casos la
+salida es idéntica byte a byte a la de JSONRenderer con la configuración por
+defecto: compacta, UTF-8 sin escapar, decimales como texto y con U+2028/U+2029
+escapados. Lo único que orjson no reproduce (enteros de más de 64 bits, por
+ejemplo) se codifica con el codificador de DRF.
+
+También define los renderers de exportación (CSV, NDJSON y MessagePack) que
+los listados ofrecen por negociación de contenido; MessagePack solo si
+msgpack está instalado (extra "formatos").
+"""
+import csv
+import io
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - dependencia opcional
+    msgpack = None
+
+# Misma configuración que usa JSONRenderer de DRF por defecto
+_codificador = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+# Fechas y horas pasan por el codificador de DRF para conservar su formato
+_OPCIONES_ORJSON = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+
+
+def codificar_json(dato) -> bytes:
+    if orjson is not None:
+        try:
+            contenido = orjson.dumps(dato, default=_codificador.default, option=_OPCIONES_ORJSON)
+        except (orjson.JSONEncodeError, TypeError):
+            pass
+        else:
+            return contenido.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    
+    texto = _codificador.encode(dato)
+    return texto.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode('utf-8')
+
+
+class JSONRapidoRenderer(JSONRenderer):
+    """JSONRenderer que codifica con codificar_json cuando la salida es la compacta por defecto."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        usa_formato_por_defecto = self.compact and not self.ensure_ascii
+        if (
+            data is None
+            or not usa_formato_por_defecto
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        return codificar_json(data)
+
+
+class JSONRapidoSolicitadoRenderer(JSONRapidoRenderer):
+    """Permite pedir el codificador rápido con `Accept: application/json; codificador=rapido`."""
+
+    media_type = 'application/json; codificador=rapido'
+
+
+# Los listados se envían en streaming desde la vista (ver streaming.py); el
+# render de estos renderers solo cubre respuestas sueltas, como los errores
+
+def _como_lista(data) -> list:
+    if data is None:
+        return []
+    return data if isinstance(data, list) else [data]
+
+
+class CSVRenderer(BaseRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        filas = _como_lista(data)
+        if not filas:
+            return b''
+        
+        salida = io.StringIO()
+        escritor = csv.DictWriter(salida, fieldnames=list(filas[0]), extrasaction='ignore')
+        escritor.writeheader()
+        escritor.writerows(filas)
+        return salida.getvalue().encode('utf-8')
+
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return b''.join(codificar_json(item) + b'\n' for item in _como_lista(data))
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/x-msgpack'
+    format = 'msgpack'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        empaquetador = msgpack.Packer(default=str)
+        return b''.join(empaquetador.pack(item) for item in _como_lista(data))
+
+
+RENDERERS_EXPORTACION = (CSVRenderer, NDJSONRenderer) + ((MessagePackRenderer,) if msgpack else ())
+
+FORMATOS_EXPORTACION = tuple(renderer.format for renderer in RENDERERS_EXPORTACION)
+
+
+def renderers_con_exportacion() -> list:
+    """Renderers por defecto más los de exportación, para los listados."""
+    return [*api_settings.DEFAULT_RENDERER_CLASSES, *RENDERERS_EXPORTACION]
@@ -0,0 +1,93 @@
+import csv
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+from django.http import StreamingHttpResponse
+
+from .renderers import FORMATOS_EXPORTACION, codificar_json, msgpack
+
+# Elementos que se agrupan en cada fragmento enviado al cliente
+ELEMENTOS_POR_FRAGMENTO = 200
+
+FORMATOS_STREAMING = ('json',) + FORMATOS_EXPORTACION
+
+_CONTENT_TYPES = {
+    'json': 'application/json; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+    'msgpack': 'application/x-msgpack',
+}
+
+
+class _Eco:
+    """Destino para csv.writer que devuelve la línea en vez de guardarla."""
+
+    def write(self, valor: str) -> str:
+        return valor
+
+
+def formato_negociado(request) -> Optional[str]:
+    """Formato de exportación elegido con `Accept` o `?format=`, o None si es una respuesta normal."""
+    formato = getattr(request.accepted_renderer, 'format', None)
+    return formato if formato in FORMATOS_EXPORTACION else None
+
+
+def _fragmentos(
+    items: Iterable,
+    codificar: Callable[[object], bytes],
+    inicio: bytes = b'',
+    separador: bytes = b'',
+    fin: bytes = b''
+) -> Iterator[bytes]:
+    # El inicio (corchete, encabezado CSV) sale antes de la primera consulta a la BD
+    if inicio:
+        yield inicio
+    buffer = []
+    primero = True
+    for item in items:
+        buffer.append(codificar(item) if primero else separador + codificar(item))
+        primero = False
+        if len(buffer) >= ELEMENTOS_POR_FRAGMENTO:
+            yield b''.join(buffer)
+            buffer = []
+    buffer.append(fin)
+    contenido = b''.join(buffer)
+    if contenido:
+        yield contenido
+
+
+def _codificador_csv(a_fila: Callable) -> Callable[[object], bytes]:
+    escritor = csv.writer(_Eco())
+    return lambda item: escritor.writerow(a_fila(item)).encode('utf-8')
+
+
+def respuesta_streaming(
+    formato: str,
+    items: Iterable,
+    a_dict: Callable,
+    columnas: Optional[Sequence[str]] = None,
+    a_fila: Optional[Callable] = None
+) -> StreamingHttpResponse:
+    """
+    Envía `items` a medida que se leen, sin construir la lista completa en memoria.
+    `formato` es uno de FORMATOS_STREAMING: 'json' (un arreglo JSON), 'ndjson'
+    (un objeto por línea), 'csv' (una fila por elemento con `columnas` y
+    `a_fila`) o 'msgpack' (un mapa MessagePack tras otro).
+    """
+    if formato == 'ndjson':
+        fragmentos = _fragmentos(items, lambda item: codificar_json(a_dict(item)) + b'\n')
+    elif formato == 'csv':
+        codificar = _codificador_csv(a_fila)
+        fragmentos = _fragmentos(items, codificar, inicio=csv.writer(_Eco()).writerow(columnas).encode('utf-8'))
+    elif formato == 'msgpack':
+        empaquetador = msgpack.Packer(default=str)
+        fragmentos = _fragmentos(items, lambda item: empaquetador.pack(a_dict(item)))
+    else:
+        fragmentos = _fragmentos(
+            items,
+            lambda item: codificar_json(a_dict(item)),
+            inicio=b'[',
+            separador=b',',
+            fin=b']',
+        )
+
+    return StreamingHttpResponse(fragmentos, content_type=_CONTENT_TYPES[formato])